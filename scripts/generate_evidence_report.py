@@ -4,6 +4,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from kprovengine.manifest.hash_cache import HashCache
 from kprovengine.reporting import write_report
 
 
@@ -17,17 +18,27 @@ def build_parser() -> argparse.ArgumentParser:
         "--archive-out",
         help="Optional output path for the enriched JSON archive used by the report.",
     )
+    parser.add_argument(
+        "--hash-cache",
+        help="Optional SQLite hash cache; unchanged artifacts are not rehashed across runs.",
+    )
     return parser
 
 
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
-    write_report(
-        manifest_path=Path(args.manifest),
-        html_output=Path(args.html_out),
-        archive_output=Path(args.archive_out) if args.archive_out else None,
-    )
+    hash_cache = HashCache(Path(args.hash_cache)) if args.hash_cache else None
+    try:
+        write_report(
+            manifest_path=Path(args.manifest),
+            html_output=Path(args.html_out),
+            archive_output=Path(args.archive_out) if args.archive_out else None,
+            hash_cache=hash_cache,
+        )
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
     return 0
 
 
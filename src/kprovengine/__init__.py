@@ -1,8 +1,18 @@
-from importlib.metadata import PackageNotFoundError, version
-
-try:
-    __version__ = version("kprovengine")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "0.0.0+unknown"
+from __future__ import annotations
 
 __all__ = ["__version__"]
+
+
+def __getattr__(name: str) -> str:
+    # Resolved on first use: importlib.metadata is slow to import, and the
+    # thin client (kprovengine.client) should not pay for it.
+    if name != "__version__":
+        raise AttributeError(f"module 'kprovengine' has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        v = version("kprovengine")
+    except PackageNotFoundError:  # pragma: no cover
+        v = "0.0.0+unknown"
+    globals()["__version__"] = v
+    return v
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from kprovengine.cli import main
+from kprovengine.client import main
 
 if __name__ == "__main__":
     raise SystemExit(main())
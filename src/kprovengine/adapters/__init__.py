@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from .llm_base import LLMAdapter, LLMResult
-from .ocr_base import OCRAdapter, OCRResult
+from .llm_base import AsyncLLMAdapter, LLMAdapter, LLMResult
+from .ocr_base import AsyncOCRAdapter, OCRAdapter, OCRResult
 
 __all__ = [
     "OCRAdapter",
     "OCRResult",
+    "AsyncOCRAdapter",
     "LLMAdapter",
     "LLMResult",
+    "AsyncLLMAdapter",
 ]
@@ -45,3 +45,22 @@ class LLMAdapter(ABC):
             An LLMResult containing response content and optional metadata.
         """
         pass
+
+
+class AsyncLLMAdapter(ABC):
+    """
+    Asyncio variant of LLMAdapter, for clients with a native async API.
+
+    Wrap calls in a pipeline.AsyncPathStage and drive them with
+    run_pipeline_async().
+    """
+
+    @abstractmethod
+    def name(self) -> str:
+        """Return a unique identifier for this adapter."""
+        pass
+
+    @abstractmethod
+    async def complete(self, prompt: str) -> LLMResult:
+        """Complete the given prompt without blocking the event loop."""
+        pass
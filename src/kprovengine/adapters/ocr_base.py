@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 
-__all__ = ["OCRAdapter", "OCRResult"]
+__all__ = ["AsyncOCRAdapter", "OCRAdapter", "OCRResult"]
 
 
 @dataclass(frozen=True)
@@ -51,3 +51,22 @@ class OCRAdapter(ABC):
             OCRResult with extracted text
         """
         pass
+
+
+class AsyncOCRAdapter(ABC):
+    """
+    Asyncio variant of OCRAdapter, for engines with a native async client.
+
+    Wrap calls in a pipeline.AsyncPathStage and drive them with
+    run_pipeline_async().
+    """
+
+    @abstractmethod
+    def name(self) -> str:
+        """Return a unique name for this adapter."""
+        pass
+
+    @abstractmethod
+    async def extract(self, image_path: Path) -> OCRResult:
+        """Extract text from the given file without blocking the event loop."""
+        pass
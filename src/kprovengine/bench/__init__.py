@@ -0,0 +1,31 @@
+# src/kprovengine/bench/__init__.py
+"""Offline performance benchmarks (`kprovengine bench`)."""
+
+from __future__ import annotations
+
+from .corpus import CORPORA, FileGroup, generate_corpus
+from .hashing import HASH_IMPLS, bench_hashing
+from .suite import (
+    BENCH_SCHEMA,
+    BenchConfig,
+    Regression,
+    compare_results,
+    load_results,
+    run_bench,
+    save_results,
+)
+
+__all__ = [
+    "BENCH_SCHEMA",
+    "CORPORA",
+    "HASH_IMPLS",
+    "BenchConfig",
+    "FileGroup",
+    "Regression",
+    "bench_hashing",
+    "compare_results",
+    "generate_corpus",
+    "load_results",
+    "run_bench",
+    "save_results",
+]
@@ -0,0 +1,169 @@
+# src/kprovengine/bench/cli.py
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+from kprovengine.cli import EX_DATAERR, EX_IOERR, EX_OK, EX_USAGE
+from kprovengine.storage.durability import DURABILITY_MODES
+
+from .corpus import CORPORA
+from .suite import BenchConfig, compare_results, load_results, run_bench, save_results
+
+T = TypeVar("T")
+
+
+def _csv(kind: Callable[[str], T], value: str) -> tuple[T, ...]:
+    return tuple(kind(v) for v in value.split(",") if v.strip())
+
+
+def _threshold_override(value: str) -> tuple[str, float]:
+    key, sep, thr = value.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=FRACTION, got {value!r}")
+    return key, float(thr)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="kprovengine bench",
+        description="Time run_pipeline, build_manifest and write_report on synthetic corpora.",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=lambda v: _csv(str, v),
+        default=tuple(CORPORA),
+        help=f"Comma-separated corpora ({', '.join(CORPORA)}); empty for none. Default: all",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=lambda v: _csv(int, v),
+        default=(1, 4),
+        help="Comma-separated run_pipeline worker counts. Default: 1,4",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per benchmark.")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Corpus scale factor (file counts for tiny files, sizes for large). Default: 1.0",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus content seed.")
+    parser.add_argument(
+        "--hashing",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Include the sha256_file microbenchmark (MiB/s per code path). Default: on",
+    )
+    parser.add_argument(
+        "--durability",
+        type=lambda v: _csv(str, v),
+        default=DURABILITY_MODES,
+        help="Comma-separated evidence commit modes to time run_pipeline under; empty for "
+        "none. Default: fast,durable,paranoid",
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Where corpora are generated and reused. Default: a temporary directory",
+    )
+    parser.add_argument("--save", default=None, help="Write results JSON (a baseline) here.")
+    parser.add_argument(
+        "--results",
+        default=None,
+        help="Compare this saved results file instead of running the benchmarks.",
+    )
+    parser.add_argument("--baseline", default=None, help="Baseline results JSON to compare to.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed slowdown as a fraction of the baseline median. Default: 0.10",
+    )
+    parser.add_argument(
+        "--threshold-for",
+        type=_threshold_override,
+        action="append",
+        default=[],
+        metavar="KEY=FRACTION",
+        help="Per-operation or per-benchmark threshold, e.g. write_report=0.25 (repeatable).",
+    )
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """
+    `kprovengine bench` entry point.
+
+    Prints the results JSON on stdout, then any regressions against
+    --baseline on stderr ('regression:' prefix); a regression exits EX_DATAERR.
+    """
+    parser = _build_parser()
+    try:
+        ns = parser.parse_args(argv)
+    except SystemExit as e:
+        return EX_OK if not e.code else EX_USAGE
+
+    try:
+        if ns.results:
+            results = load_results(Path(ns.results))
+        else:
+            unknown = [c for c in ns.corpus if c not in CORPORA]
+            if unknown:
+                raise ValueError(f"unknown corpus: {', '.join(unknown)}")
+            if any(j < 1 for j in ns.jobs):
+                raise ValueError("--jobs values must be >= 1")
+            bad_modes = [m for m in ns.durability if m not in DURABILITY_MODES]
+            if bad_modes:
+                raise ValueError(f"unknown durability mode: {', '.join(bad_modes)}")
+            config = BenchConfig(
+                corpora=ns.corpus,
+                jobs=ns.jobs,
+                repeat=ns.repeat,
+                scale=ns.scale,
+                seed=ns.seed,
+                hashing=ns.hashing,
+                durability=ns.durability,
+            )
+
+            def _progress(msg: str) -> None:
+                print(msg, file=sys.stderr)
+
+            if ns.work_dir:
+                results = run_bench(config, Path(ns.work_dir).expanduser(), progress=_progress)
+            else:
+                with tempfile.TemporaryDirectory(prefix="kprov-bench-") as tmp:
+                    results = run_bench(config, Path(tmp), progress=_progress)
+
+        if ns.save:
+            save_results(results, Path(ns.save).expanduser())
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+        if ns.baseline:
+            regressions = compare_results(
+                load_results(Path(ns.baseline).expanduser()),
+                results,
+                threshold=ns.threshold,
+                thresholds=dict(ns.threshold_for),
+            )
+            for r in regressions:
+                print(
+                    f"regression: {r.key}: {r.baseline_s:.4f}s -> {r.current_s:.4f}s "
+                    f"(+{r.change:.1%}, threshold {r.threshold:.0%})",
+                    file=sys.stderr,
+                )
+            if regressions:
+                return EX_DATAERR
+        return EX_OK
+
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EX_USAGE
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EX_IOERR
@@ -0,0 +1,92 @@
+# src/kprovengine/bench/corpus.py
+from __future__ import annotations
+
+import json
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+__all__ = ["CORPORA", "FileGroup", "generate_corpus"]
+
+_KIB = 1 << 10
+_MIB = 1 << 20
+_WRITE_CHUNK = 4 * _MIB
+_MARKER = ".corpus.json"
+
+
+@dataclass(frozen=True)
+class FileGroup:
+    """`count` files of `size` bytes each, named <prefix>-<n><suffix>."""
+
+    prefix: str
+    count: int
+    size: int
+    suffix: str = ".bin"
+
+
+# Synthetic corpora. --scale multiplies file counts (tiny files) and sizes (large files).
+CORPORA: dict[str, tuple[FileGroup, ...]] = {
+    "tiny": (FileGroup("tiny", 2000, 1 * _KIB, ".txt"),),
+    "huge": (FileGroup("huge", 4, 256 * _MIB),),
+    "mixed": (
+        FileGroup("tiny", 500, 1 * _KIB, ".txt"),
+        FileGroup("medium", 50, 256 * _KIB),
+        FileGroup("large", 2, 32 * _MIB),
+    ),
+}
+
+
+def _scaled(group: FileGroup, scale: float) -> FileGroup:
+    # Many-small groups scale by count, few-large groups by size.
+    if group.count >= 100:
+        return FileGroup(group.prefix, max(1, round(group.count * scale)), group.size, group.suffix)
+    return FileGroup(group.prefix, group.count, max(1, round(group.size * scale)), group.suffix)
+
+
+def _write_random(path: Path, size: int, rng: random.Random) -> None:
+    with path.open("wb") as f:
+        left = size
+        while left > 0:
+            n = min(left, _WRITE_CHUNK)
+            f.write(rng.randbytes(n))
+            left -= n
+
+
+def generate_corpus(name: str, root: Path, *, scale: float = 1.0, seed: int = 0) -> list[Path]:
+    """
+    Create (or reuse) corpus `name` under root/name and return its files in sorted order.
+
+    Content is pseudo-random from `seed`, so the same (name, scale, seed)
+    always yields the same bytes. A marker file records the parameters; an
+    existing directory with a matching marker is reused as-is.
+    """
+    if name not in CORPORA:
+        raise ValueError(f"unknown corpus {name!r}; choose from {', '.join(sorted(CORPORA))}")
+    if scale <= 0:
+        raise ValueError(f"scale must be > 0, got {scale}")
+
+    groups = [_scaled(g, scale) for g in CORPORA[name]]
+    params = {"name": name, "scale": scale, "seed": seed, "groups": [asdict(g) for g in groups]}
+    d = root / name
+    marker = d / _MARKER
+    files = [
+        d / f"{g.prefix}-{n:05d}{g.suffix}" for g in groups for n in range(g.count)
+    ]
+    try:
+        if json.loads(marker.read_text(encoding="utf-8")) == params and all(
+            p.is_file() for p in files
+        ):
+            return sorted(files)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    if d.exists():
+        shutil.rmtree(d)
+    d.mkdir(parents=True)
+    rng = random.Random(f"{name}:{seed}")
+    for g in groups:
+        for n in range(g.count):
+            _write_random(d / f"{g.prefix}-{n:05d}{g.suffix}", g.size, rng)
+    marker.write_text(json.dumps(params, sort_keys=True) + "\n", encoding="utf-8")
+    return sorted(files)
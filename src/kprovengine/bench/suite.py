@@ -0,0 +1,266 @@
+# src/kprovengine/bench/suite.py
+from __future__ import annotations
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from kprovengine.manifest.manifest import build_manifest
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.reporting.evidence_report import write_report
+from kprovengine.storage.durability import DURABILITY_MODES
+from kprovengine.types import DurabilityMode, RunInputs
+from kprovengine.version import __version__
+
+from .corpus import CORPORA, generate_corpus
+from .hashing import HASH_SIZES, bench_hashing
+
+__all__ = [
+    "BENCH_SCHEMA",
+    "BenchConfig",
+    "Regression",
+    "compare_results",
+    "load_results",
+    "run_bench",
+    "save_results",
+]
+
+BENCH_SCHEMA = "kprovengine.bench.v1"
+
+# Differences smaller than this are treated as timer noise, whatever the ratio.
+MIN_DELTA_S = 0.005
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """
+    What to measure. Every corpus is timed once per `jobs` value for
+    run_pipeline and build_manifest.
+
+    hashing adds the sha256_file microbenchmark (bench.hashing); scale also
+    applies to its file sizes. Each durability mode (storage.durability)
+    adds a serial run_pipeline timing committed under that mode.
+    """
+
+    corpora: tuple[str, ...] = tuple(CORPORA)
+    jobs: tuple[int, ...] = (1, 4)
+    repeat: int = 3
+    scale: float = 1.0
+    seed: int = 0
+    hashing: bool = True
+    durability: tuple[DurabilityMode, ...] = DURABILITY_MODES
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark whose median time grew by more than its threshold."""
+
+    key: str
+    baseline_s: float
+    current_s: float
+    change: float  # (current - baseline) / baseline
+    threshold: float
+
+
+def _measure(
+    fn: Callable[[], object],
+    repeat: int,
+    cleanup: Callable[[], None] | None = None,
+) -> list[float]:
+    times: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if cleanup is not None:
+            cleanup()
+    return times
+
+
+def _record(times: Sequence[float], files: int, nbytes: int) -> dict[str, Any]:
+    median = statistics.median(times)
+    return {
+        "repeat": len(times),
+        "seconds_median": round(median, 6),
+        "seconds_min": round(min(times), 6),
+        "files": files,
+        "bytes": nbytes,
+        "files_per_s": round(files / median, 3) if median > 0 else 0.0,
+        "mib_per_s": round(nbytes / median / (1 << 20), 3) if median > 0 else 0.0,
+    }
+
+
+def _report_manifest(corpus: str, files: Sequence[Path]) -> dict[str, Any]:
+    return {
+        "report": {"title": f"kprovengine bench: {corpus}"},
+        "artifacts": [
+            {"id": f"a{i}", "label": p.name, "path": str(p)} for i, p in enumerate(files)
+        ],
+    }
+
+
+def run_bench(
+    config: BenchConfig,
+    work_dir: Path,
+    *,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Generate the configured corpora under work_dir and time each operation.
+
+    Result keys are "<corpus>/<operation>" (run_pipeline and build_manifest
+    add "/jobs=<n>", durability runs "/durability=<mode>")
+    and "hashing/<impl>/<size>" for the hashing microbenchmark.
+    Run directories are removed between repetitions, outside the timed region.
+    """
+    if config.repeat < 1:
+        raise ValueError(f"repeat must be >= 1, got {config.repeat}")
+    results: dict[str, dict[str, Any]] = {}
+    corpus_root = work_dir / "corpora"
+    scratch = work_dir / "scratch"
+
+    def _note(key: str) -> None:
+        if progress is not None:
+            r = results[key]
+            progress(f"{key}: {r['seconds_median']:.4f}s ({r['mib_per_s']} MiB/s)")
+
+    for name in config.corpora:
+        files = generate_corpus(name, corpus_root, scale=config.scale, seed=config.seed)
+        nbytes = sum(p.stat().st_size for p in files)
+        runs_dir = scratch / name / "runs"
+
+        for jobs in config.jobs:
+            inputs = RunInputs(sources=list(files), output_dir=runs_dir, jobs=jobs)
+            times = _measure(
+                partial(run_pipeline, inputs),
+                config.repeat,
+                cleanup=partial(shutil.rmtree, runs_dir, ignore_errors=True),
+            )
+            key = f"{name}/run_pipeline/jobs={jobs}"
+            results[key] = _record(times, len(files), nbytes)
+            _note(key)
+
+        for mode in config.durability:
+            inputs = RunInputs(sources=list(files), output_dir=runs_dir, durability=mode)
+            times = _measure(
+                partial(run_pipeline, inputs),
+                config.repeat,
+                cleanup=partial(shutil.rmtree, runs_dir, ignore_errors=True),
+            )
+            key = f"{name}/run_pipeline/durability={mode}"
+            results[key] = _record(times, len(files), nbytes)
+            _note(key)
+
+        for jobs in config.jobs:
+            times = _measure(partial(build_manifest, files, jobs=jobs), config.repeat)
+            key = f"{name}/build_manifest/jobs={jobs}"
+            results[key] = _record(times, len(files), nbytes)
+            _note(key)
+
+        report_dir = scratch / name / "report"
+        report_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = report_dir / "report_manifest.json"
+        manifest_path.write_text(
+            json.dumps(_report_manifest(name, files), indent=2, sort_keys=True), encoding="utf-8"
+        )
+        times = _measure(
+            partial(
+                write_report, manifest_path, report_dir / "report.html", report_dir / "archive.json"
+            ),
+            config.repeat,
+        )
+        key = f"{name}/write_report"
+        results[key] = _record(times, len(files), nbytes)
+        _note(key)
+
+    if config.hashing:
+        sizes = [max(1, round(size * config.scale)) for size in HASH_SIZES]
+        hashed = bench_hashing(work_dir, sizes=sizes, repeat=config.repeat, seed=config.seed)
+        for key, r in hashed.items():
+            results[key] = r
+            if progress is not None:
+                progress(f"{key}: {r['seconds_median']:.4f}s ({r['mib_per_s']} MiB/s)")
+
+    shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "schema": BENCH_SCHEMA,
+        "created_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "kprovengine": __version__,
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "corpora": list(config.corpora),
+            "jobs": list(config.jobs),
+            "repeat": config.repeat,
+            "scale": config.scale,
+            "seed": config.seed,
+            "hashing": config.hashing,
+            "durability": list(config.durability),
+        },
+        "results": results,
+    }
+
+
+def save_results(results: Mapping[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("schema") != BENCH_SCHEMA:
+        raise ValueError(f"{path}: not a {BENCH_SCHEMA} results file")
+    return data
+
+
+def _threshold_for(key: str, default: float, overrides: Mapping[str, float]) -> float:
+    # Most specific wins: the full key, then the operation name.
+    if key in overrides:
+        return overrides[key]
+    op = key.split("/")[1] if "/" in key else key
+    return overrides.get(op, default)
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = 0.10,
+    thresholds: Mapping[str, float] | None = None,
+    min_delta_s: float = MIN_DELTA_S,
+) -> list[Regression]:
+    """
+    Return the benchmarks whose median time regressed, sorted by key.
+
+    A benchmark regresses when its median grew by more than its threshold (a
+    fraction: 0.10 = 10% slower) and by more than min_delta_s seconds.
+    `thresholds` overrides the default per operation ("run_pipeline") or per
+    full key ("huge/run_pipeline/jobs=4"). Keys missing on either side are
+    ignored.
+    """
+    overrides = dict(thresholds or {})
+    base_res = baseline.get("results", {})
+    cur_res = current.get("results", {})
+    out: list[Regression] = []
+    for key in sorted(base_res.keys() & cur_res.keys()):
+        b = float(base_res[key]["seconds_median"])
+        c = float(cur_res[key]["seconds_median"])
+        thr = _threshold_for(key, threshold, overrides)
+        if b <= 0 or c - b <= min_delta_s:
+            continue
+        change = (c - b) / b
+        if change > thr:
+            out.append(Regression(key, b, c, round(change, 4), thr))
+    return out
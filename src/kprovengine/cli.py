@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
 import json
+import os
+import sqlite3
 import sys
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
 from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import IO, TYPE_CHECKING
 
+from .manifest.hashing import normalize_algorithms
+from .manifest.merkle import InclusionProof, MerkleTree, verify_inclusion
+from .manifest.verify import verify_run
 from .pipeline import run_pipeline
+from .storage.catalog import CATALOG_FILENAME, RunCatalog
+from .storage.lineage import walk_lineage
 from .types import RunInputs
 
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+
 # ----- Deterministic exit codes (POSIX-ish) -----
 EX_OK = 0
 EX_USAGE = 64        # command line usage error
@@ -26,8 +39,43 @@ class CliResult:
     evidence: bool
 
 
+@dataclass(frozen=True)
+class _Streams:
+    cwd: Path | None = None
+    stdout: IO[str] | None = None
+    stderr: IO[str] | None = None
+
+
+# Per-call working directory and output streams (see main()); None means the process's own.
+_PROCESS_STREAMS = _Streams()
+_STREAMS: ContextVar[_Streams] = ContextVar("kprovengine_cli_streams", default=_PROCESS_STREAMS)
+
+
+def _out(msg: str) -> None:
+    print(msg, file=_STREAMS.get().stdout)
+
+
 def _eprint(msg: str) -> None:
-    print(msg, file=sys.stderr)
+    print(msg, file=_STREAMS.get().stderr or sys.stderr)
+
+
+def _path(arg: str) -> Path:
+    """A path argument, relative to the caller's cwd."""
+    p = Path(arg).expanduser()
+    cwd = _STREAMS.get().cwd
+    return cwd / p if cwd is not None and not p.is_absolute() else p
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser whose help and usage errors go to the caller's streams."""
+
+    def _print_message(self, message: str, file: SupportsWrite[str] | None = None) -> None:
+        streams = _STREAMS.get()
+        if file is sys.stdout:
+            file = streams.stdout or file
+        else:
+            file = streams.stderr or file
+        super()._print_message(message, file)
 
 
 def _canon_existing_file(p: Path) -> Path:
@@ -37,6 +85,74 @@ def _canon_existing_file(p: Path) -> Path:
     return cp
 
 
+def _matches(rel: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(rel, pat) for pat in patterns)
+
+
+def _walk_dir(root: Path, include: Sequence[str], exclude: Sequence[str]) -> list[Path]:
+    """
+    Recursively list regular files under root with os.scandir, in sorted order.
+
+    Globs match the POSIX path relative to root. Excluded directories are
+    pruned; directory symlinks are not followed.
+    """
+    found: list[Path] = []
+    stack: list[tuple[Path, str]] = [(root, "")]
+    while stack:
+        d, prefix = stack.pop()
+        with os.scandir(d) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        subdirs: list[tuple[Path, str]] = []
+        for e in entries:
+            rel = f"{prefix}{e.name}"
+            if exclude and _matches(rel, exclude):
+                continue
+            if e.is_dir(follow_symlinks=False):
+                subdirs.append((Path(e.path), f"{rel}/"))
+            elif e.is_file() and (not include or _matches(rel, include)):
+                found.append(Path(e.path))
+        # Reverse so the stack pops subdirectories in name order.
+        stack.extend(reversed(subdirs))
+    return found
+
+
+def _read_filelist(p: Path) -> list[str]:
+    """@filelist: one path per line; blank lines and '#' comments are ignored."""
+    lines = p.expanduser().read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+def _expand_sources(
+    args: Sequence[str], include: Sequence[str], exclude: Sequence[str]
+) -> list[Path]:
+    """
+    Expand file, directory and @filelist arguments into one ordered list of files.
+
+    Files named explicitly are always kept; include/exclude only filter files
+    found by walking directories. Duplicates (after resolving) keep their
+    first position.
+    """
+    expanded: list[str] = []
+    for a in args:
+        if a.startswith("@") and len(a) > 1:
+            expanded.extend(_read_filelist(_path(a[1:])))
+        else:
+            expanded.append(a)
+
+    seen: set[Path] = set()
+    out: list[Path] = []
+    for a in expanded:
+        p = _path(a).resolve(strict=True)
+        files = _walk_dir(p, include, exclude) if p.is_dir() else [_canon_existing_file(p)]
+        for f in files:
+            if f not in seen:
+                seen.add(f)
+                out.append(f)
+    if not out:
+        raise ValueError("no source files found")
+    return out
+
+
 def _canon_out_dir(p: Path) -> Path:
     pp = p.expanduser()
     if not pp.is_absolute():
@@ -55,16 +171,295 @@ def _sorted_str_paths(paths: Iterable[object]) -> list[str]:
     return sorted(out)
 
 
+def _build_proof_parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(
+        prog="kprovengine proof",
+        description="Generate or check Merkle inclusion proofs for run manifests.",
+    )
+    sub = parser.add_subparsers(dest="action", required=True)
+    prove = sub.add_parser("prove", help="Print the inclusion proof of one manifest entry.")
+    prove.add_argument("run_dir", help="Run directory holding manifest.json.")
+    prove.add_argument("path", help="Manifest entry path as recorded, or the file inside run_dir.")
+    check = sub.add_parser("check", help="Verify a proof against a trusted root.")
+    check.add_argument("proof", help="Proof JSON file ('-' for stdin).")
+    anchor = check.add_mutually_exclusive_group(required=True)
+    anchor.add_argument("--root", help="Trusted Merkle root (hex).")
+    anchor.add_argument("--run-dir", help="Take the trusted root from this run's run_summary.json.")
+    return parser
+
+
+def _proof_main(argv: list[str]) -> int:
+    """
+    `kprovengine proof prove RUN_DIR PATH` prints a proof as JSON;
+    `kprovengine proof check PROOF (--root HEX | --run-dir DIR)` prints
+    {"valid": ...} and exits EX_DATAERR when the proof does not verify.
+    """
+    try:
+        ns = _build_proof_parser().parse_args(argv)
+    except SystemExit as e:
+        return EX_OK if not e.code else EX_USAGE
+
+    try:
+        if ns.action == "prove":
+            run_dir = _path(ns.run_dir)
+            manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+            tree = MerkleTree.from_manifest(manifest)
+            recorded = manifest.get("merkle", {}).get("root")
+            if recorded is not None and recorded != tree.root:
+                _eprint(f"error: manifest does not match its recorded root {recorded}")
+                return EX_DATAERR
+            try:
+                proof = tree.proof(ns.path)
+            except KeyError:
+                # Merkle manifests record run-relative paths; accept the file's own path too.
+                target = _path(ns.path).resolve()
+                base = run_dir.resolve()
+                if not target.is_relative_to(base):
+                    raise
+                proof = tree.proof(target.relative_to(base).as_posix())
+            _out(json.dumps(proof.to_dict(), indent=2, sort_keys=True))
+            return EX_OK
+
+        raw = sys.stdin.read() if ns.proof == "-" else _path(ns.proof).read_text(encoding="utf-8")
+        proof = InclusionProof.from_dict(json.loads(raw))
+        root = ns.root
+        if root is None:
+            summary_path = _path(ns.run_dir) / "run_summary.json"
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+            root = summary.get("manifest", {}).get("merkle_root")
+            if not root:
+                raise ValueError(f"{summary_path}: run has no Merkle root (manifest mode flat)")
+        valid = verify_inclusion(proof, root)
+        _out(json.dumps({"path": proof.path, "root": root, "valid": valid}, sort_keys=True))
+        return EX_OK if valid else EX_DATAERR
+
+    except KeyError as e:
+        _eprint(f"error: not in manifest: {e.args[0]}")
+        return EX_DATAERR
+    except FileNotFoundError as e:
+        _eprint(f"error: {e}")
+        return EX_DATAERR
+    except ValueError as e:
+        _eprint(f"error: {e}")
+        return EX_USAGE
+    except OSError as e:
+        _eprint(f"error: {e}")
+        return EX_IOERR
+
+
+def _build_verify_parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(
+        prog="kprovengine verify",
+        description="Re-verify a run directory against its manifest.json.",
+    )
+    parser.add_argument("run_dir", help="Run directory to verify.")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Rehash every entry, even when its stat signature is unchanged.",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        default=0.0,
+        help="Fraction of stat-matched entries to rehash anyway (0..1). Default: 0",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --sample.")
+    parser.add_argument("--jobs", type=int, default=1, help="Files verified concurrently.")
+    return parser
+
+
+def _verify_main(argv: list[str]) -> int:
+    """
+    `kprovengine verify RUN_DIR` prints a JSON report (mismatches included)
+    on stdout and exits EX_DATAERR when any entry does not verify.
+    """
+    try:
+        ns = _build_verify_parser().parse_args(argv)
+    except SystemExit as e:
+        return EX_OK if not e.code else EX_USAGE
+
+    try:
+        report = verify_run(
+            _path(ns.run_dir),
+            strict=bool(ns.strict),
+            sample=float(ns.sample),
+            seed=ns.seed,
+            jobs=int(ns.jobs),
+        )
+    except (KeyError, TypeError) as e:
+        _eprint(f"error: malformed manifest: {type(e).__name__}: {e}")
+        return EX_DATAERR
+    except ValueError as e:
+        _eprint(f"error: {e}")
+        return EX_USAGE
+    except FileNotFoundError as e:
+        _eprint(f"error: {e}")
+        return EX_DATAERR
+    except OSError as e:
+        _eprint(f"error: {e}")
+        return EX_IOERR
+
+    _out(json.dumps(report.to_dict(), indent=2, sort_keys=True))
+    return EX_OK if report.ok else EX_DATAERR
+
+
+def _build_runs_parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(
+        prog="kprovengine runs",
+        description="Query or rebuild the run catalog (<out>/catalog.sqlite).",
+    )
+    sub = parser.add_subparsers(dest="action", required=True)
+    query = sub.add_parser("query", help="List catalogued runs matching every filter.")
+    query.add_argument("--since", help="Runs started at or after this ISO 8601 time.")
+    query.add_argument("--until", help="Runs started before this ISO 8601 time.")
+    query.add_argument("--sha256", help="Runs with an input or output of this digest.")
+    query.add_argument("--role", choices=("input", "output"), help="Restrict --sha256 to one side.")
+    query.add_argument("--status", help="Review status, e.g. PENDING.")
+    query.add_argument("--evidence", choices=("ENABLED", "DISABLED"), help="Evidence mode.")
+    query.add_argument("--limit", type=int, default=None, help="At most this many runs.")
+    sub.add_parser("rebuild", help="Recreate the catalog from the run directories.")
+    for p in sub.choices.values():
+        p.add_argument("--out", default="runs", help="Base output directory. Default: runs")
+    return parser
+
+
+def _runs_main(argv: list[str]) -> int:
+    """
+    `kprovengine runs query [filters]` prints {"runs": [...]};
+    `kprovengine runs rebuild` re-indexes every run directory under --out
+    and prints {"runs": N}.
+    """
+    try:
+        ns = _build_runs_parser().parse_args(argv)
+    except SystemExit as e:
+        return EX_OK if not e.code else EX_USAGE
+
+    out_dir = _path(ns.out)
+    try:
+        if ns.action == "rebuild":
+            if not out_dir.is_dir():
+                raise FileNotFoundError(f"output directory not found: {out_dir}")
+            with RunCatalog.for_output_dir(out_dir) as catalog:
+                count = catalog.rebuild(out_dir)
+            _out(json.dumps({"catalog": str(catalog.path), "runs": count}, sort_keys=True))
+            return EX_OK
+
+        catalog_path = out_dir / CATALOG_FILENAME
+        if not catalog_path.is_file():
+            raise FileNotFoundError(f"no run catalog at {catalog_path} (try `runs rebuild`)")
+        with RunCatalog(catalog_path) as catalog:
+            runs = catalog.query(
+                since=ns.since,
+                until=ns.until,
+                sha256=ns.sha256,
+                role=ns.role,
+                review_status=ns.status,
+                evidence=ns.evidence,
+                limit=ns.limit,
+            )
+        _out(json.dumps({"runs": runs}, indent=2, sort_keys=True))
+        return EX_OK
+
+    except (KeyError, TypeError) as e:
+        _eprint(f"error: malformed run record: {type(e).__name__}: {e}")
+        return EX_DATAERR
+    except ValueError as e:
+        _eprint(f"error: {e}")
+        return EX_USAGE
+    except FileNotFoundError as e:
+        _eprint(f"error: {e}")
+        return EX_DATAERR
+    except (OSError, sqlite3.Error) as e:
+        _eprint(f"error: {e}")
+        return EX_IOERR
+
+
+def _build_lineage_parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(
+        prog="kprovengine lineage",
+        description="Which runs consumed or produced a file, by sha256 (from the run catalog).",
+    )
+    parser.add_argument("sha256", help="File digest (hex).")
+    parser.add_argument("--out", default="runs", help="Base output directory. Default: runs")
+    parser.add_argument(
+        "--direction",
+        choices=("upstream", "downstream", "both"),
+        default="both",
+        help="Follow producers (upstream), consumers (downstream) or both. Default: both",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=None, help="Stop after this many hops. Default: no limit"
+    )
+    return parser
+
+
+def _lineage_main(argv: list[str]) -> int:
+    """
+    `kprovengine lineage SHA256` prints {"sha256", "runs", "upstream",
+    "downstream"}: the files recorded with that digest, then the runs
+    reached hop by hop. Exits EX_DATAERR when no run touched it.
+    """
+    try:
+        ns = _build_lineage_parser().parse_args(argv)
+    except SystemExit as e:
+        return EX_OK if not e.code else EX_USAGE
+
+    catalog_path = _path(ns.out) / CATALOG_FILENAME
+    try:
+        if not catalog_path.is_file():
+            raise FileNotFoundError(f"no run catalog at {catalog_path} (try `runs rebuild`)")
+        sha = str(ns.sha256).lower()
+        payload: dict[str, object] = {"sha256": sha}
+        with RunCatalog(catalog_path) as catalog:
+            payload["runs"] = catalog.lookup(sha)
+            for direction in ("upstream", "downstream"):
+                if ns.direction in (direction, "both"):
+                    steps = walk_lineage(catalog, sha, direction=direction, max_depth=ns.depth)
+                    payload[direction] = [s.to_dict() for s in steps]
+    except (KeyError, TypeError) as e:
+        _eprint(f"error: malformed catalog record: {type(e).__name__}: {e}")
+        return EX_DATAERR
+    except ValueError as e:
+        _eprint(f"error: {e}")
+        return EX_USAGE
+    except FileNotFoundError as e:
+        _eprint(f"error: {e}")
+        return EX_DATAERR
+    except (OSError, sqlite3.Error) as e:
+        _eprint(f"error: {e}")
+        return EX_IOERR
+
+    _out(json.dumps(payload, indent=2, sort_keys=True))
+    return EX_OK if payload["runs"] else EX_DATAERR
+
+
 def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
+    parser = _ArgumentParser(
         prog="kprovengine",
         description="kprovengine CLI (V1).",
         add_help=True,
     )
 
     parser.add_argument(
-        "source",
-        help="Input source file path.",
+        "sources",
+        nargs="+",
+        metavar="source",
+        help="Input source file, directory (walked recursively) or @filelist.",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only take files matching GLOB from directory sources (repeatable).",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip files and directories matching GLOB in directory sources (repeatable).",
     )
     parser.add_argument(
         "--out",
@@ -78,6 +473,67 @@ def _build_parser() -> argparse.ArgumentParser:
         default=True,
         help="Record evidence mode in outputs (bundle generation remains incremental in V1).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of sources processed concurrently. Default: 1",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Stage result cache directory; unchanged inputs are linked from it on re-runs.",
+    )
+    parser.add_argument(
+        "--object-store",
+        default=None,
+        help="Shared content-addressed store; run files become links into it.",
+    )
+    parser.add_argument(
+        "--hash-algo",
+        default="sha256",
+        help="Comma-separated manifest digests, e.g. sha256,blake2b (sha256 is always kept).",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        default=None,
+        help="Persistent SQLite digest cache; unchanged files are not rehashed across runs.",
+    )
+    parser.add_argument(
+        "--manifest-mode",
+        choices=("flat", "merkle"),
+        default="flat",
+        help="merkle: tree-ordered manifest with its root in run_summary.json. Default: flat",
+    )
+    parser.add_argument(
+        "--manifest-index",
+        action="store_true",
+        help="Also write manifest.idx, a binary sidecar for O(log n) lookups by path.",
+    )
+    parser.add_argument(
+        "--intermediates",
+        choices=("persist", "scratch"),
+        default="persist",
+        help="scratch: keep stage intermediates out of the run dir unless a source fails. "
+        "Default: persist",
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        default=None,
+        help="Where --intermediates scratch writes (e.g. a tmpfs). Default: system temp dir",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=("fast", "durable", "paranoid"),
+        default="fast",
+        help="Evidence commit: fast (no fsync), durable (atomic, grouped fsync) or paranoid. "
+        "Default: fast",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write per-stage cProfile and tracemalloc reports to <run_dir>/profile (serial).",
+    )
     parser.add_argument(
         "--format",
         dest="fmt",
@@ -96,16 +552,59 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
+def main(
+    argv: list[str] | None = None,
+    *,
+    cwd: Path | None = None,
+    stdout: IO[str] | None = None,
+    stderr: IO[str] | None = None,
+) -> int:
     """
     Contract:
       - Deterministic exit codes.
       - Stable JSON schema when --format=json.
       - Errors are prefixed with 'error:' and written to stderr.
       - All exceptions are handled at the CLI boundary.
+      - Per-source failures are reported on stderr after the result payload
+        and exit with EX_DATAERR.
+      - `kprovengine bench ...` runs the benchmark suite (kprovengine.bench).
+      - `kprovengine proof ...` generates / checks Merkle inclusion proofs.
+      - `kprovengine verify RUN_DIR` re-verifies a run against its manifest.
+      - `kprovengine runs query|rebuild` reads / rebuilds the run catalog.
+      - `kprovengine lineage SHA256` lists the runs upstream / downstream of a file.
+      - `kprovengine serve` keeps a warm job server; the `kprovengine` command
+        (kprovengine.client) forwards to it while it runs.
+
+    cwd, stdout and stderr stand in for the process's own for this call
+    only (relative path arguments resolve against cwd), so concurrent calls
+    from one process, as in kprovengine.server, do not interfere.
     """
-    if argv is None:
-        argv = sys.argv[1:]
+    token = _STREAMS.set(_Streams(cwd, stdout, stderr))
+    try:
+        return _main(sys.argv[1:] if argv is None else argv)
+    finally:
+        _STREAMS.reset(token)
+
+
+def _main(argv: list[str]) -> int:
+
+    # Subcommands are dispatched before argparse sees the argv (use ./bench for a source named bench).
+    if argv and argv[0] == "bench":
+        from .bench.cli import main as bench_main
+
+        return bench_main(argv[1:])
+    if argv and argv[0] == "proof":
+        return _proof_main(argv[1:])
+    if argv and argv[0] == "verify":
+        return _verify_main(argv[1:])
+    if argv and argv[0] == "runs":
+        return _runs_main(argv[1:])
+    if argv and argv[0] == "lineage":
+        return _lineage_main(argv[1:])
+    if argv and argv[0] == "serve":
+        from .server import main as serve_main
+
+        return serve_main(argv[1:])
 
     parser = _build_parser()
 
@@ -115,20 +614,36 @@ def main(argv: list[str] | None = None) -> int:
         if ns.version:
             # V1: conservative fixed string. If you want dynamic:
             # from importlib.metadata import version; print(version("kprovengine"))
-            print("kprovengine (V1)")
+            _out("kprovengine (V1)")
             return EX_OK
 
-        src = _canon_existing_file(Path(ns.source))
-        out_base = _canon_out_dir(Path(ns.out))
+        srcs = _expand_sources(ns.sources, ns.include, ns.exclude)
+        out_base = _canon_out_dir(_path(ns.out))
         evidence = bool(ns.evidence)
         fmt = str(ns.fmt).lower()
+        jobs = int(ns.jobs)
+        if jobs < 1:
+            raise ValueError(f"--jobs must be >= 1, got {jobs}")
+
+        algorithms = normalize_algorithms(str(ns.hash_algo).split(","))
 
         # Preserve existing V1 pipeline contract: evidence as marker string.
         res = run_pipeline(
             RunInputs(
-                sources=[src],
+                sources=srcs,
                 output_dir=out_base,
                 evidence="ENABLED" if evidence else "DISABLED",
+                jobs=jobs,
+                cache_dir=_path(ns.cache_dir).resolve() if ns.cache_dir else None,
+                object_store=_path(ns.object_store).resolve() if ns.object_store else None,
+                profile=bool(ns.profile),
+                hash_algorithms=algorithms,
+                manifest_mode=ns.manifest_mode,
+                hash_cache=_path(ns.hash_cache).resolve() if ns.hash_cache else None,
+                manifest_index=bool(ns.manifest_index),
+                intermediates=ns.intermediates,
+                durability=ns.durability,
+                scratch_dir=_path(ns.scratch_dir).resolve() if ns.scratch_dir else None,
             )
         )
 
@@ -144,14 +659,21 @@ def main(argv: list[str] | None = None) -> int:
         )
 
         if fmt == "json":
-            print(json.dumps(asdict(cli_res), indent=2, sort_keys=True))
+            _out(json.dumps(asdict(cli_res), indent=2, sort_keys=True))
         else:
-            print(f"run_id={cli_res.run_id}")
-            print(f"run_dir={cli_res.run_dir}")
-            print(f"evidence={'ENABLED' if cli_res.evidence else 'DISABLED'}")
-            print("outputs:")
+            _out(f"run_id={cli_res.run_id}")
+            _out(f"run_dir={cli_res.run_dir}")
+            _out(f"evidence={'ENABLED' if cli_res.evidence else 'DISABLED'}")
+            _out("outputs:")
             for p in cli_res.outputs:
-                print(f"  - {p}")
+                _out(f"  - {p}")
+
+        # Per-source failures do not abort the batch; report them and exit non-zero.
+        failures = list(getattr(res, "failures", []))
+        for f in failures:
+            _eprint(f"error: {f['source']}: {f['stage']}: {f['error']}")
+        if failures:
+            return EX_DATAERR
 
         return EX_OK
 
@@ -0,0 +1,145 @@
+# src/kprovengine/client.py
+from __future__ import annotations
+
+# Kept to the stdlib and free of kprovengine imports: when a server is
+# running, a CLI call costs only this module's import and one round trip.
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+__all__ = ["LOCAL_ONLY", "default_socket_path", "forward", "main", "private_dir", "request"]
+
+# Set to any non-empty value to always run in-process.
+NO_DAEMON_ENV = "KPROVENGINE_NO_DAEMON"
+SOCKET_ENV = "KPROVENGINE_SOCKET"
+
+# Subcommands that always run in the calling process: serve starts the
+# server itself and bench measures the process it runs in.
+LOCAL_ONLY = ("serve", "bench")
+
+EX_IOERR = 74
+EX_SOFTWARE = 70
+
+
+def private_dir() -> Path:
+    """Per-user fallback directory for the socket (created 0700 by the server)."""
+    return Path(tempfile.gettempdir()) / f"kprovengine-{os.getuid()}"
+
+
+def default_socket_path() -> Path:
+    """$KPROVENGINE_SOCKET, else kprovengine.sock in $XDG_RUNTIME_DIR or private_dir()."""
+    env = os.environ.get(SOCKET_ENV)
+    if env:
+        return Path(env).expanduser()
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "kprovengine.sock"
+    return private_dir() / "kprovengine.sock"
+
+
+def _connect(path: Path, timeout: float | None) -> socket.socket:
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.settimeout(timeout)
+        s.connect(str(path))
+    except BaseException:
+        s.close()
+        raise
+    return s
+
+
+def _exchange(s: socket.socket, payload: dict[str, Any], path: Path) -> dict[str, Any]:
+    with s:
+        s.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"no reply from {path}")
+    reply: dict[str, Any] = json.loads(line)
+    return reply
+
+
+def request(
+    payload: dict[str, Any], *, socket_path: Path | None = None, timeout: float | None = None
+) -> dict[str, Any]:
+    """Send one request to the server and return its reply (raises OSError if unreachable)."""
+    path = socket_path or default_socket_path()
+    return _exchange(_connect(path, timeout), payload, path)
+
+
+def _owned_socket(path: Path) -> bool:
+    """True if path is a socket owned by this user; False if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid():
+        return True
+    print(
+        f"warning: ignoring {path}: not a socket owned by uid {os.getuid()}; running in-process",
+        file=sys.stderr,
+    )
+    return False
+
+
+def forward(argv: list[str], *, socket_path: Path | None = None) -> int | None:
+    """
+    Run argv on the server, replaying its stdout/stderr here.
+
+    Returns the exit code, or None when no server can be reached (missing,
+    stale or foreign socket, or any error while connecting) so the caller
+    can run in-process instead. Once the request is sent it is never
+    retried: a failure after that point returns EX_IOERR.
+    """
+    path = socket_path or default_socket_path()
+    if not _owned_socket(path):
+        return None
+    try:
+        s = _connect(path, None)
+    except OSError:
+        return None
+    payload = {"op": "run", "argv": argv, "cwd": os.getcwd()}
+    try:
+        reply = _exchange(s, payload, path)
+    except (OSError, ValueError) as e:
+        print(f"error: server: {e}", file=sys.stderr)
+        return EX_IOERR
+    if "error" in reply:
+        print(f"error: server: {reply['error']}", file=sys.stderr)
+        return EX_SOFTWARE
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    sys.stdout.flush()
+    return int(reply["exit_code"])
+
+
+def _forwardable(argv: list[str]) -> bool:
+    if os.environ.get(NO_DAEMON_ENV):
+        return False
+    # The server is Unix-only (AF_UNIX, per-uid socket dir); elsewhere run in-process.
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return False
+    # "-" means stdin, which is not forwarded.
+    return bool(argv) and argv[0] not in LOCAL_ONLY and "-" not in argv
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    `kprovengine` entry point: forward to a running `kprovengine serve`,
+    else import the CLI and run in-process (see cli.main for the contract).
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if _forwardable(argv):
+        code = forward(argv)
+        if code is not None:
+            return code
+    from .cli import main as cli_main
+
+    return cli_main(argv)
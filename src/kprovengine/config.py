@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
+from kprovengine.manifest.hashing import normalize_algorithms
+
 
 @dataclass(frozen=True)
 class KProvConfig:
@@ -14,4 +16,8 @@ class KProvConfig:
 
     work_dir: Path
     default_runs_dirname: str = "runs"
-    hash_algo: str = "sha256"
+    hash_algo: str = "sha256"  # comma-separated hashlib names, e.g. "sha256,blake2b"
+
+    def hash_algorithms(self) -> tuple[str, ...]:
+        """Parsed hash_algo: validated names, sha256 first (raises ValueError if unsupported)."""
+        return normalize_algorithms(self.hash_algo.split(","))
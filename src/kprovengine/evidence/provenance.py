@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import json
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -17,14 +17,30 @@ class ProvenanceRecord:
     inputs: list[str]
     outputs: list[str]
     timestamp: str
+    input_sha256: dict[str, str] = field(default_factory=dict)
 
     @classmethod
-    def from_paths(cls, run_id: str, inputs: Sequence[Path], outputs: Sequence[Path]) -> ProvenanceRecord:
+    def from_paths(
+        cls,
+        run_id: str,
+        inputs: Sequence[Path],
+        outputs: Sequence[Path],
+        input_sha256: Sequence[str | None] | None = None,
+    ) -> ProvenanceRecord:
+        """
+        input_sha256, when given, is parallel to inputs; None entries are omitted.
+        """
+        hashes: dict[str, str] = {}
+        if input_sha256 is not None:
+            if len(input_sha256) != len(inputs):
+                raise ValueError("input_sha256 must be parallel to inputs")
+            hashes = {str(p): h for p, h in zip(inputs, input_sha256, strict=True) if h}
         return cls(
             run_id=run_id,
             inputs=[str(p) for p in inputs],
             outputs=[str(p) for p in outputs],
             timestamp=_now_utc_iso(),
+            input_sha256=hashes,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -33,11 +49,17 @@ class ProvenanceRecord:
             "inputs": self.inputs,
             "outputs": self.outputs,
             "timestamp": self.timestamp,
+            "input_sha256": self.input_sha256,
         }
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2, sort_keys=True)
 
+    def write_json(self, path: Path) -> None:
+        """Write to_json() to path; json.dump encodes in chunks, never the whole string."""
+        with path.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+            json.dump(self.to_dict(), fp, indent=2, sort_keys=True)
+
 
 def _now_utc_iso() -> str:
     return datetime.now(UTC).isoformat().replace("+00:00", "Z")
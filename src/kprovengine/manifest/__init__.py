@@ -1,13 +1,43 @@
 # src/kprovengine/manifest/__init__.py
 from __future__ import annotations
 
-from .hashing import sha256_bytes, sha256_file
+from .hash_cache import HashCache
+from .hashing import (
+    DEFAULT_ALGORITHMS,
+    HashingReader,
+    HashingWriter,
+    MultiHasher,
+    hash_file,
+    normalize_algorithms,
+    sha256_bytes,
+    sha256_file,
+)
+from .index import ManifestIndex, write_manifest_index
 from .manifest import Manifest, ManifestEntry, build_manifest
+from .merkle import MERKLE_SCHEME, InclusionProof, MerkleTree, leaf_hash, verify_inclusion
+from .verify import VerifyReport, verify_run, write_stat_index
 
 __all__ = [
+    "DEFAULT_ALGORITHMS",
+    "MERKLE_SCHEME",
+    "HashCache",
+    "HashingReader",
+    "HashingWriter",
+    "InclusionProof",
     "Manifest",
     "ManifestEntry",
+    "ManifestIndex",
+    "MerkleTree",
+    "MultiHasher",
+    "VerifyReport",
     "build_manifest",
+    "hash_file",
+    "leaf_hash",
+    "normalize_algorithms",
     "sha256_bytes",
     "sha256_file",
+    "verify_inclusion",
+    "verify_run",
+    "write_manifest_index",
+    "write_stat_index",
 ]
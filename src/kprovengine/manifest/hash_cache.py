@@ -0,0 +1,174 @@
+# src/kprovengine/manifest/hash_cache.py
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .hashing import DEFAULT_ALGORITHMS, MMAP_THRESHOLD, hash_file, normalize_algorithms
+
+__all__ = ["DEFAULT_MAX_ENTRIES", "HashCache"]
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Files modified this recently are hashed but not cached: a write landing in
+# the same mtime tick would otherwise leave a stale digest behind.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Eviction runs once per this many inserts rather than on every put.
+_EVICT_EVERY = 1024
+# Writes are committed in batches, but never held open longer than this,
+# so other processes sharing the cache are not locked out.
+_COMMIT_EVERY_S = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algo TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, algo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hashes_used ON hashes (used);
+"""
+
+
+def _key(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class HashCache:
+    """
+    Persistent file-digest cache (SQLite), keyed by (device, inode, size, mtime_ns).
+
+    A hit returns the recorded digests without reading the file; a lookup
+    that needs an uncached algorithm rehashes the file once, for all of
+    them. Files modified within RACY_WINDOW_NS are never cached. The table
+    is bounded to max_entries rows; the least recently used rows are
+    evicted first (a row is one file and algorithm). Safe to share between
+    threads; separate processes coordinate through SQLite's WAL locking.
+    Call close() (or use it as a context manager) to flush.
+    """
+
+    def __init__(self, path: Path, *, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.path = path
+        self.max_entries = max_entries
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT COALESCE(MAX(used), 0) FROM hashes").fetchone()
+        self._clock = int(row[0])
+        self._inserts = 0
+        self._last_commit = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> HashCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0])
+
+    def get(self, st: os.stat_result, algorithms: Iterable[str]) -> dict[str, str] | None:
+        """Digests for the file with stat st, or None unless every algorithm is cached."""
+        algos = tuple(algorithms)
+        key = _key(st)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT algo, digest FROM hashes"
+                " WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+                key,
+            ).fetchall()
+            got = {a: d for a, d in rows if a in algos}
+            if len(got) < len(algos):
+                return None
+            self._clock += 1
+            self._db.execute(
+                "UPDATE hashes SET used = ? WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+                (self._clock, *key),
+            )
+            self._maybe_commit_locked()
+        return {a: got[a] for a in algos}
+
+    def put(self, st: os.stat_result, digests: dict[str, str]) -> None:
+        if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+            return
+        key = _key(st)
+        with self._lock:
+            self._clock += 1
+            self._db.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, algo, digest, self._clock) for algo, digest in digests.items()],
+            )
+            self._inserts += len(digests)
+            if self._inserts >= _EVICT_EVERY:
+                self._evict_locked()
+            self._maybe_commit_locked()
+
+    def _maybe_commit_locked(self) -> None:
+        now = time.monotonic()
+        if now - self._last_commit >= _COMMIT_EVERY_S:
+            self._db.commit()
+            self._last_commit = now
+
+    def _evict_locked(self) -> None:
+        self._inserts = 0
+        count = int(self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0])
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM hashes WHERE used <= ("
+                " SELECT used FROM hashes ORDER BY used LIMIT 1 OFFSET ?)",
+                (excess - 1,),
+            )
+
+    def evict(self) -> None:
+        """Trim to max_entries now (otherwise done every few puts)."""
+        with self._lock:
+            self._evict_locked()
+            self._db.commit()
+
+    def hash_file(
+        self,
+        path: str | Path,
+        algorithms: Iterable[str] = DEFAULT_ALGORITHMS,
+        *,
+        mmap_threshold: int = MMAP_THRESHOLD,
+    ) -> dict[str, str]:
+        """hashing.hash_file() through the cache."""
+        algos = normalize_algorithms(algorithms)
+        p = Path(path)
+        try:
+            before = p.stat()
+        except OSError:
+            return hash_file(p, algos)  # raises the usual error
+        cached = self.get(before, algos)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        digests = hash_file(p, algos, mmap_threshold=mmap_threshold)
+        # Only cache what was read from a file that did not change meanwhile.
+        if _key(p.stat()) == _key(before):
+            self.put(before, digests)
+        return digests
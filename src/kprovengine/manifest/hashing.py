@@ -1,20 +1,85 @@
 from __future__ import annotations
 
 import hashlib
+import io
+import mmap
+import os
+from collections.abc import Iterable
 from pathlib import Path
+from typing import BinaryIO
 
 __all__ = [
+    "DEFAULT_ALGORITHMS",
+    "MMAP_THRESHOLD",
+    "HashingReader",
+    "HashingWriter",
+    "MultiHasher",
+    "hash_file",
+    "normalize_algorithms",
     "sha256_bytes",
     "sha256_file",
 ]
 
+# Files at least this large are hashed through mmap in a single update() call.
+MMAP_THRESHOLD = 64 * 1024 * 1024
 
-def sha256_bytes(data: bytes) -> str:
+# sha256 is the V1 audit digest; it is always computed, other algorithms are added to it.
+DEFAULT_ALGORITHMS: tuple[str, ...] = ("sha256",)
+
+# Window fed to every hasher in turn when several digests share one read.
+MULTI_CHUNK_SIZE = 1 << 20
+
+
+def normalize_algorithms(names: Iterable[str]) -> tuple[str, ...]:
+    """
+    Validate hashlib algorithm names: lowercased, deduplicated, sha256 first.
+
+    Raises:
+        ValueError: for names hashlib does not provide, or variable-length
+            (shake_*) algorithms whose hex digest needs a length.
+    """
+    out: list[str] = list(DEFAULT_ALGORITHMS)
+    for raw in names:
+        name = raw.strip().lower()
+        if not name or name in out:
+            continue
+        try:
+            h = hashlib.new(name)
+        except ValueError:
+            raise ValueError(f"unsupported hash algorithm: {raw!r}") from None
+        if h.digest_size == 0 or name.startswith("shake_"):
+            raise ValueError(f"variable-length hash algorithm not supported: {raw!r}")
+        out.append(name)
+    return tuple(out)
+
+
+class MultiHasher:
+    """
+    Several hashlib digests fed from one stream of bytes.
+
+    update() hands the same buffer to every hasher, so each byte is read
+    from disk once however many algorithms are requested.
+    """
+
+    def __init__(self, algorithms: Iterable[str] = DEFAULT_ALGORITHMS) -> None:
+        self.algorithms = normalize_algorithms(algorithms)
+        self._hashers = [hashlib.new(name) for name in self.algorithms]
+
+    def update(self, data: bytes | bytearray | memoryview) -> None:
+        for h in self._hashers:
+            h.update(data)
+
+    def hexdigests(self) -> dict[str, str]:
+        return {name: h.hexdigest() for name, h in zip(self.algorithms, self._hashers, strict=True)}
+
+
+def sha256_bytes(data: bytes | bytearray | memoryview) -> str:
     """
     Compute the SHA-256 hex digest of the given bytes.
 
     Args:
-        data: raw bytes to hash.
+        data: raw bytes, or any contiguous buffer (bytearray, memoryview,
+            mmap); buffers are hashed in place, without a copy.
 
     Returns:
         A 64-character lowercase hex string.
@@ -24,12 +89,18 @@ def sha256_bytes(data: bytes) -> str:
     return h.hexdigest()
 
 
-def sha256_file(path: str | Path) -> str:
+def sha256_file(path: str | Path, *, mmap_threshold: int = MMAP_THRESHOLD) -> str:
     """
     Compute the SHA-256 hex digest for a file.
 
+    Files of mmap_threshold bytes or more are mapped and hashed in one call
+    (no per-chunk interpreter work or read copies; the GIL is released for
+    the whole digest). Smaller files, and files that cannot be mapped, go
+    through hashlib.file_digest, which reads into a reused 256 KiB buffer.
+
     Args:
         path: filesystem path to read.
+        mmap_threshold: size in bytes from which mmap is used.
 
     Returns:
         A 64-character lowercase hex string.
@@ -38,12 +109,118 @@ def sha256_file(path: str | Path) -> str:
         FileNotFoundError: if the path does not exist.
         PermissionError: if reading is not permitted.
     """
+    return hash_file(path, DEFAULT_ALGORITHMS, mmap_threshold=mmap_threshold)["sha256"]
+
+
+def hash_file(
+    path: str | Path,
+    algorithms: Iterable[str] = DEFAULT_ALGORITHMS,
+    *,
+    mmap_threshold: int = MMAP_THRESHOLD,
+) -> dict[str, str]:
+    """
+    Compute several hex digests of a file in a single read pass.
+
+    Returns {algorithm: hexdigest} for sha256 plus every requested
+    algorithm (see normalize_algorithms). A single algorithm takes the
+    sha256_file fast paths. With several, each MULTI_CHUNK_SIZE window of
+    the file (mapped or read into a reused buffer) goes to every hasher
+    before the next one is touched, so the file is not streamed twice.
+
+    Raises:
+        FileNotFoundError: if the path does not exist.
+        ValueError: for unsupported algorithms.
+    """
+    algos = normalize_algorithms(algorithms)
     p = Path(path)
     if not p.is_file():
         raise FileNotFoundError(f"Not a file: {p}")
 
-    h = hashlib.sha256()
-    with p.open("rb") as fp:
-        for chunk in iter(lambda: fp.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    with p.open("rb", buffering=0) as fp:
+        if os.fstat(fp.fileno()).st_size >= mmap_threshold:
+            try:
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    if len(algos) == 1:
+                        return {algos[0]: hashlib.new(algos[0], mm).hexdigest()}
+                    hasher = MultiHasher(algos)
+                    view = memoryview(mm)
+                    try:
+                        for off in range(0, len(mm), MULTI_CHUNK_SIZE):
+                            hasher.update(view[off : off + MULTI_CHUNK_SIZE])
+                    finally:
+                        view.release()
+                    return hasher.hexdigests()
+            except (OSError, ValueError):
+                fp.seek(0)  # e.g. a filesystem without mmap support
+        if len(algos) == 1:
+            return {algos[0]: hashlib.file_digest(fp, algos[0]).hexdigest()}
+        hasher = MultiHasher(algos)
+        buf = bytearray(MULTI_CHUNK_SIZE)
+        view = memoryview(buf)
+        while n := fp.readinto(buf):
+            hasher.update(view[:n])
+        return hasher.hexdigests()
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Tee a binary reader through SHA-256 (plus any extra algorithms).
+
+    Every byte returned by read() is digested, so a stage that consumes the
+    stream also hashes it without a second pass over the file. nbytes counts
+    the bytes seen.
+    """
+
+    def __init__(self, raw: BinaryIO, algorithms: Iterable[str] = DEFAULT_ALGORITHMS) -> None:
+        super().__init__()
+        self._raw = raw
+        self._h = MultiHasher(algorithms)
+        self.nbytes = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = self._raw.read(-1 if size is None else size)
+        self._h.update(data)
+        self.nbytes += len(data)
+        return data
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        data = self.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigests()["sha256"]
+
+    def hexdigests(self) -> dict[str, str]:
+        return self._h.hexdigests()
+
+
+class HashingWriter(io.RawIOBase):
+    """Tee a binary writer through SHA-256 (plus any extra algorithms); see HashingReader."""
+
+    def __init__(self, raw: BinaryIO, algorithms: Iterable[str] = DEFAULT_ALGORITHMS) -> None:
+        super().__init__()
+        self._raw = raw
+        self._h = MultiHasher(algorithms)
+        self.nbytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:  # type: ignore[override]
+        self._h.update(data)
+        self._raw.write(data)
+        self.nbytes += len(data)
+        return len(data)
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigests()["sha256"]
+
+    def hexdigests(self) -> dict[str, str]:
+        return self._h.hexdigests()
@@ -0,0 +1,241 @@
+# src/kprovengine/manifest/index.py
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import struct
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from .hashing import normalize_algorithms
+
+__all__ = ["INDEX_MAGIC", "ManifestIndex", "write_manifest_index"]
+
+# Binary manifest sidecar, little-endian throughout:
+#
+#   header    magic, version, algorithm count, entry count and the byte
+#             offset of each section below (the offset index)
+#   algos     per algorithm: u8 name length, ASCII name, u8 digest size
+#   records   one fixed-width record per entry: raw digests in algorithm
+#             order (sha256 first)
+#   offsets   entry count + 1 u64 offsets into the path blob
+#   paths     UTF-8 paths, sorted bytewise, back to back
+#
+# Record i belongs to path i, so a lookup is a binary search over the path
+# table followed by one fixed-offset read. Sections are 8-byte aligned.
+INDEX_MAGIC = b"KPMIDX\x00\x00"
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_U64 = struct.Struct("<Q")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_manifest_index(path: Path, manifest: Mapping[str, Any]) -> None:
+    """
+    Write the binary sidecar for a manifest dict ({"manifest": [...]}).
+
+    Every entry must carry the same digests (as build_manifest produces) and
+    paths must be unique. The JSON manifest stays authoritative; this file
+    is only a lookup structure derived from it.
+    """
+    entries: Sequence[Mapping[str, Any]] = manifest["manifest"]
+    first = entries[0] if entries else {}
+    algos = normalize_algorithms(["sha256", *(first.get("digests") or {})])
+    sizes = [hashlib.new(a).digest_size for a in algos]
+
+    rows: list[tuple[bytes, bytes]] = []
+    for e in entries:
+        d: dict[str, str] = dict(e.get("digests") or {})
+        d["sha256"] = e["sha256"]
+        if set(d) != set(algos):
+            raise ValueError(f"entry digests differ from {list(algos)}: {e['path']}")
+        rows.append((e["path"].encode("utf-8"), b"".join(bytes.fromhex(d[a]) for a in algos)))
+    rows.sort(key=lambda r: r[0])
+    for (a, _), (b, _) in zip(rows, rows[1:], strict=False):
+        if a == b:
+            raise ValueError(f"duplicate manifest path: {a.decode('utf-8')}")
+
+    algo_table = b"".join(
+        bytes([len(a)]) + a.encode("ascii") + bytes([s]) for a, s in zip(algos, sizes, strict=True)
+    )
+    record_size = sum(sizes)
+    algos_off = _HEADER.size
+    records_off = _align(algos_off + len(algo_table))
+    offsets_off = _align(records_off + record_size * len(rows))
+    paths_off = offsets_off + _U64.size * (len(rows) + 1)
+    blob_len = sum(len(p) for p, _ in rows)
+
+    with path.open("wb") as f:
+        f.write(
+            _HEADER.pack(
+                INDEX_MAGIC,
+                INDEX_VERSION,
+                len(algos),
+                len(rows),
+                algos_off,
+                records_off,
+                offsets_off,
+                paths_off,
+            )
+        )
+        f.write(algo_table)
+        f.write(b"\x00" * (records_off - algos_off - len(algo_table)))
+        for _, rec in rows:
+            f.write(rec)
+        f.write(b"\x00" * (offsets_off - records_off - record_size * len(rows)))
+        pos = 0
+        for p, _ in rows:
+            f.write(_U64.pack(pos))
+            pos += len(p)
+        f.write(_U64.pack(blob_len))
+        for p, _ in rows:
+            f.write(p)
+
+
+class ManifestIndex:
+    """
+    Read-only, mmap-backed view of a manifest sidecar.
+
+    get(path) is a binary search (O(log n) path comparisons) and touches only
+    the pages it needs; iteration decodes entries straight from the map in
+    path order without parsing JSON. Use as a context manager or call close().
+
+    Every section bound in the header is checked against the file size on
+    open; a truncated or corrupt file raises ValueError (and is not left
+    mapped), as does a path that is not valid UTF-8 when it is read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            size = f.seek(0, 2)
+            if size < _HEADER.size:
+                raise ValueError(f"not a manifest index: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header(size)
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            self._mm.close()
+            raise ValueError(f"corrupt manifest index: {path}: {e}") from e
+        except ValueError:
+            self._mm.close()
+            raise
+
+    def _parse_header(self, size: int) -> None:
+        magic, version, n_algos, count, algos_off, records_off, offsets_off, paths_off = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"not a version {INDEX_VERSION} manifest index: {self.path}")
+
+        def bad(what: str) -> ValueError:
+            return ValueError(f"corrupt manifest index: {self.path}: {what}")
+
+        if not _HEADER.size <= algos_off <= size:
+            raise bad("algorithm table out of bounds")
+        algos: list[tuple[str, int]] = []
+        pos = algos_off
+        for _ in range(n_algos):
+            if pos + 1 > size or pos + 2 + self._mm[pos] > size:
+                raise bad("algorithm table out of bounds")
+            n = self._mm[pos]
+            name = self._mm[pos + 1 : pos + 1 + n].decode("ascii")
+            digest_size = self._mm[pos + 1 + n]
+            try:
+                expected = hashlib.new(name).digest_size
+            except ValueError:
+                raise bad(f"unknown algorithm {name!r}") from None
+            if expected != digest_size:
+                raise bad(f"digest size {digest_size} for {name}")
+            algos.append((name, digest_size))
+            pos += n + 2
+        if not algos or algos[0][0] != "sha256":
+            raise bad("sha256 must be the first algorithm")
+        record_size = sum(s for _, s in algos)
+        if not pos <= records_off <= records_off + record_size * count <= offsets_off:
+            raise bad("record table out of bounds")
+        if offsets_off + _U64.size * (count + 1) > paths_off or paths_off > size:
+            raise bad("offset table out of bounds")
+        first = _U64.unpack_from(self._mm, offsets_off)[0]
+        blob_len = _U64.unpack_from(self._mm, offsets_off + _U64.size * count)[0]
+        if first != 0 or paths_off + blob_len > size:
+            raise bad("path table out of bounds")
+        self._algos = algos
+        self._record_size = record_size
+        self._count = int(count)
+        self._records_off = int(records_off)
+        self._offsets_off = int(offsets_off)
+        self._paths_off = int(paths_off)
+        self._blob_len = int(blob_len)
+
+    def __enter__(self) -> ManifestIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    @property
+    def algorithms(self) -> tuple[str, ...]:
+        return tuple(a for a, _ in self._algos)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _path_bytes(self, i: int) -> bytes:
+        start: int = _U64.unpack_from(self._mm, self._offsets_off + 8 * i)[0]
+        end: int = _U64.unpack_from(self._mm, self._offsets_off + 8 * (i + 1))[0]
+        if not start <= end <= self._blob_len:
+            raise ValueError(f"corrupt manifest index: {self.path}: path offsets of entry {i}")
+        return self._mm[self._paths_off + start : self._paths_off + end]
+
+    def _digests(self, i: int) -> dict[str, str]:
+        pos = self._records_off + self._record_size * i
+        out: dict[str, str] = {}
+        for algo, size in self._algos:
+            out[algo] = self._mm[pos : pos + size].hex()
+            pos += size
+        return out
+
+    def _entry(self, i: int, path: str) -> dict[str, Any]:
+        # Same shape as ManifestEntry.to_dict().
+        digests = self._digests(i)
+        e: dict[str, Any] = {"path": path, "sha256": digests["sha256"]}
+        if len(digests) > 1:
+            e["digests"] = digests
+        return e
+
+    def index_of(self, path: str) -> int:
+        """Position of path in sorted order. Raises KeyError if absent."""
+        key = path.encode("utf-8")
+        i = bisect.bisect_left(range(self._count), key, key=self._path_bytes)
+        if i == self._count or self._path_bytes(i) != key:
+            raise KeyError(path)
+        return i
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        """The manifest entry for path, or None."""
+        try:
+            return self._entry(self.index_of(path), path)
+        except KeyError:
+            return None
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self.get(path) is not None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(self._count):
+            raw = self._path_bytes(i)
+            try:
+                path = raw.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise ValueError(f"corrupt manifest index: {self.path}: {e}") from e
+            yield self._entry(i, path)
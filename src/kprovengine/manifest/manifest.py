@@ -2,35 +2,160 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Iterable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from .hashing import sha256_file
+from kprovengine.types import ManifestMode
+
+from .hash_cache import HashCache
+from .hashing import DEFAULT_ALGORITHMS, hash_file, normalize_algorithms
+from .merkle import MerkleTree
 
 __all__ = ["Manifest", "ManifestEntry", "build_manifest"]
 
 
 @dataclass(frozen=True)
 class ManifestEntry:
+    """
+    One manifested file. digests maps algorithm -> hex digest and always
+    includes sha256.
+    """
+
     path: str
     sha256: str
+    digests: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        # The V1 entry shape is kept when sha256 is the only digest.
+        d: dict[str, Any] = {"path": self.path, "sha256": self.sha256}
+        if set(self.digests) - {"sha256"}:
+            d["digests"] = dict(self.digests)
+        return d
 
 
 @dataclass(frozen=True)
 class Manifest:
-    manifest: list[dict[str, str]]
+    """
+    Manifest entries; `merkle` ({"scheme", "root", "size"}) is set in merkle
+    mode, where entries are sorted by path into tree order.
+    """
+
+    manifest: list[dict[str, Any]]
+    merkle: dict[str, Any] | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        return {"manifest": self.manifest}
+        if self.merkle is None:
+            return {"manifest": self.manifest}
+        return {"manifest": self.manifest, "merkle": self.merkle}
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2, sort_keys=True)
 
+    def write_json(self, path: Path) -> None:
+        """Write to_json() to path; json.dump encodes in chunks, never the whole string."""
+        with path.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+            json.dump(self.to_dict(), fp, indent=2, sort_keys=True)
+
+
+def build_manifest(
+    paths: Iterable[Path],
+    digests: Mapping[str, str | Mapping[str, str]] | None = None,
+    *,
+    algorithms: Iterable[str] = DEFAULT_ALGORITHMS,
+    jobs: int = 1,
+    executor: Executor | None = None,
+    mode: ManifestMode = "flat",
+    relative_to: Path | None = None,
+    hash_cache: HashCache | None = None,
+) -> Manifest:
+    """
+    Build a manifest over paths.
+
+    algorithms selects the digests recorded per entry (sha256 is always
+    included; see hashing.normalize_algorithms). Each file that needs
+    hashing is read once, whatever the number of algorithms.
+
+    digests maps str(path) -> sha256, or -> {algorithm: digest}, for files
+    whose hashes are already known (e.g. computed while the pipeline
+    streamed them); a file is only read from disk when some requested
+    digest is missing.
+
+    Files are hashed concurrently on `executor`, or on a private pool of
+    `jobs` threads when jobs > 1 (hashlib releases the GIL while digesting).
+    The largest files are submitted first so one big straggler does not
+    start last. Entries always follow the order of paths; the first failure
+    in that order is raised.
+
+    mode="merkle" sorts entries by path and adds the Merkle root
+    (manifest.merkle); paths must then be unique. relative_to records entry
+    paths relative to that directory (POSIX form), so equal content laid out
+    the same way yields equal roots across runs.
+
+    hash_cache (opt-in) serves digests of unchanged files from a persistent
+    HashCache instead of reading them.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
+    if mode not in ("flat", "merkle"):
+        raise ValueError(f"unknown manifest mode: {mode!r}")
+    algos = normalize_algorithms(algorithms)
+    known = digests or {}
+    plist = list(paths)
+    got: list[dict[str, str]] = []
+    todo: list[int] = []
+    for i, p in enumerate(plist):
+        have = known.get(str(p))
+        got.append({"sha256": have} if isinstance(have, str) else dict(have or {}))
+        if any(a not in got[i] for a in algos):
+            todo.append(i)
+
+    hasher = hash_cache.hash_file if hash_cache is not None else hash_file
+    if executor is None and (jobs == 1 or len(todo) <= 1):
+        for i in todo:
+            got[i] = hasher(plist[i], algos)
+    elif executor is not None:
+        _hash_concurrently(executor, hasher, plist, todo, got, algos)
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            _hash_concurrently(pool, hasher, plist, todo, got, algos)
+
+    entries = [
+        ManifestEntry(
+            path=str(p) if relative_to is None else Path(p).relative_to(relative_to).as_posix(),
+            sha256=d["sha256"],
+            digests={a: d[a] for a in algos},
+        ).to_dict()
+        for p, d in zip(plist, got, strict=True)
+    ]
+    if mode == "flat":
+        return Manifest(manifest=entries)
+    tree = MerkleTree((e["path"], e["sha256"]) for e in entries)
+    entries.sort(key=lambda e: e["path"].encode("utf-8"))
+    return Manifest(manifest=entries, merkle=tree.summary())
+
+
+def _size_or_zero(p: Path) -> int:
+    try:
+        return Path(p).stat().st_size
+    except OSError:
+        return 0  # hash_file reports the error
+
 
-def build_manifest(paths: Iterable[Path]) -> Manifest:
-    entries: list[dict[str, str]] = []
-    for p in paths:
-        entries.append({"path": str(p), "sha256": sha256_file(p)})
-    return Manifest(manifest=entries)
+def _hash_concurrently(
+    executor: Executor,
+    hasher: Callable[[Path, tuple[str, ...]], dict[str, str]],
+    paths: list[Path],
+    todo: list[int],
+    got: list[dict[str, str]],
+    algos: tuple[str, ...],
+) -> None:
+    """Hash paths[i] for i in todo into got[i], largest files first."""
+    order = sorted(todo, key=lambda i: (-_size_or_zero(paths[i]), i))
+    futures: dict[int, Future[dict[str, str]]] = {
+        i: executor.submit(hasher, paths[i], algos) for i in order
+    }
+    for i in todo:
+        got[i] = futures[i].result()
@@ -0,0 +1,172 @@
+# src/kprovengine/manifest/merkle.py
+from __future__ import annotations
+
+import bisect
+import hashlib
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+__all__ = [
+    "MERKLE_SCHEME",
+    "InclusionProof",
+    "MerkleTree",
+    "leaf_hash",
+    "verify_inclusion",
+]
+
+MERKLE_SCHEME = "kprovengine.merkle.v1"
+
+# RFC 6962 domain separation: leaves and interior nodes can never collide.
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+
+def leaf_hash(path: str, sha256: str) -> bytes:
+    """SHA-256(0x00 || utf-8 path || 0x00 || raw file digest)."""
+    return hashlib.sha256(_LEAF + path.encode("utf-8") + b"\x00" + bytes.fromhex(sha256)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+@dataclass(frozen=True)
+class InclusionProof:
+    """
+    Audit path for one manifest entry (RFC 6962 / RFC 9162 layout).
+
+    siblings are hex node hashes from the leaf level up. A verifier needs
+    only this proof and the trusted root: O(log n) hashes, not the manifest.
+    """
+
+    path: str
+    sha256: str
+    index: int
+    tree_size: int
+    siblings: tuple[str, ...]
+    root: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "scheme": MERKLE_SCHEME,
+            "path": self.path,
+            "sha256": self.sha256,
+            "index": self.index,
+            "tree_size": self.tree_size,
+            "siblings": list(self.siblings),
+            "root": self.root,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> InclusionProof:
+        if d.get("scheme") != MERKLE_SCHEME:
+            raise ValueError(f"not a {MERKLE_SCHEME} proof")
+        return cls(
+            path=str(d["path"]),
+            sha256=str(d["sha256"]),
+            index=int(d["index"]),
+            tree_size=int(d["tree_size"]),
+            siblings=tuple(str(s) for s in d["siblings"]),
+            root=str(d["root"]),
+        )
+
+
+class MerkleTree:
+    """
+    Deterministic Merkle tree over (path, sha256) entries, sorted by UTF-8 path.
+
+    The shape follows RFC 6962: an unpaired last node is promoted to the next
+    level unchanged, which yields the same root as the RFC's recursive
+    definition. The empty tree's root is SHA-256 of the empty string. Paths
+    must be unique.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, str]]) -> None:
+        ordered = sorted(entries, key=lambda e: e[0].encode("utf-8"))
+        self._keys = [p.encode("utf-8") for p, _ in ordered]
+        for a, b in zip(self._keys, self._keys[1:], strict=False):
+            if a == b:
+                raise ValueError(f"duplicate manifest path: {a.decode('utf-8')}")
+        self._entries = ordered
+        level = [leaf_hash(p, sha) for p, sha in ordered]
+        self._levels: list[list[bytes]] = [level]
+        while len(level) > 1:
+            nxt = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                nxt.append(level[-1])
+            self._levels.append(nxt)
+            level = nxt
+
+    @classmethod
+    def from_manifest(cls, manifest: Mapping[str, Any]) -> MerkleTree:
+        """Build from a manifest dict ({"manifest": [{"path", "sha256"}, ...]})."""
+        return cls((e["path"], e["sha256"]) for e in manifest["manifest"])
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> Sequence[tuple[str, str]]:
+        return self._entries
+
+    @property
+    def root(self) -> str:
+        top = self._levels[-1]
+        return top[0].hex() if top else hashlib.sha256(b"").hexdigest()
+
+    def index_of(self, path: str) -> int:
+        """Leaf index of path (binary search). Raises KeyError if absent."""
+        key = path.encode("utf-8")
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            raise KeyError(path)
+        return i
+
+    def proof(self, path: str) -> InclusionProof:
+        """Inclusion proof for path. Raises KeyError if path is not in the tree."""
+        index = self.index_of(path)
+        siblings: list[str] = []
+        i = index
+        for level in self._levels[:-1]:
+            j = i ^ 1
+            if j < len(level):
+                siblings.append(level[j].hex())
+            i >>= 1
+        p, sha = self._entries[index]
+        return InclusionProof(p, sha, index, self.size, tuple(siblings), self.root)
+
+    def summary(self) -> dict[str, Any]:
+        return {"scheme": MERKLE_SCHEME, "root": self.root, "size": self.size}
+
+
+def verify_inclusion(proof: InclusionProof, root: str | None = None) -> bool:
+    """
+    Check proof against root (default: the root carried by the proof; pass
+    the trusted root from run_summary.json to make the check meaningful).
+
+    RFC 9162 section 2.1.3.2 verification; never raises on malformed input.
+    """
+    expected = root if root is not None else proof.root
+    if not 0 <= proof.index < proof.tree_size:
+        return False
+    try:
+        r = leaf_hash(proof.path, proof.sha256)
+        path = [bytes.fromhex(s) for s in proof.siblings]
+    except ValueError:
+        return False
+    fn, sn = proof.index, proof.tree_size - 1
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = _node(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = _node(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r.hex() == expected.lower()
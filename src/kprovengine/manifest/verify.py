@@ -0,0 +1,209 @@
+# src/kprovengine/manifest/verify.py
+from __future__ import annotations
+
+import json
+import os
+import random
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .hashing import hash_file
+from .merkle import MerkleTree
+
+__all__ = [
+    "STAT_INDEX_SCHEMA",
+    "VerifyReport",
+    "stat_signature",
+    "verify_run",
+    "write_stat_index",
+]
+
+STAT_INDEX_SCHEMA = "kprovengine.manifest_stat.v1"
+
+
+def stat_signature(st: os.stat_result) -> dict[str, int]:
+    """The fields compared by the verify fast path."""
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino, "dev": st.st_dev}
+
+
+def _resolve(run_dir: Path, entry_path: str) -> Path:
+    # Flat manifests record absolute paths, Merkle manifests run-relative ones.
+    p = Path(entry_path)
+    return p if p.is_absolute() else run_dir / p
+
+
+def write_stat_index(path: Path, run_dir: Path, manifest: Mapping[str, Any]) -> None:
+    """
+    Record the stat signature of every manifest entry next to the manifest.
+
+    Must be written after the last change to the files (e.g. object-store
+    adoption), or every entry falls back to a rehash.
+    """
+    entries: dict[str, dict[str, int]] = {}
+    for e in manifest["manifest"]:
+        try:
+            entries[e["path"]] = stat_signature(_resolve(run_dir, e["path"]).stat())
+        except OSError:
+            continue
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+        json.dump({"schema": STAT_INDEX_SCHEMA, "entries": entries}, fp, indent=2, sort_keys=True)
+        fp.write("\n")
+
+
+@dataclass(frozen=True)
+class VerifyReport:
+    """
+    Outcome of verify_run().
+
+    stat_matched entries were accepted on their stat signature alone;
+    rehashed entries were read and compared digest by digest. mismatches
+    hold {"path", "reason", ...} dicts, reason being one of "missing",
+    "size", "digest" or "merkle_root".
+    """
+
+    run_dir: Path
+    entries: int
+    stat_matched: int
+    rehashed: int
+    mismatches: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run_dir": str(self.run_dir),
+            "ok": self.ok,
+            "entries": self.entries,
+            "stat_matched": self.stat_matched,
+            "rehashed": self.rehashed,
+            "mismatches": self.mismatches,
+        }
+
+
+def verify_run(
+    run_dir: Path,
+    *,
+    manifest_path: Path | None = None,
+    stat_index_path: Path | None = None,
+    strict: bool = False,
+    sample: float = 0.0,
+    seed: int | None = None,
+    jobs: int = 1,
+) -> VerifyReport:
+    """
+    Re-verify the files listed in a run's manifest.
+
+    An entry whose size, mtime_ns, inode and device still match the stat
+    index is accepted without reading it, unless strict is set or it is
+    drawn by the random `sample` (a fraction in [0, 1]; `seed` makes the
+    draw repeatable). A changed size is a mismatch without a read; every
+    other entry is rehashed (all of its recorded digests in one pass) on up
+    to `jobs` threads, largest files first. Mismatches follow manifest order.
+    A recorded Merkle root is recomputed and compared both with the one in
+    the manifest and with the one committed in run_summary.json, so an edit
+    to an entry and to the manifest's own root is still caught.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
+    if not 0.0 <= sample <= 1.0:
+        raise ValueError(f"sample must be within [0, 1], got {sample}")
+    manifest_path = manifest_path or run_dir / "manifest.json"
+    stat_index_path = stat_index_path or run_dir / "manifest.stat.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    try:
+        index = json.loads(stat_index_path.read_text(encoding="utf-8")).get("entries", {})
+    except (FileNotFoundError, ValueError):
+        index = {}
+
+    rng = random.Random(seed)
+    entries: Sequence[Mapping[str, Any]] = manifest["manifest"]
+    found: dict[int, dict[str, Any]] = {}
+    todo: list[tuple[int, Path, int]] = []
+    matched = 0
+    for i, e in enumerate(entries):
+        p = _resolve(run_dir, e["path"])
+        try:
+            sig = stat_signature(p.stat())
+        except FileNotFoundError:
+            found[i] = {"path": e["path"], "reason": "missing"}
+            continue
+        recorded = index.get(e["path"])
+        drawn = sample > 0 and rng.random() < sample
+        if recorded == sig and not strict and not drawn:
+            matched += 1
+        elif recorded is not None and recorded.get("size") != sig["size"]:
+            found[i] = {
+                "path": e["path"],
+                "reason": "size",
+                "expected": recorded.get("size"),
+                "actual": sig["size"],
+            }
+        else:
+            todo.append((i, p, sig["size"]))
+
+    def _check(i: int, p: Path) -> dict[str, Any] | None:
+        e = entries[i]
+        expected: dict[str, str] = dict(e.get("digests") or {})
+        expected["sha256"] = e["sha256"]
+        try:
+            actual = hash_file(p, expected)
+        except FileNotFoundError:
+            return {"path": e["path"], "reason": "missing"}
+        for algo in sorted(expected):
+            if actual[algo] != expected[algo]:
+                return {
+                    "path": e["path"],
+                    "reason": "digest",
+                    "algorithm": algo,
+                    "expected": expected[algo],
+                    "actual": actual[algo],
+                }
+        return None
+
+    ordered = sorted(todo, key=lambda t: (-t[2], t[0]))
+    if jobs == 1 or len(ordered) <= 1:
+        results = [(i, _check(i, p)) for i, p, _ in ordered]
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(ordered))) as pool:
+            futures = [(i, pool.submit(_check, i, p)) for i, p, _ in ordered]
+            results = [(i, f.result()) for i, f in futures]
+    for i, bad in results:
+        if bad is not None:
+            found[i] = bad
+
+    mismatches = [found[i] for i in sorted(found)]
+    summary_path = run_dir / "run_summary.json"
+    try:
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        summary = {}
+    if not isinstance(summary, dict):
+        summary = {}
+    roots = [
+        (manifest_path, (manifest.get("merkle") or {}).get("root")),
+        (summary_path, (summary.get("manifest") or {}).get("merkle_root")),
+    ]
+    if any(root is not None for _, root in roots):
+        actual_root = MerkleTree.from_manifest(manifest).root
+        for where, root in roots:
+            if root is not None and root != actual_root:
+                mismatches.append(
+                    {
+                        "path": str(where),
+                        "reason": "merkle_root",
+                        "expected": root,
+                        "actual": actual_root,
+                    }
+                )
+    return VerifyReport(
+        run_dir=run_dir,
+        entries=len(entries),
+        stat_matched=matched,
+        rehashed=len(todo),
+        mismatches=mismatches,
+    )
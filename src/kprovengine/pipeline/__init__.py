@@ -1,5 +1,13 @@
 from __future__ import annotations
 
-from .run import run_pipeline
+from .run import run_pipeline, run_pipeline_async
+from .stage import AsyncPathStage, IdentityStage, PathStageAdapter, Stage
 
-__all__ = ["run_pipeline"]
+__all__ = [
+    "AsyncPathStage",
+    "IdentityStage",
+    "PathStageAdapter",
+    "Stage",
+    "run_pipeline",
+    "run_pipeline_async",
+]
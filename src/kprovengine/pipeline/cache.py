@@ -0,0 +1,175 @@
+# src/kprovengine/pipeline/cache.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from kprovengine.manifest.hashing import DEFAULT_ALGORITHMS, hash_file, normalize_algorithms
+from kprovengine.storage.cas import ObjectStore
+
+from .stage import PathStageAdapter, Stage, StageResult, run_stage
+
+__all__ = ["CACHE_STRATEGY", "StageCache"]
+
+logger = logging.getLogger(__name__)
+
+# Strategy recorded in StageResult (and run_summary.json) for a cache hit.
+CACHE_STRATEGY = "cache"
+
+
+@dataclass(frozen=True)
+class StageCache:
+    """
+    Local content-addressed cache of stage outputs.
+
+    Layout under root:
+      entries/<stage>/<version>/<in[:2]>/<in>.json  -> {"sha256", "digests": {algo: hex}}
+      objects/...                                  -> output bytes (storage.cas.ObjectStore)
+
+    Entries are keyed by (stage name, stage version, input sha256); bumping a
+    stage's version invalidates its entries. That key only identifies the
+    output of a pure stage, so PathStageAdapter stages (opaque callables)
+    bypass the cache unless they opt in with cacheable=True. Hits are materialized by linking
+    the blob into the run; a blob that was edited through one of its links
+    fails ObjectStore.verify() and is served as a miss.
+    All writes go through a temp file + os.replace, so concurrent writers
+    never expose partial files.
+    """
+
+    root: Path
+
+    def _entry_path(self, stage: Stage, input_sha256: str) -> Path:
+        return (
+            self.root
+            / "entries"
+            / stage.name
+            / stage.version
+            / input_sha256[:2]
+            / f"{input_sha256}.json"
+        )
+
+    @property
+    def store(self) -> ObjectStore:
+        return ObjectStore(self.root)
+
+    def get(self, stage: Stage, input_sha256: str) -> dict[str, str] | None:
+        """Return the cached output digests (always with sha256), or None on a miss."""
+        try:
+            entry = json.loads(self._entry_path(stage, input_sha256).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        sha = entry.get("sha256")
+        if not isinstance(sha, str) or not self.store.verify(sha):
+            return None
+        digests = entry.get("digests")
+        if not isinstance(digests, dict):
+            digests = {}
+        return {**{a: h for a, h in digests.items() if isinstance(h, str)}, "sha256": sha}
+
+    def put(
+        self,
+        stage: Stage,
+        input_sha256: str,
+        output: Path,
+        sha256: str,
+        digests: Mapping[str, str] | None = None,
+    ) -> None:
+        """Record output (whose digests are sha256 plus digests) as stage over input_sha256."""
+        self.store.put(output, sha256)
+
+        entry = self._entry_path(stage, input_sha256)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f".{entry.name}.{secrets.token_hex(4)}.tmp")
+        record = {"sha256": sha256, "digests": {**(digests or {}), "sha256": sha256}}
+        tmp.write_text(json.dumps(record, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, entry)
+
+    def run(
+        self,
+        stage: Stage,
+        src: Path,
+        dst: Path,
+        *,
+        allow_link: bool = False,
+        src_sha256: str | None = None,
+        algorithms: Iterable[str] = DEFAULT_ALGORITHMS,
+        src_digests: Mapping[str, str] | None = None,
+    ) -> StageResult:
+        """
+        run_stage() with a cache in front of it.
+
+        The input digest is needed for the lookup, so an unknown one is hashed
+        first (every algorithm in one pass); on a miss the stage then runs with
+        the digests known (identity stages can use their zero-copy path instead
+        of a tee). Digests a hit's entry lacks (e.g. an algorithm added since
+        it was written) are computed from the linked output. Opaque
+        PathStageAdapter stages without cacheable=True run uncached. Failures
+        to write the cache are logged, never raised.
+        """
+        if isinstance(stage, PathStageAdapter) and not stage.cacheable:
+            return run_stage(
+                stage,
+                src,
+                dst,
+                allow_link=allow_link,
+                src_sha256=src_sha256,
+                hash_input=True,
+                algorithms=algorithms,
+                src_digests=src_digests,
+            )
+        algos = normalize_algorithms(algorithms)
+        hashed = 0
+        in_digests = dict(src_digests or {})
+        if src_sha256 is not None:
+            in_digests.setdefault("sha256", src_sha256)
+        if "sha256" not in in_digests:
+            in_digests = hash_file(src, algos)
+            hashed = src.stat().st_size
+        in_sha = in_digests["sha256"]
+        cached = self.get(stage, in_sha)
+        if cached is not None:
+            self.store.link_into(cached["sha256"], dst)
+            if any(a not in cached for a in algos):
+                cached = {**hash_file(dst, algos), **cached}
+                hashed += dst.stat().st_size
+            return StageResult(
+                dst,
+                CACHE_STRATEGY,
+                input_sha256=in_sha,
+                sha256=cached["sha256"],
+                bytes_read=hashed,
+                digests={a: cached[a] for a in algos},
+            )
+
+        res = run_stage(
+            stage,
+            src,
+            dst,
+            allow_link=allow_link,
+            algorithms=algos,
+            src_digests=in_digests,
+        )
+        out_sha = res.sha256
+        digests = dict(res.digests)
+        if out_sha is None or any(a not in digests for a in algos):
+            digests = hash_file(dst, algos)
+            out_sha = digests["sha256"]
+            hashed += dst.stat().st_size
+        try:
+            self.put(stage, in_sha, dst, out_sha, digests)
+        except OSError as e:
+            logger.warning("stage cache write failed for %s: %s", stage.name, e)
+        return StageResult(
+            dst,
+            res.strategy,
+            input_sha256=in_sha,
+            sha256=out_sha,
+            bytes_read=res.bytes_read + hashed,
+            bytes_written=res.bytes_written,
+            digests=digests,
+        )
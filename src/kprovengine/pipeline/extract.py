@@ -3,14 +3,22 @@ from __future__ import annotations
 
 from pathlib import Path
 
-__all__ = ["extract"]
+from kprovengine.pipeline.stage import IdentityStage
+from kprovengine.storage.copy import CopyStrategy, copy_file
 
+__all__ = ["EXTRACT", "extract"]
 
-def extract(src: Path, dst: Path) -> None:
+# Streaming stage object driven by run_pipeline.
+EXTRACT = IdentityStage("extract")
+
+
+def extract(src: Path, dst: Path, *, allow_link: bool = False) -> CopyStrategy:
     """
     V1 identity extract stage.
 
     This is intentionally a no-op transformation beyond copying bytes from src->dst.
     No semantic guarantees are made.
+
+    Returns the copy strategy used (see kprovengine.storage.copy).
     """
-    dst.write_bytes(src.read_bytes())
+    return copy_file(src, dst, allow_link=allow_link)
@@ -0,0 +1,137 @@
+# src/kprovengine/pipeline/metrics.py
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+__all__ = ["METRICS_SCHEMA", "StepMetrics", "build_metrics", "log_metrics", "timed"]
+
+METRICS_SCHEMA = "kprovengine.metrics.v1"
+
+
+@dataclass(frozen=True)
+class StepMetrics:
+    """
+    Cost of one stage over one file.
+
+    cpu_s is the CPU time of the thread that ran the step; it is None for
+    steps awaited on an event loop, where CPU time cannot be attributed.
+    """
+
+    wall_s: float
+    cpu_s: float | None
+    bytes_read: int
+    bytes_written: int
+
+
+class _Timer:
+    wall_s = 0.0
+    cpu_s = 0.0
+
+
+@contextmanager
+def timed() -> Iterator[_Timer]:
+    """Measure wall and thread CPU time of a block; read the result after it exits."""
+    t = _Timer()
+    w0 = time.perf_counter()
+    c0 = time.thread_time()
+    try:
+        yield t
+    finally:
+        t.wall_s = time.perf_counter() - w0
+        t.cpu_s = time.thread_time() - c0
+
+
+def _r(x: float) -> float:
+    return round(x, 6)
+
+
+def _rate(n: int, seconds: float) -> float:
+    return _r(n / seconds) if seconds > 0 else 0.0
+
+
+def build_metrics(
+    *,
+    stage_names: Sequence[str],
+    per_file: Sequence[tuple[str, Sequence[tuple[str, StepMetrics]]]],
+    files_ok: int,
+    wall_s: float,
+    phases: Mapping[str, tuple[float, float]],
+) -> dict[str, Any]:
+    """
+    Build the versioned "metrics" block of run_summary.json.
+
+    per_file: (source, [(stage name, StepMetrics), ...]) in input order.
+    phases: name -> (wall_s, cpu_s) for run-level work outside the stages.
+    Stage wall/CPU times are summed over files, so with jobs > 1 they can
+    exceed the run's wall time; files_per_second uses the summed stage time.
+    """
+    stages: dict[str, dict[str, Any]] = {
+        name: {"files": 0, "wall_s": 0.0, "cpu_s": 0.0, "bytes_read": 0, "bytes_written": 0}
+        for name in stage_names
+    }
+    files: list[dict[str, Any]] = []
+    for source, steps in per_file:
+        entry: dict[str, Any] = {}
+        for name, m in steps:
+            agg = stages[name]
+            agg["files"] += 1
+            agg["wall_s"] += m.wall_s
+            agg["cpu_s"] += m.cpu_s or 0.0
+            agg["bytes_read"] += m.bytes_read
+            agg["bytes_written"] += m.bytes_written
+            entry[name] = {
+                "wall_s": _r(m.wall_s),
+                "cpu_s": None if m.cpu_s is None else _r(m.cpu_s),
+                "bytes_read": m.bytes_read,
+                "bytes_written": m.bytes_written,
+            }
+        files.append({"source": source, "stages": entry})
+
+    for agg in stages.values():
+        agg["files_per_second"] = _rate(agg["files"], agg["wall_s"])
+        agg["wall_s"] = _r(agg["wall_s"])
+        agg["cpu_s"] = _r(agg["cpu_s"])
+
+    return {
+        "schema": METRICS_SCHEMA,
+        "wall_s": _r(wall_s),
+        "files": len(per_file),
+        "files_ok": files_ok,
+        "files_per_second": _rate(files_ok, wall_s),
+        "stages": stages,
+        "phases": {name: {"wall_s": _r(w), "cpu_s": _r(c)} for name, (w, c) in phases.items()},
+        "per_file": files,
+    }
+
+
+def log_metrics(logger: logging.Logger, run_id: str, metrics: Mapping[str, Any]) -> None:
+    """Emit the aggregate numbers of a metrics block (per-file detail stays in the summary)."""
+    logger.info(
+        "run %s: files=%d ok=%d wall=%.3fs files/s=%.1f",
+        run_id,
+        metrics["files"],
+        metrics["files_ok"],
+        metrics["wall_s"],
+        metrics["files_per_second"],
+    )
+    for name, s in metrics["stages"].items():
+        logger.info(
+            "run %s: stage=%s files=%d wall=%.3fs cpu=%.3fs read=%d written=%d files/s=%.1f",
+            run_id,
+            name,
+            s["files"],
+            s["wall_s"],
+            s["cpu_s"],
+            s["bytes_read"],
+            s["bytes_written"],
+            s["files_per_second"],
+        )
+    for name, p in metrics["phases"].items():
+        logger.info(
+            "run %s: phase=%s wall=%.3fs cpu=%.3fs", run_id, name, p["wall_s"], p["cpu_s"]
+        )
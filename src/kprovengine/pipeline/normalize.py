@@ -3,13 +3,21 @@ from __future__ import annotations
 
 from pathlib import Path
 
-__all__ = ["normalize"]
+from kprovengine.pipeline.stage import IdentityStage
+from kprovengine.storage.copy import CopyStrategy, copy_file
 
+__all__ = ["NORMALIZE", "normalize"]
 
-def normalize(src: Path, dst: Path) -> None:
+# Streaming stage object driven by run_pipeline.
+NORMALIZE = IdentityStage("normalize")
+
+
+def normalize(src: Path, dst: Path, *, allow_link: bool = False) -> CopyStrategy:
     """
     V1 identity normalize stage.
 
     In later versions, this may canonicalize formats; V1 copies bytes only.
+
+    Returns the copy strategy used (see kprovengine.storage.copy).
     """
-    dst.write_bytes(src.read_bytes())
+    return copy_file(src, dst, allow_link=allow_link)
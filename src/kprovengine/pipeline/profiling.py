@@ -0,0 +1,123 @@
+# src/kprovengine/pipeline/profiling.py
+from __future__ import annotations
+
+import cProfile
+import json
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+__all__ = ["PROFILE_SCHEMA", "RunProfiler"]
+
+PROFILE_SCHEMA = "kprovengine.profile.v1"
+
+# Allocation sites kept per section in tracemalloc.json.
+TOP_ALLOCATIONS = 25
+_TRACE_FRAMES = 8
+
+# tracemalloc (peak, snapshots) is process-wide, so profiled runs in one
+# process (e.g. concurrent server jobs) take turns.
+_PROCESS_LOCK = threading.Lock()
+
+
+class RunProfiler:
+    """
+    cProfile + tracemalloc capture, attributed to named sections (stages, phases).
+
+    Every section owns one cProfile.Profile that is enabled only while the
+    section runs, so repeated entries (one per file) accumulate into a single
+    stats file. tracemalloc's peak is reset on entry and the section keeps
+    the highest peak seen. tracemalloc cannot snapshot the moment of a peak,
+    so "top" lists the allocation sites still live when the call that set a
+    new peak exits; it is taken only then, not once per call.
+
+    cProfile is per-thread, so sections must not run concurrently; the
+    pipeline runs serially while profiling. tracemalloc is process-wide, so
+    start() blocks until any other profiler in the process has stopped.
+    """
+
+    def __init__(self, top: int = TOP_ALLOCATIONS) -> None:
+        self._top = top
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._memory: dict[str, dict[str, Any]] = {}
+        self._owns_tracemalloc = False
+        self._started = False
+
+    def start(self) -> None:
+        _PROCESS_LOCK.acquire()
+        self._started = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACE_FRAMES)
+            self._owns_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        if self._started:
+            self._started = False
+            _PROCESS_LOCK.release()
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        prof = self._profiles.setdefault(name, cProfile.Profile())
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            if tracing:
+                self._record_memory(name, tracemalloc.get_traced_memory()[1] - base)
+
+    def _record_memory(self, name: str, peak: int) -> None:
+        mem = self._memory.setdefault(name, {"calls": 0, "peak_bytes": 0, "top": []})
+        mem["calls"] += 1
+        peak = max(peak, 0)
+        if mem["calls"] > 1 and peak <= mem["peak_bytes"]:
+            return
+        mem["peak_bytes"] = peak
+        stats = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, cProfile.__file__),
+            )
+        ).statistics("lineno")
+        mem["top"] = [
+            {
+                "file": st.traceback[0].filename,
+                "line": st.traceback[0].lineno,
+                "size_bytes": st.size,
+                "count": st.count,
+            }
+            for st in stats[: self._top]
+        ]
+
+    def write(self, out_dir: Path) -> list[Path]:
+        """
+        Write <section>.pstats per section and tracemalloc.json.
+
+        Returns the written paths in a stable order.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+        for name in sorted(self._profiles):
+            p = out_dir / f"{name}.pstats"
+            self._profiles[name].dump_stats(str(p))
+            written.append(p)
+        mem_path = out_dir / "tracemalloc.json"
+        mem_path.write_text(
+            json.dumps(
+                {"schema": PROFILE_SCHEMA, "sections": self._memory}, indent=2, sort_keys=True
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        written.append(mem_path)
+        return written
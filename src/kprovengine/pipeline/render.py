@@ -3,13 +3,21 @@ from __future__ import annotations
 
 from pathlib import Path
 
-__all__ = ["render"]
+from kprovengine.pipeline.stage import IdentityStage
+from kprovengine.storage.copy import CopyStrategy, copy_file
 
+__all__ = ["RENDER", "render"]
 
-def render(src: Path, dst: Path) -> None:
+# Streaming stage object driven by run_pipeline.
+RENDER = IdentityStage("render")
+
+
+def render(src: Path, dst: Path, *, allow_link: bool = False) -> CopyStrategy:
     """
     V1 identity render stage.
 
     Copies bytes from src->dst. This keeps the pipeline deterministic and simple.
+
+    Returns the copy strategy used (see kprovengine.storage.copy).
     """
-    dst.write_bytes(src.read_bytes())
+    return copy_file(src, dst, allow_link=allow_link)
@@ -1,25 +1,146 @@
 # src/kprovengine/pipeline/run.py
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import secrets
-from collections.abc import Sequence
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
 from kprovengine.evidence.human_review import HumanReview
 from kprovengine.evidence.provenance import ProvenanceRecord
+from kprovengine.manifest.hash_cache import HashCache
+from kprovengine.manifest.hashing import normalize_algorithms, sha256_file
+from kprovengine.manifest.index import write_manifest_index
 from kprovengine.manifest.manifest import build_manifest
+from kprovengine.manifest.verify import write_stat_index
+from kprovengine.storage.cas import ObjectStore
+from kprovengine.storage.catalog import CatalogRun, RunCatalog
+from kprovengine.storage.durability import DURABILITY_MODES, BundleWriter
 from kprovengine.storage.layout import RunLayout
 from kprovengine.types import RunInputs, RunResult
 
+from .cache import CACHE_STRATEGY, StageCache
+from .extract import EXTRACT
+from .metrics import StepMetrics, build_metrics, log_metrics, timed
+from .normalize import NORMALIZE
+from .parse import PARSE
+from .profiling import RunProfiler
+from .render import RENDER
+from .scheduler import run_staged
+from .stage import AsyncPathStage, Stage, StageResult, run_stage
+
 logger = logging.getLogger(__name__)
 
 RUN_SUMMARY_SCHEMA = "kprovengine.run_summary.v1"
 
-
-def run_pipeline(inputs: RunInputs) -> RunResult:
+STAGES: tuple[Stage, ...] = (NORMALIZE, PARSE, EXTRACT, RENDER)
+
+# Intermediate directory names under stages/ for the default chain; other stages use their name.
+STAGE_DIRNAMES = {"normalize": "normalized", "parse": "parsed", "extract": "extracted"}
+
+
+@dataclass(frozen=True)
+class _RunPlan:
+    """Everything fixed before any source is processed."""
+
+    inputs: RunInputs
+    run_id: str
+    started_at: datetime
+    clock: float  # time.perf_counter() at planning
+    layout: RunLayout
+    sources: tuple[Path, ...]
+    names: tuple[str, ...]
+    stages: tuple[Stage, ...]
+    stage_dirs: tuple[Path, ...]
+    algorithms: tuple[str, ...]
+    cache: StageCache | None
+    profiler: RunProfiler | None = None
+    scratch: Path | None = None  # private dir for intermediates when inputs.intermediates="scratch"
+
+    def section(self, name: str) -> AbstractContextManager[None]:
+        """Profile a block under name when profiling is enabled."""
+        return self.profiler.section(name) if self.profiler is not None else nullcontext()
+
+
+@dataclass(frozen=True)
+class _SourceOutcome:
+    """Result of driving one source through every stage (or up to the failing one)."""
+
+    source: Path
+    output: Path | None
+    input_sha256: str | None
+    sha256: str | None
+    strategies: tuple[tuple[str, str], ...]  # (stage name, strategy), in stage order
+    files: tuple[tuple[Path, str | None], ...] = ()  # (stage output, sha256), in stage order
+    steps: tuple[tuple[str, StepMetrics], ...] = ()  # (stage name, cost), in stage order
+    digests: Mapping[str, str] = field(default_factory=dict)  # of output, by algorithm
+    failed_stage: str | None = None
+    error: str | None = None
+
+
+class _SourceProgress:
+    """Accumulates one source's stage results; shared by the sync and async drivers."""
+
+    def __init__(self, source: Path) -> None:
+        self.source = source
+        self.current = source
+        self.first = True
+        self.sha: str | None = None
+        self.digests: dict[str, str] = {}
+        self.input_sha: str | None = None
+        self.strategies: list[tuple[str, str]] = []
+        self.files: list[tuple[Path, str | None]] = []
+        self.steps: list[tuple[str, StepMetrics]] = []
+
+    def record(self, stage: Stage, res: StageResult, cost: StepMetrics) -> None:
+        if self.first:
+            self.input_sha = res.input_sha256
+        self.first = False
+        self.current = res.output
+        self.sha = res.sha256
+        self.digests = dict(res.digests)
+        self.strategies.append((stage.name, res.strategy))
+        self.files.append((res.output, res.sha256))
+        self.steps.append((stage.name, cost))
+
+    def fail(self, stage: Stage, exc: BaseException) -> _SourceOutcome:
+        return _SourceOutcome(
+            source=self.source,
+            output=None,
+            input_sha256=self.input_sha,
+            sha256=None,
+            strategies=tuple(self.strategies),
+            files=tuple(self.files),
+            failed_stage=stage.name,
+            error=f"{type(exc).__name__}: {exc}",
+            steps=tuple(self.steps),
+        )
+
+    def done(self) -> _SourceOutcome:
+        return _SourceOutcome(
+            source=self.source,
+            output=self.current,
+            input_sha256=self.input_sha,
+            sha256=self.sha,
+            strategies=tuple(self.strategies),
+            files=tuple(self.files),
+            steps=tuple(self.steps),
+            digests=self.digests,
+        )
+
+
+def run_pipeline(inputs: RunInputs, *, stages: Sequence[Stage] | None = None) -> RunResult:
     """
     V1 pipeline scaffold:
       1) normalize (identity copy)
@@ -27,11 +148,96 @@ def run_pipeline(inputs: RunInputs) -> RunResult:
       3) extract    (identity copy)
       4) render     (identity copy)
 
+    `stages` replaces the default chain; the last stage writes to outputs/.
+    Each source advances through the chain independently (with inputs.jobs
+    > 1 on the pipelined pipeline.scheduler); results are collected in input
+    order, and a failing source is recorded under "failures" without
+    aborting the batch. Caching, deduplication, manifest shape, intermediates,
+    durability and profiling are selected by RunInputs fields.
+
     Writes a minimal, review-safe run_summary.json plus manifest/provenance/review stubs.
     No OCR/LLM guarantees are claimed in V1.
     """
+    chain = tuple(stages) if stages is not None else STAGES
+    if any(isinstance(st, AsyncPathStage) for st in chain):
+        raise ValueError("async stages require run_pipeline_async()")
+    plan = _plan_run(inputs, chain)
+
+    progress = [_SourceProgress(src) for src in plan.sources]
+    failed: dict[int, _SourceOutcome] = {}
+
+    def _step(i: int, k: int) -> bool:
+        stage = plan.stages[k]
+        try:
+            with plan.section(stage.name):
+                res, cost = _run_step(
+                    plan, stage, progress[i], plan.stage_dirs[k] / plan.names[i]
+                )
+        except Exception as e:
+            failed[i] = progress[i].fail(stage, e)
+            return False
+        progress[i].record(stage, res, cost)
+        return True
+
+    workers = 1 if plan.profiler is not None else inputs.jobs
+    if plan.profiler is not None:
+        plan.profiler.start()
+    try:
+        with _scratch_kept_on_error(plan):
+            run_staged(len(plan.sources), len(plan.stages), _step, workers=workers)
+            outcomes = [failed.get(i) or p.done() for i, p in enumerate(progress)]
+            return _commit_run(plan, outcomes)
+    finally:
+        if plan.profiler is not None:
+            plan.profiler.stop()
+
+
+async def run_pipeline_async(
+    inputs: RunInputs,
+    *,
+    stages: Sequence[Stage] | None = None,
+    executor: Executor | None = None,
+) -> RunResult:
+    """
+    Asyncio-native run_pipeline(); produces the same RunResult and bundle.
+
+    Planning, every blocking stage step and the evidence commit run in
+    `executor` (the loop's default executor when None), so the event loop is
+    never blocked on file I/O or hashing. Up to inputs.jobs sources are in
+    flight at once. AsyncPathStage stages (e.g. wrapping an AsyncOCRAdapter
+    or AsyncLLMAdapter) are awaited on the loop; they bypass the stage cache
+    since model output is not a pure function of the input bytes.
+    Profiling (inputs.profile) is only supported by run_pipeline().
+    """
+    if inputs.profile:
+        raise ValueError("profile requires run_pipeline()")
+    loop = asyncio.get_running_loop()
+    chain = tuple(stages) if stages is not None else STAGES
+    plan = await loop.run_in_executor(executor, _plan_run, inputs, chain)
+    limit = asyncio.Semaphore(inputs.jobs)
+
+    async def _one(i: int) -> _SourceOutcome:
+        async with limit:
+            return await _process_source_async(plan, i, loop, executor)
+
+    with _scratch_kept_on_error(plan):
+        outcomes = await asyncio.gather(*(_one(i) for i in range(len(plan.sources))))
+        return await loop.run_in_executor(executor, _commit_run, plan, list(outcomes))
+
+
+def _plan_run(inputs: RunInputs, stages: Sequence[Stage]) -> _RunPlan:
+    """Validate inputs and lay out the run directory."""
     if not inputs.sources:
         raise ValueError("No source paths provided.")
+    if inputs.jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {inputs.jobs}")
+    if not stages:
+        raise ValueError("At least one stage is required.")
+    if inputs.intermediates not in ("persist", "scratch"):
+        raise ValueError(f"unknown intermediates mode: {inputs.intermediates!r}")
+    if inputs.durability not in DURABILITY_MODES:
+        raise ValueError(f"unknown durability mode: {inputs.durability!r}")
+    algorithms = normalize_algorithms(inputs.hash_algorithms)
 
     sources = [Path(p) for p in inputs.sources]
     for p in sources:
@@ -39,110 +245,362 @@ def run_pipeline(inputs: RunInputs) -> RunResult:
             raise FileNotFoundError(f"Source path not found: {p}")
 
     started_at = datetime.now(UTC)
+    clock = time.perf_counter()
     run_id = inputs.run_id or _gen_run_id()
 
     layout = RunLayout(inputs.output_dir, run_id)
     layout.ensure_run_dir()
 
     # Stage directories prevent SameFileError when inputs are already inside out_dir.
+    scratch = None
     stages_dir = layout.run_dir / "stages"
-    normalized_dir = stages_dir / "normalized"
-    parsed_dir = stages_dir / "parsed"
-    extracted_dir = stages_dir / "extracted"
-    rendered_dir = layout.run_dir / "outputs"  # stable final location for V1
-
-    for d in (normalized_dir, parsed_dir, extracted_dir, rendered_dir):
+    if inputs.intermediates == "scratch":
+        if inputs.scratch_dir is not None:
+            inputs.scratch_dir.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=f"kprovengine-{run_id}-", dir=inputs.scratch_dir))
+        stages_dir = scratch
+    stage_dirs = [stages_dir / STAGE_DIRNAMES.get(st.name, st.name) for st in stages[:-1]]
+    stage_dirs.append(layout.run_dir / "outputs")  # stable final location for V1
+
+    for d in stage_dirs:
         d.mkdir(parents=True, exist_ok=True)
 
-    normalized = normalize_files(sources, normalized_dir)
-    parsed = parse_files(normalized, parsed_dir)
-    extracted = extract_records(parsed, extracted_dir)
-    rendered = render_output(extracted, rendered_dir)
+    return _RunPlan(
+        inputs=inputs,
+        run_id=run_id,
+        started_at=started_at,
+        clock=clock,
+        layout=layout,
+        sources=tuple(sources),
+        # Output names are fixed up front so workers never race on a shared basename.
+        names=tuple(plan_output_names(sources)),
+        stages=tuple(stages),
+        stage_dirs=tuple(stage_dirs),
+        algorithms=algorithms,
+        cache=StageCache(inputs.cache_dir) if inputs.cache_dir is not None else None,
+        profiler=RunProfiler() if inputs.profile else None,
+        scratch=scratch,
+    )
+
 
-    # Manifest over rendered outputs (V1).
-    manifest = build_manifest(rendered)
-    layout.manifest_path.write_text(manifest.to_json(), encoding="utf-8")
-
-    # Provenance record (V1).
-    prov = ProvenanceRecord.from_paths(run_id, sources, rendered)
-    layout.provenance_path.write_text(prov.to_json(), encoding="utf-8")
-
-    # Human review stub (V1).
-    review = HumanReview.pending()
-    layout.human_review_path.write_text(review.to_json(), encoding="utf-8")
-
-    # Minimal run summary (this is what your smoke test is asserting on).
-    finished_at = datetime.now(UTC)
-    summary = {
-        "schema": RUN_SUMMARY_SCHEMA,
-        "run_id": run_id,
-        "started_at": started_at.isoformat().replace("+00:00", "Z"),
-        "finished_at": finished_at.isoformat().replace("+00:00", "Z"),
-        "evidence": inputs.evidence,
-        "review_status": inputs.review_status,
-        "sources": [str(p) for p in sources],
-        "outputs": [str(p) for p in rendered],
+@contextmanager
+def _scratch_kept_on_error(plan: _RunPlan) -> Iterator[None]:
+    """Leave the scratch dir in place for inspection when the run itself fails."""
+    try:
+        yield
+    except BaseException:
+        if plan.scratch is not None and plan.scratch.exists():
+            logger.warning("run %s failed; intermediates kept in %s", plan.run_id, plan.scratch)
+        raise
+
+
+def _release_scratch(plan: _RunPlan, outcomes: Sequence[_SourceOutcome]) -> list[str]:
+    """
+    Move the intermediates of failed sources from scratch into stages/, then
+    drop the scratch dir. Returns the kept files, relative to the run dir.
+    """
+    if plan.scratch is None:
+        return []
+    stages_dir = plan.layout.run_dir / "stages"
+    kept: list[str] = []
+    for o in outcomes:
+        if o.output is not None:
+            continue
+        for p, _ in o.files:
+            if not p.is_relative_to(plan.scratch) or not p.exists():
+                continue
+            dst = stages_dir / p.relative_to(plan.scratch)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(p, dst)
+            kept.append(dst.relative_to(plan.layout.run_dir).as_posix())
+    shutil.rmtree(plan.scratch, ignore_errors=True)
+    return kept
+
+
+def _commit_run(plan: _RunPlan, outcomes: Sequence[_SourceOutcome]) -> RunResult:
+    """
+    Aggregate per-source outcomes and write the evidence bundle.
+
+    Besides the V1 keys, run_summary.json records per-stage "copy_strategies"
+    counts, "stage_cache" hits/misses, "object_store" dedup counts, the
+    versioned "metrics" block (pipeline.metrics), the "profile" files, the
+    manifest's mode, Merkle root and index, and the "intermediates" kept
+    from failed sources. The evidence files are committed by
+    storage.durability.BundleWriter, run_summary.json last, and the run is
+    then recorded in <output_dir>/catalog.sqlite.
+    """
+    inputs = plan.inputs
+    run_id = plan.run_id
+    layout = plan.layout
+    sources = plan.sources
+
+    ok = [o for o in outcomes if o.output is not None]
+    rendered = [o.output for o in ok if o.output is not None]
+    failures = [
+        {"source": str(o.source), "stage": o.failed_stage or "", "error": o.error or ""}
+        for o in outcomes
+        if o.output is None
+    ]
+    for f in failures:
+        logger.warning("source failed: %s (stage=%s): %s", f["source"], f["stage"], f["error"])
+
+    copy_strategies: dict[str, dict[str, int]] = {}
+    for stage in plan.stages:
+        counts: Counter[str] = Counter()
+        for o in outcomes:
+            counts.update(strategy for name, strategy in o.strategies if name == stage.name)
+        copy_strategies[stage.name] = dict(counts)
+
+    executed = [strategy for o in outcomes for _, strategy in o.strategies]
+    hits = executed.count(CACHE_STRATEGY)
+    stage_cache = {
+        "enabled": plan.cache is not None,
+        "hits": hits,
+        "misses": len(executed) - hits if plan.cache is not None else 0,
     }
-    (layout.run_dir / "run_summary.json").write_text(
-        json.dumps(summary, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+
+    stages_cpu = sum(m.cpu_s or 0.0 for o in outcomes for _, m in o.steps)
+    phases: dict[str, tuple[float, float]] = {
+        "stages": (time.perf_counter() - plan.clock, stages_cpu)
+    }
+
+    object_store: dict[str, object] = {"enabled": False, "stored": 0, "deduplicated": 0}
+    if inputs.object_store is not None:
+        with timed() as t, plan.section("object_store"):
+            object_store = _adopt_into_store(
+                ObjectStore(inputs.object_store), run_id, ok, layout.run_dir
+            )
+        phases["object_store"] = (t.wall_s, t.cpu_s)
+
+    kept_intermediates = _release_scratch(plan, outcomes)
+
+    # Manifest over rendered outputs (V1).
+    hash_cache = HashCache(inputs.hash_cache) if inputs.hash_cache is not None else None
+    with timed() as t, plan.section("manifest"):
+        try:
+            manifest = build_manifest(
+                rendered,
+                {
+                    str(o.output): {**o.digests, "sha256": o.sha256}
+                    for o in ok
+                    if o.sha256 is not None
+                },
+                algorithms=plan.algorithms,
+                jobs=1 if plan.profiler is not None else inputs.jobs,
+                mode=inputs.manifest_mode,
+                relative_to=layout.run_dir if inputs.manifest_mode == "merkle" else None,
+                hash_cache=hash_cache,
+            )
+        finally:
+            if hash_cache is not None:
+                hash_cache.close()
+    phases["manifest"] = (t.wall_s, t.cpu_s)
+
+    with BundleWriter(layout.run_dir, inputs.durability) as bundle:
+        with timed() as t, plan.section("evidence"):
+            manifest.write_json(bundle.target(layout.manifest_path))
+            if inputs.manifest_index:
+                write_manifest_index(bundle.target(layout.manifest_index_path), manifest.to_dict())
+            # Stat signatures for `kprovengine verify`; taken after object-store adoption.
+            write_stat_index(
+                bundle.target(layout.manifest_stat_path), layout.run_dir, manifest.to_dict()
+            )
+
+            # Provenance record (V1).
+            prov = ProvenanceRecord.from_paths(
+                run_id, sources, rendered, [o.input_sha256 for o in outcomes]
+            )
+            prov.write_json(bundle.target(layout.provenance_path))
+
+            # Human review stub (V1).
+            review = HumanReview.pending()
+            bundle.target(layout.human_review_path).write_text(review.to_json(), encoding="utf-8")
+        phases["evidence"] = (t.wall_s, t.cpu_s)
+
+        metrics = build_metrics(
+            stage_names=[st.name for st in plan.stages],
+            per_file=[(str(o.source), o.steps) for o in outcomes],
+            files_ok=len(ok),
+            wall_s=time.perf_counter() - plan.clock,
+            phases=phases,
+        )
+        log_metrics(logger, run_id, metrics)
+
+        profile: dict[str, object] = {"enabled": False, "files": []}
+        if plan.profiler is not None:
+            written = plan.profiler.write(layout.profile_dir)
+            profile = {
+                "enabled": True,
+                "files": [p.relative_to(layout.run_dir).as_posix() for p in written],
+            }
+
+        # Minimal run summary (this is what your smoke test is asserting on).
+        finished_at = datetime.now(UTC)
+        summary = {
+            "schema": RUN_SUMMARY_SCHEMA,
+            "run_id": run_id,
+            "started_at": plan.started_at.isoformat().replace("+00:00", "Z"),
+            "finished_at": finished_at.isoformat().replace("+00:00", "Z"),
+            "evidence": inputs.evidence,
+            "review_status": inputs.review_status,
+            "sources": [str(p) for p in sources],
+            "outputs": [str(p) for p in rendered],
+            "copy_strategies": copy_strategies,
+            "failures": failures,
+            "stage_cache": stage_cache,
+            "object_store": object_store,
+            "metrics": metrics,
+            "profile": profile,
+            "manifest": {
+                "mode": inputs.manifest_mode,
+                "entries": len(manifest.manifest),
+                "merkle_root": manifest.merkle["root"] if manifest.merkle is not None else None,
+                "index": layout.manifest_index_path.name if inputs.manifest_index else None,
+            },
+            "intermediates": {"mode": inputs.intermediates, "kept": kept_intermediates},
+            "durability": inputs.durability,
+        }
+        # Registered last: a durable run_summary.json implies a complete bundle.
+        with bundle.target(layout.summary_path).open(
+            "w", encoding="utf-8", buffering=1 << 20
+        ) as fp:
+            json.dump(summary, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+        bundle.commit(also_sync=rendered)
+    _catalog_run(layout, summary, outcomes, manifest.manifest)
 
     return RunResult(
         run_id=run_id,
-        started_at=started_at,
+        started_at=plan.started_at,
         finished_at=finished_at,
         run_dir=layout.run_dir,
         outputs=rendered,
         evidence_dir=layout.run_dir if inputs.evidence == "ENABLED" else None,
         summary=summary,
+        failures=failures,
     )
 
 
+def _catalog_run(
+    layout: RunLayout,
+    summary: Mapping[str, object],
+    outcomes: Sequence[_SourceOutcome],
+    entries: Sequence[Mapping[str, str]],
+) -> None:
+    # The catalog is derived data: a failure to update it never fails the run.
+    run = CatalogRun.from_summary(
+        summary,
+        layout.run_dir,
+        inputs={str(o.source): o.input_sha256 for o in outcomes if o.input_sha256},
+        outputs={str(layout.run_dir / e["path"]): e["sha256"] for e in entries},
+    )
+    try:
+        with RunCatalog(layout.catalog_path) as catalog:
+            catalog.record(run)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.warning("run catalog not updated (`kprovengine runs rebuild` restores it): %s", e)
+
+
 def _gen_run_id() -> str:
     ts = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
     return f"{ts}-{secrets.token_hex(3)}"
 
 
-def normalize_files(inputs: Sequence[Path], outdir: Path) -> list[Path]:
-    from .normalize import normalize
-
-    output_paths: list[Path] = []
-    for p in inputs:
-        out = outdir / p.name
-        normalize(p, out)
-        output_paths.append(out)
-    return output_paths
+def _adopt_into_store(
+    store: ObjectStore, run_id: str, outcomes: Sequence[_SourceOutcome], run_dir: Path
+) -> dict[str, object]:
+    """Deduplicate every stage file of the completed sources kept in run_dir into store."""
+    files = [
+        (p, sha or sha256_file(p))
+        for o in outcomes
+        for p, sha in o.files
+        if p.is_relative_to(run_dir)  # scratch intermediates are about to go
+    ]
+    # The ref goes in before any link so a concurrent gc() keeps these blobs.
+    store.add_ref(run_id, (sha for _, sha in files))
+    stored = sum(store.adopt(p, sha) for p, sha in files)
+    return {"enabled": True, "stored": stored, "deduplicated": len(files) - stored}
 
 
-def parse_files(inputs: Sequence[Path], outdir: Path) -> list[Path]:
-    from .parse import parse
-
-    output_paths: list[Path] = []
-    for p in inputs:
-        out = outdir / p.name
-        parse(p, out)
-        output_paths.append(out)
-    return output_paths
-
-
-def extract_records(inputs: Sequence[Path], outdir: Path) -> list[Path]:
-    from .extract import extract
-
-    output_paths: list[Path] = []
-    for p in inputs:
-        out = outdir / p.name
-        extract(p, out)
-        output_paths.append(out)
-    return output_paths
-
+def plan_output_names(sources: Sequence[Path]) -> list[str]:
+    """
+    Assign each source a unique output file name, deterministically.
 
-def render_output(inputs: Sequence[Path], outdir: Path) -> list[Path]:
-    from .render import render
+    The first source with a given basename keeps it; later duplicates become
+    "<stem>~<n><suffix>" with the smallest free n.
+    """
+    taken: set[str] = set()
+    names: list[str] = []
+    for p in sources:
+        name = p.name
+        n = 1
+        while name in taken:
+            name = f"{p.stem}~{n}{p.suffix}"
+            n += 1
+        taken.add(name)
+        names.append(name)
+    return names
+
+
+def _run_step(
+    plan: _RunPlan, stage: Stage, progress: _SourceProgress, dst: Path
+) -> tuple[StageResult, StepMetrics]:
+    """One blocking stage step, through the stage cache when enabled, with its cost."""
+    allow_link = not progress.first
+    with timed() as t:
+        if plan.cache is not None:
+            res = plan.cache.run(
+                stage,
+                progress.current,
+                dst,
+                allow_link=allow_link,
+                src_sha256=progress.sha,
+                algorithms=plan.algorithms,
+                src_digests=progress.digests,
+            )
+        else:
+            res = run_stage(
+                stage,
+                progress.current,
+                dst,
+                allow_link=allow_link,
+                src_sha256=progress.sha,
+                hash_input=progress.first,
+                algorithms=plan.algorithms,
+                src_digests=progress.digests,
+            )
+    return res, StepMetrics(t.wall_s, t.cpu_s, res.bytes_read, res.bytes_written)
+
+
+async def _process_source_async(
+    plan: _RunPlan, i: int, loop: asyncio.AbstractEventLoop, executor: Executor | None
+) -> _SourceOutcome:
+    """
+    Drive one source through the stage chain on the event loop.
 
-    output_paths: list[Path] = []
-    for p in inputs:
-        out = outdir / p.name
-        render(p, out)
-        output_paths.append(out)
-    return output_paths
+    Blocking steps are offloaded to executor and async stages are awaited.
+    Exceptions are captured, not raised. Sources belong to the caller: only
+    run-owned stage outputs may be hardlinked. The first stage tees the source
+    through SHA-256; identity stages then carry the digest forward, so neither
+    provenance nor the manifest re-reads the file.
+    """
+    progress = _SourceProgress(plan.sources[i])
+    for stage, stage_dir in zip(plan.stages, plan.stage_dirs, strict=True):
+        dst = stage_dir / plan.names[i]
+        try:
+            if isinstance(stage, AsyncPathStage):
+                w0 = time.perf_counter()
+                res = await stage.run(
+                    progress.current, dst, src_sha256=progress.sha, hash_input=progress.first
+                )
+                cost = StepMetrics(
+                    time.perf_counter() - w0, None, res.bytes_read, res.bytes_written
+                )
+            else:
+                res, cost = await loop.run_in_executor(
+                    executor, _run_step, plan, stage, progress, dst
+                )
+        except Exception as e:
+            return progress.fail(stage, e)
+        progress.record(stage, res, cost)
+    return progress.done()
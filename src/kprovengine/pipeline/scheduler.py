@@ -0,0 +1,93 @@
+# src/kprovengine/pipeline/scheduler.py
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+
+__all__ = ["run_staged"]
+
+_DONE = -1  # queue sentinel: no more items for this stage
+
+
+def run_staged(
+    n_items: int,
+    n_stages: int,
+    step: Callable[[int, int], bool],
+    *,
+    workers: int = 1,
+    queue_depth: int | None = None,
+) -> None:
+    """
+    Push items 0..n_items-1 through stages 0..n_stages-1.
+
+    step(item, stage) runs one stage for one item and returns False to drop
+    the item (e.g. on failure). Each item advances independently: stage k+1
+    can process item A while stage k is still busy with item B.
+
+    With workers > 1, every stage gets its own pool of `workers` threads and
+    consecutive stages are joined by a bounded queue (queue_depth, default
+    2 * workers). A full queue blocks the upstream stage, so a slow stage
+    applies backpressure instead of letting intermediate files pile up.
+
+    workers == 1 runs inline, item by item. step must be safe to call from
+    any thread; a given item is only ever handled by one thread at a time.
+    Exceptions raised by step are re-raised here after all threads stop.
+    """
+    if n_stages < 1:
+        raise ValueError("n_stages must be >= 1")
+    if workers <= 1 or n_items <= 1:
+        for i in range(n_items):
+            for k in range(n_stages):
+                if not step(i, k):
+                    break
+        return
+
+    depth = queue_depth if queue_depth is not None else 2 * workers
+    queues: list[queue.Queue[int]] = [queue.Queue(maxsize=depth) for _ in range(n_stages)]
+    live = [workers] * n_stages
+    lock = threading.Lock()
+    errors: list[Exception] = []
+
+    def _worker(k: int) -> None:
+        q_in = queues[k]
+        q_out = queues[k + 1] if k + 1 < n_stages else None
+        try:
+            while True:
+                i = q_in.get()
+                if i == _DONE:
+                    return
+                try:
+                    keep = step(i, k) and not errors
+                except Exception as e:
+                    with lock:
+                        errors.append(e)
+                    keep = False
+                if keep and q_out is not None:
+                    q_out.put(i)
+        finally:
+            # The last worker of a stage closes the next stage.
+            with lock:
+                live[k] -= 1
+                last = live[k] == 0
+            if last and q_out is not None:
+                for _ in range(workers):
+                    q_out.put(_DONE)
+
+    threads = [
+        threading.Thread(target=_worker, args=(k,), name=f"kprov-stage{k}-{w}", daemon=True)
+        for k in range(n_stages)
+        for w in range(workers)
+    ]
+    for t in threads:
+        t.start()
+    for i in range(n_items):
+        if errors:
+            break
+        queues[0].put(i)
+    for _ in range(workers):
+        queues[0].put(_DONE)
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,262 @@
+# src/kprovengine/pipeline/stage.py
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Protocol, cast, runtime_checkable
+
+from kprovengine.manifest.hashing import (
+    DEFAULT_ALGORITHMS,
+    HashingReader,
+    HashingWriter,
+    sha256_file,
+)
+from kprovengine.storage.copy import copy_file
+
+__all__ = [
+    "STAGE_CHUNK_SIZE",
+    "AsyncPathStage",
+    "IdentityStage",
+    "PathStageAdapter",
+    "Stage",
+    "StageResult",
+    "copy_stream",
+    "run_stage",
+]
+
+# Fixed chunk size for streaming stages; bounds per-file memory regardless of input size.
+STAGE_CHUNK_SIZE = 1 << 20
+
+
+@runtime_checkable
+class Stage(Protocol):
+    """
+    Streaming stage contract.
+
+    A stage reads its input from a binary reader and writes its output to a
+    binary writer, one bounded chunk at a time. Implementations must not
+    buffer the whole input.
+    """
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def version(self) -> str: ...
+
+    def transform(self, reader: BinaryIO, writer: BinaryIO) -> None: ...
+
+
+def copy_stream(reader: BinaryIO, writer: BinaryIO, chunk_size: int = STAGE_CHUNK_SIZE) -> int:
+    """Copy reader to writer in fixed-size chunks. Returns the number of bytes copied."""
+    total = 0
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return total
+        writer.write(chunk)
+        total += len(chunk)
+
+
+@dataclass(frozen=True)
+class IdentityStage:
+    """
+    V1 identity stage: output bytes equal input bytes.
+
+    transform() streams chunks; run_stage() skips the byte loop entirely and
+    uses storage.copy (link / reflink / kernel copy) instead.
+    """
+
+    name: str
+    version: str = "1"
+    chunk_size: int = STAGE_CHUNK_SIZE
+
+    def transform(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        copy_stream(reader, writer, self.chunk_size)
+
+
+@dataclass(frozen=True)
+class PathStageAdapter:
+    """
+    Adapter for legacy whole-file stages with the signature fn(src, dst).
+
+    run_stage() calls fn directly on paths. transform() spools the stream to a
+    temporary file first, so memory stays bounded but the stage itself may not.
+    cacheable=True declares fn a pure function of the input bytes (for a
+    given name and version), letting the stage cache serve it.
+    """
+
+    name: str
+    fn: Callable[[Path, Path], object]
+    version: str = "1"
+    cacheable: bool = False
+
+    def transform(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        with tempfile.TemporaryDirectory(prefix="kprov-stage-") as tmp:
+            src = Path(tmp) / "in"
+            dst = Path(tmp) / "out"
+            with src.open("wb") as fp:
+                copy_stream(reader, fp)
+            self.fn(src, dst)
+            with dst.open("rb") as fp:
+                copy_stream(fp, writer)
+
+
+@dataclass(frozen=True)
+class AsyncPathStage:
+    """
+    Stage backed by a coroutine fn(src, dst), e.g. a call into an
+    AsyncOCRAdapter or AsyncLLMAdapter.
+
+    Only run_pipeline_async() can drive it; the synchronous driver and
+    transform() reject it.
+    """
+
+    name: str
+    fn: Callable[[Path, Path], Awaitable[object]]
+    version: str = "1"
+
+    def transform(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        raise TypeError(f"stage {self.name!r} is async; drive it with run_pipeline_async()")
+
+    async def run(
+        self,
+        src: Path,
+        dst: Path,
+        *,
+        src_sha256: str | None = None,
+        hash_input: bool = False,
+    ) -> StageResult:
+        """
+        Await fn(src, dst). The output is opaque, so its digest is left unknown;
+        an unknown input digest is computed off the loop when hash_input is set.
+        """
+        if src_sha256 is None and hash_input:
+            src_sha256 = await asyncio.to_thread(sha256_file, src)
+        dst.unlink(missing_ok=True)
+        await self.fn(src, dst)
+        size_in, size_out = await asyncio.to_thread(_sizes, src, dst)
+        return StageResult(
+            dst, "async", input_sha256=src_sha256, bytes_read=size_in, bytes_written=size_out
+        )
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """
+    Outcome of one stage over one file.
+
+    strategy: how the bytes moved (a copy strategy, "tee", "path", "stream"
+    or "async").
+    input_sha256 / sha256: digests of the stage input and output, when known
+    without an extra read pass.
+    digests: output digests by algorithm (sha256 plus any extra algorithms
+    requested), when known; empty for opaque stages.
+    bytes_read / bytes_written: file data moved through this process or the
+    kernel; links and clones move none.
+    """
+
+    output: Path
+    strategy: str
+    input_sha256: str | None = None
+    sha256: str | None = None
+    bytes_read: int = 0
+    bytes_written: int = 0
+    digests: Mapping[str, str] = field(default_factory=dict)
+
+
+def run_stage(
+    stage: Stage,
+    src: Path,
+    dst: Path,
+    *,
+    allow_link: bool = False,
+    src_sha256: str | None = None,
+    hash_input: bool = False,
+    algorithms: Iterable[str] = DEFAULT_ALGORITHMS,
+    src_digests: Mapping[str, str] | None = None,
+) -> StageResult:
+    """
+    Drive one stage over one file.
+
+    Identity stages move bytes with storage.copy (link / reflink / kernel
+    copy) and carry src_sha256 / src_digests forward unchanged. When the
+    input digest is unknown and hash_input is set, they instead stream
+    through a hashing tee ("tee"), digesting input and output in the same
+    pass. Streaming stages always tee their writer. Tees compute every
+    algorithm in `algorithms` in that one pass. Adapted legacy stages
+    ("path") are opaque, so their output digest is left unknown; with
+    hash_input set their input is hashed in a separate read first.
+
+    An existing dst is replaced, never written through (it may be a hardlink).
+    """
+    carried = dict(src_digests or {})
+    if src_sha256 is None:
+        src_sha256 = carried.get("sha256")
+    elif "sha256" not in carried:
+        carried["sha256"] = src_sha256
+    dst.unlink(missing_ok=True)
+    if isinstance(stage, IdentityStage):
+        if src_sha256 is None and hash_input:
+            with src.open("rb") as fsrc, dst.open("wb") as fdst:
+                reader = HashingReader(fsrc, algorithms)
+                stage.transform(cast(BinaryIO, reader), fdst)
+            digests = reader.hexdigests()
+            n = reader.nbytes
+            return StageResult(
+                dst,
+                "tee",
+                input_sha256=digests["sha256"],
+                sha256=digests["sha256"],
+                bytes_read=n,
+                bytes_written=n,
+                digests=digests,
+            )
+        strategy = copy_file(src, dst, allow_link=allow_link)
+        n = 0 if strategy in ("hardlink", "reflink") else dst.stat().st_size
+        return StageResult(
+            dst,
+            strategy,
+            input_sha256=src_sha256,
+            sha256=src_sha256,
+            bytes_read=n,
+            bytes_written=n,
+            digests=carried,
+        )
+
+    if isinstance(stage, AsyncPathStage):
+        raise TypeError(f"stage {stage.name!r} is async; drive it with run_pipeline_async()")
+
+    if isinstance(stage, PathStageAdapter):
+        # fn does its own I/O, so there is no stream to tee the input through.
+        if src_sha256 is None and hash_input:
+            src_sha256 = sha256_file(src)
+        stage.fn(src, dst)
+        size_in, size_out = _sizes(src, dst)
+        return StageResult(
+            dst, "path", input_sha256=src_sha256, bytes_read=size_in, bytes_written=size_out
+        )
+
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        tee_in = HashingReader(fsrc) if src_sha256 is None and hash_input else None
+        writer = HashingWriter(fdst, algorithms)
+        stage.transform(cast(BinaryIO, fsrc if tee_in is None else tee_in), cast(BinaryIO, writer))
+    in_sha = tee_in.hexdigest() if tee_in is not None else src_sha256
+    digests = writer.hexdigests()
+    return StageResult(
+        dst,
+        "stream",
+        input_sha256=in_sha,
+        sha256=digests["sha256"],
+        bytes_read=tee_in.nbytes if tee_in is not None else src.stat().st_size,
+        bytes_written=writer.nbytes,
+        digests=digests,
+    )
+
+
+def _sizes(src: Path, dst: Path) -> tuple[int, int]:
+    """Input/output sizes for stages that do their own I/O (assumed to read src once)."""
+    return src.stat().st_size, dst.stat().st_size
@@ -9,6 +9,7 @@ from html import escape
 from pathlib import Path
 from typing import Any
 
+from kprovengine.manifest.hash_cache import HashCache
 from kprovengine.manifest.hashing import sha256_file
 from kprovengine.version import __version__
 
@@ -57,10 +58,12 @@ class GitMetadata:
         }
 
 
-def build_report_archive(manifest_path: str | Path) -> dict[str, Any]:
+def build_report_archive(
+    manifest_path: str | Path, *, hash_cache: HashCache | None = None
+) -> dict[str, Any]:
     manifest_file = Path(manifest_path).expanduser().resolve()
     manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
-    artifacts = [_enrich_artifact(a) for a in manifest.get("artifacts", [])]
+    artifacts = [_enrich_artifact(a, hash_cache) for a in manifest.get("artifacts", [])]
     claims = [_normalize_claim(c) for c in manifest.get("claims", [])]
     cost_models = [_normalize_cost_model(c) for c in manifest.get("cost_models", [])]
     edges = [_normalize_edge(e) for e in manifest.get("edges", [])]
@@ -855,8 +858,14 @@ def render_report_html(archive: dict[str, Any]) -> str:
     )
 
 
-def write_report(manifest_path: str | Path, html_output: str | Path, archive_output: str | Path | None = None) -> dict[str, Any]:
-    archive = build_report_archive(manifest_path)
+def write_report(
+    manifest_path: str | Path,
+    html_output: str | Path,
+    archive_output: str | Path | None = None,
+    *,
+    hash_cache: HashCache | None = None,
+) -> dict[str, Any]:
+    archive = build_report_archive(manifest_path, hash_cache=hash_cache)
     html = render_report_html(archive)
 
     html_path = Path(html_output).expanduser()
@@ -893,7 +902,7 @@ def _normalize_edge(edge: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _enrich_artifact(artifact: dict[str, Any]) -> dict[str, Any]:
+def _enrich_artifact(artifact: dict[str, Any], hash_cache: HashCache | None = None) -> dict[str, Any]:
     enriched = dict(artifact)
     enriched.setdefault("tags", [])
     enriched.setdefault("kind", "artifact")
@@ -916,7 +925,9 @@ def _enrich_artifact(artifact: dict[str, Any]) -> dict[str, Any]:
             enriched["created_at"] = _iso_utc(datetime.fromtimestamp(stat.st_ctime, tz=UTC))
             enriched["mime_type"] = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
             if path.is_file():
-                enriched["sha256"] = sha256_file(path)
+                enriched["sha256"] = (
+                    hash_cache.hash_file(path)["sha256"] if hash_cache is not None else sha256_file(path)
+                )
                 enriched["line_count"] = _line_count(path)
             git = _git_metadata(path)
             enriched["git"] = git.to_dict() if git is not None else None
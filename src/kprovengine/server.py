@@ -0,0 +1,335 @@
+# src/kprovengine/server.py
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hmac
+import io
+import json
+import logging
+import os
+import secrets
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from . import cli
+from .client import LOCAL_ONLY, default_socket_path, private_dir
+from .evidence.toolchain import Toolchain
+
+__all__ = ["JobServer", "main"]
+
+logger = logging.getLogger(__name__)
+
+# Largest request line accepted on the socket (argv lists, not file content).
+MAX_REQUEST_BYTES = 1 << 20
+
+# Requests executed at once; each run still uses its own --jobs workers.
+DEFAULT_WORKERS = 4
+
+
+class JobServer:
+    """
+    Executes CLI requests in a warm process.
+
+    A request {"argv": [...], "cwd": "..."} runs cli.main(argv, cwd=cwd)
+    and answers {"exit_code", "stdout", "stderr"}: the same bytes a fresh
+    `kprovengine` process would print. The process's own cwd and streams
+    are never touched, so up to `workers` requests run concurrently on a
+    resident job pool. Warnings logged by a stage's worker thread (--jobs)
+    reach the server's stderr rather than the job's. {"op": "ping"}
+    reports the server's pid, toolchain and job count; {"op": "shutdown"}
+    stops it.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.toolchain = Toolchain.basic().to_dict()
+        self.started = time.time()
+        self.jobs_served = 0
+        self._count_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kprovengine-job")
+        self._stop = threading.Event()
+        self._servers: list[socketserver.BaseServer] = []
+        self._token_files: list[Path] = []
+
+    def handle(self, request: Any) -> dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"error": "request must be a JSON object"}
+        op = request.get("op", "run")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 3),
+                "jobs_served": self.jobs_served,
+                "toolchain": self.toolchain,
+            }
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "run":
+            return {"error": f"unknown op: {op!r}"}
+        argv = request.get("argv")
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            return {"error": "argv must be a list of strings"}
+        if argv and argv[0] in LOCAL_ONLY:
+            return {"error": f"{argv[0]} cannot be forwarded"}
+        if "-" in argv:
+            return {"error": "stdin ('-') cannot be forwarded"}
+        cwd = request.get("cwd")
+        if not isinstance(cwd, str) or not os.path.isabs(cwd):
+            return {"error": "cwd must be an absolute path"}
+        return self.run(argv, Path(cwd))
+
+    def run(self, argv: list[str], cwd: Path) -> dict[str, Any]:
+        """Run argv on the job pool and wait for its reply."""
+        try:
+            return self._pool.submit(self._run_job, argv, cwd).result()
+        except (RuntimeError, CancelledError):
+            # submit() after shutdown(), or a queued job cancelled by it.
+            return {"error": "server shutting down"}
+
+    def _run_job(self, argv: list[str], cwd: Path) -> dict[str, Any]:
+        if not cwd.is_dir():
+            return {"exit_code": cli.EX_IOERR, "stdout": "", "stderr": f"error: no such dir: {cwd}\n"}
+        out, err = io.StringIO(), io.StringIO()
+        try:
+            code = cli.main(argv, cwd=cwd, stdout=out, stderr=err)
+        finally:
+            with self._count_lock:
+                self.jobs_served += 1
+        return {"exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    def serve_unix(self, path: Path) -> socketserver.UnixStreamServer:
+        """Bind path (mode 0600) and start answering one JSON line per request."""
+        _claim_socket(path)
+        job_server = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+                if not line:
+                    return  # a liveness probe (see _claim_socket)
+                try:
+                    if len(line) > MAX_REQUEST_BYTES:
+                        raise ValueError("request too large")
+                    reply = job_server.handle(json.loads(line))
+                except ValueError as e:
+                    reply = {"error": f"bad request: {e}"}
+                with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+        old_umask = os.umask(0o177)
+        try:
+            srv = socketserver.ThreadingUnixStreamServer(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+        srv.daemon_threads = True
+        self._start(srv)
+        return srv
+
+    def serve_http(self, port: int, token_file: Path) -> ThreadingHTTPServer:
+        """
+        POST the same JSON requests to http://127.0.0.1:<port>/ (loopback only).
+
+        Any local process, including a browser page, can reach a loopback
+        port, so a request must carry "Authorization: Bearer <token>" with
+        the secret written to token_file (mode 0600), be application/json,
+        and name the loopback address in Host and in Origin if it sends one.
+        No CORS preflight is answered.
+        """
+        job_server = self
+        allowed_hosts: set[str] = set()
+        token = _write_token(token_file)
+        self._token_files.append(token_file)
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                origin = self.headers.get("Origin")
+                if self.headers.get("Host") not in allowed_hosts:
+                    return self._reply(403, {"error": "forbidden: Host"})
+                if origin is not None and origin not in {f"http://{h}" for h in allowed_hosts}:
+                    return self._reply(403, {"error": "forbidden: Origin"})
+                if self.headers.get_content_type() != "application/json":
+                    return self._reply(415, {"error": "Content-Type must be application/json"})
+                auth = self.headers.get("Authorization", "")
+                if not hmac.compare_digest(auth.encode("utf-8"), f"Bearer {token}".encode()):
+                    return self._reply(401, {"error": "unauthorized"})
+                n = int(self.headers.get("Content-Length") or 0)
+                try:
+                    if n > MAX_REQUEST_BYTES:
+                        raise ValueError("request too large")
+                    reply = job_server.handle(json.loads(self.rfile.read(n)))
+                except ValueError as e:
+                    reply = {"error": f"bad request: {e}"}
+                self._reply(400 if "error" in reply else 200, reply)
+
+            def _reply(self, status: int, reply: dict[str, Any]) -> None:
+                body = json.dumps(reply).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug("http: " + format, *args)
+
+        srv = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        bound = srv.server_address[1]
+        allowed_hosts.update({f"127.0.0.1:{bound}", f"localhost:{bound}"})
+        srv.daemon_threads = True
+        self._start(srv)
+        return srv
+
+    def _start(self, srv: socketserver.BaseServer) -> None:
+        self._servers.append(srv)
+        threading.Thread(target=srv.serve_forever, name="kprovengine-serve", daemon=True).start()
+
+    def wait(self) -> None:
+        self._stop.wait()
+
+    def shutdown(self) -> None:
+        for srv in self._servers:
+            srv.shutdown()
+            srv.server_close()
+            if isinstance(srv, socketserver.UnixStreamServer):
+                with contextlib.suppress(OSError):
+                    os.unlink(srv.server_address)  # type: ignore[arg-type]
+        for p in self._token_files:
+            with contextlib.suppress(OSError):
+                p.unlink()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._stop.set()
+
+
+def _write_token(path: Path) -> str:
+    """Write a fresh secret to path (mode 0600, replaced atomically) and return it."""
+    token = secrets.token_urlsafe(32)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token + "\n")
+    os.replace(tmp, path)
+    return token
+
+
+def _private_dir(d: Path) -> None:
+    """Create d (0700) or check that it is a directory only this user can enter."""
+    with contextlib.suppress(FileExistsError):
+        d.mkdir(mode=0o700)
+    st = os.lstat(d)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise RuntimeError(f"{d} is not a private directory owned by uid {os.getuid()}")
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket at path; refuse if a server still answers there."""
+    if path.parent == private_dir():
+        _private_dir(path.parent)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise RuntimeError(f"a server is already listening on {path}")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="kprovengine serve",
+        description="Run a resident kprovengine job server; the CLI forwards to it while it runs.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help=f"Unix socket path. Default: $KPROVENGINE_SOCKET or {default_socket_path()}",
+    )
+    parser.add_argument(
+        "--http",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help=(
+            "Also accept POSTed requests on 127.0.0.1:PORT, authenticated by the "
+            "token written to <socket>.token."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Requests executed concurrently. Default: {DEFAULT_WORKERS}",
+    )
+    return parser
+
+
+class _JobStderr(logging.Handler):
+    """Send kprovengine warnings to the stderr of the job that logged them."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            cli._eprint(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def main(argv: list[str]) -> int:
+    """
+    `kprovengine serve [--socket PATH] [--http PORT] [--workers N]` serves
+    until it gets a shutdown request or SIGINT. Prints {"socket", "http",
+    "token_file", "pid"} once ready.
+    """
+    try:
+        ns = _build_parser().parse_args(argv)
+    except SystemExit as e:
+        return cli.EX_OK if not e.code else cli.EX_USAGE
+    if ns.workers < 1:
+        cli._eprint(f"error: --workers must be >= 1, got {ns.workers}")
+        return cli.EX_USAGE
+
+    path = Path(ns.socket).expanduser() if ns.socket else default_socket_path()
+    token_file = path.with_name(path.name + ".token")
+    server = JobServer(workers=ns.workers)
+    try:
+        server.serve_unix(path)
+        http = server.serve_http(ns.http, token_file) if ns.http is not None else None
+    except (RuntimeError, OSError) as e:
+        server.shutdown()
+        cli._eprint(f"error: {e}")
+        return cli.EX_IOERR if isinstance(e, OSError) else cli.EX_USAGE
+
+    handler = _JobStderr(logging.WARNING)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    pkg_logger = logging.getLogger("kprovengine")
+    pkg_logger.addHandler(handler)
+    ready = {
+        "socket": str(path),
+        "http": http.server_address[1] if http else None,
+        "token_file": str(token_file) if http else None,
+    }
+    print(json.dumps({**ready, "pid": os.getpid()}, sort_keys=True), flush=True)
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    finally:
+        pkg_logger.removeHandler(handler)
+    return cli.EX_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,9 +2,24 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from .cas import ObjectStore
+from .catalog import CatalogRun, RunCatalog
+from .copy import CopyStrategy, copy_file
+from .durability import BundleWriter
 from .layout import RunLayout
+from .lineage import LineageStep, walk_lineage
 
-__all__ = ["RunLayout"]
+__all__ = [
+    "BundleWriter",
+    "CatalogRun",
+    "CopyStrategy",
+    "LineageStep",
+    "ObjectStore",
+    "RunCatalog",
+    "RunLayout",
+    "copy_file",
+    "walk_lineage",
+]
 
 # Useful alias for backwards compatibility
 PathLike = Path | str
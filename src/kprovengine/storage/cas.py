@@ -0,0 +1,191 @@
+# src/kprovengine/storage/cas.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from kprovengine.manifest.hashing import sha256_file
+
+from .copy import CopyStrategy, copy_file
+
+__all__ = ["ObjectStore"]
+
+logger = logging.getLogger(__name__)
+
+
+def _tmp_sibling(p: Path) -> Path:
+    return p.with_name(f".{p.name}.{secrets.token_hex(4)}.tmp")
+
+
+def _signature(st: os.stat_result) -> list[int]:
+    # Any write through any of the blob's links moves mtime (and usually size).
+    return [st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev]
+
+
+@dataclass(frozen=True)
+class ObjectStore:
+    """
+    Content-addressable blob store shared across runs.
+
+    Layout under root:
+      objects/<sha[:2]>/<sha[2:]>  -> blob bytes, stored once per digest
+      refs/<ref>.json              -> sorted list of digests a ref (run) holds
+      stat/<sha[:2]>/<sha[2:]>     -> stat signature of the blob when last verified
+
+    Run directories hold hardlinks into objects/ (or reflinks / copies when
+    the store is on another filesystem), so a run file edited in place edits
+    its blob too. The store never changes the mode or times of those shared
+    inodes; it records each verified blob's stat signature under stat/
+    instead. A blob whose stat has moved since is re-hashed before it is
+    reused, and replaced if it no longer matches its name.
+
+    Garbage collection is reference counted: a blob is only removed when no
+    ref lists it AND no hardlink outside the store points at it (st_nlink == 1).
+    Callers record a ref before linking blobs into a run, so a concurrent gc()
+    never removes a blob a live run is about to use.
+    """
+
+    root: Path
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / "objects"
+
+    @property
+    def refs_dir(self) -> Path:
+        return self.root / "refs"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256[2:]
+
+    def stat_path(self, sha256: str) -> Path:
+        return self.root / "stat" / sha256[:2] / sha256[2:]
+
+    def has(self, sha256: str) -> bool:
+        return self.object_path(sha256).is_file()
+
+    def verify(self, sha256: str) -> bool:
+        """
+        True if blob sha256 exists and still holds that content.
+
+        A blob whose stat matches the signature recorded when it was last
+        verified is trusted; any other is re-hashed, and its signature
+        recorded again when it matches.
+        """
+        obj = self.object_path(sha256)
+        try:
+            st = obj.stat()
+            if self._recorded(sha256) == _signature(st):
+                return True
+            if sha256_file(obj) != sha256:
+                return False
+        except FileNotFoundError:
+            return False
+        self._record(sha256, st)
+        return True
+
+    def _recorded(self, sha256: str) -> object:
+        try:
+            return json.loads(self.stat_path(sha256).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _record(self, sha256: str, st: os.stat_result) -> None:
+        p = self.stat_path(sha256)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_sibling(p)
+        tmp.write_text(json.dumps(_signature(st)), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def put(self, path: Path, sha256: str) -> bool:
+        """
+        Store path's bytes under sha256 (the caller vouches for the digest).
+
+        Links path into the store when possible; path itself is left as it
+        is. Returns True if a new blob was written, False if the digest was
+        already present. A present blob that fails verify() is replaced.
+        """
+        obj = self.object_path(sha256)
+        if self.verify(sha256):
+            return False
+        if obj.exists():
+            logger.warning("object %s does not match its digest; replacing it", sha256)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_sibling(obj)
+        copy_file(path, tmp, allow_link=True)
+        os.replace(tmp, obj)
+        self._record(sha256, obj.stat())
+        return True
+
+    def link_into(self, sha256: str, dst: Path) -> CopyStrategy:
+        """Materialize blob sha256 at dst (hardlink when possible); see verify()."""
+        return copy_file(self.object_path(sha256), dst, allow_link=True)
+
+    def adopt(self, path: Path, sha256: str) -> bool:
+        """
+        Deduplicate a run file: make path a link to the blob for sha256.
+
+        New content is linked into the store; known content replaces path with
+        a link to the existing blob once it passes verify(). Returns True if a
+        new blob was written.
+        """
+        if self.put(path, sha256):
+            return True
+        obj = self.object_path(sha256)
+        if path.exists() and os.path.samefile(path, obj):
+            return False
+        tmp = _tmp_sibling(path)
+        self.link_into(sha256, tmp)
+        os.replace(tmp, path)
+        return False
+
+    def add_ref(self, ref: str, digests: Iterable[str]) -> None:
+        """Record (or replace) the set of digests held by ref."""
+        self.refs_dir.mkdir(parents=True, exist_ok=True)
+        p = self.refs_dir / f"{ref}.json"
+        tmp = _tmp_sibling(p)
+        tmp.write_text(json.dumps(sorted(set(digests))) + "\n", encoding="utf-8")
+        os.replace(tmp, p)
+
+    def remove_ref(self, ref: str) -> None:
+        (self.refs_dir / f"{ref}.json").unlink(missing_ok=True)
+
+    def refcounts(self) -> Counter[str]:
+        """Number of refs holding each digest."""
+        counts: Counter[str] = Counter()
+        if not self.refs_dir.is_dir():
+            return counts
+        for p in sorted(self.refs_dir.glob("*.json")):
+            counts.update(json.loads(p.read_text(encoding="utf-8")))
+        return counts
+
+    def gc(self, *, dry_run: bool = False) -> list[str]:
+        """
+        Remove unreferenced, unlinked blobs, and any blob that fails verify()
+        (run directories keep their links to it). Returns the removed
+        digests, sorted.
+        """
+        counts = self.refcounts()
+        removed: list[str] = []
+        if not self.objects_dir.is_dir():
+            return removed
+        for shard in sorted(self.objects_dir.iterdir()):
+            if not shard.is_dir():
+                continue
+            for obj in sorted(shard.iterdir()):
+                if obj.name.startswith("."):
+                    continue
+                sha = shard.name + obj.name
+                if (counts[sha] > 0 or obj.stat().st_nlink > 1) and self.verify(sha):
+                    continue
+                if not dry_run:
+                    obj.unlink(missing_ok=True)
+                    self.stat_path(sha).unlink(missing_ok=True)
+                removed.append(sha)
+        return removed
@@ -0,0 +1,278 @@
+# src/kprovengine/storage/catalog.py
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+__all__ = ["CATALOG_FILENAME", "CatalogRun", "RunCatalog"]
+
+CATALOG_FILENAME = "catalog.sqlite"
+_SCHEMA_VERSION = 1
+# Digests per IN (...) clause; well under SQLite's bound-parameter limit.
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_dir TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    started_ts REAL NOT NULL,
+    evidence TEXT NOT NULL,
+    review_status TEXT NOT NULL,
+    failures INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_ts);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (review_status, started_ts);
+CREATE TABLE IF NOT EXISTS files (
+    run_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256, role);
+CREATE INDEX IF NOT EXISTS files_run ON files (run_id);
+"""
+
+_RUN_COLUMNS = (
+    "run_id",
+    "run_dir",
+    "started_at",
+    "finished_at",
+    "evidence",
+    "review_status",
+    "failures",
+)
+
+
+def _timestamp(iso: str) -> float:
+    dt = datetime.fromisoformat(iso)
+    return (dt if dt.tzinfo else dt.replace(tzinfo=UTC)).timestamp()
+
+
+@dataclass(frozen=True)
+class CatalogRun:
+    """
+    One catalog row plus its file hashes. inputs and outputs map a file path
+    (absolute) to its sha256.
+    """
+
+    run_id: str
+    run_dir: Path
+    started_at: str
+    finished_at: str
+    evidence: str
+    review_status: str
+    failures: int
+    inputs: Mapping[str, str] = field(default_factory=dict)
+    outputs: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_summary(
+        cls,
+        summary: Mapping[str, Any],
+        run_dir: Path,
+        inputs: Mapping[str, str],
+        outputs: Mapping[str, str],
+    ) -> CatalogRun:
+        return cls(
+            run_id=str(summary["run_id"]),
+            run_dir=run_dir,
+            started_at=str(summary["started_at"]),
+            finished_at=str(summary["finished_at"]),
+            evidence=str(summary["evidence"]),
+            review_status=str(summary["review_status"]),
+            failures=len(summary.get("failures", [])),
+            inputs=inputs,
+            outputs=outputs,
+        )
+
+    @classmethod
+    def load(cls, run_dir: Path) -> CatalogRun:
+        """Read a run back from its run_summary.json, provenance.json and manifest.json."""
+        summary = json.loads((run_dir / "run_summary.json").read_text(encoding="utf-8"))
+        inputs: dict[str, str] = {}
+        prov_path = run_dir / "provenance.json"
+        if prov_path.is_file():
+            prov = json.loads(prov_path.read_text(encoding="utf-8"))
+            inputs = dict(prov.get("input_sha256", {}))
+        outputs: dict[str, str] = {}
+        manifest_path = run_dir / "manifest.json"
+        if manifest_path.is_file():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            for e in manifest.get("manifest", []):
+                # Merkle manifests record run-relative paths.
+                outputs[str(run_dir / e["path"])] = e["sha256"]
+        return cls.from_summary(summary, run_dir, inputs, outputs)
+
+
+class RunCatalog:
+    """
+    SQLite index of the runs under one output directory (<out>/catalog.sqlite).
+
+    run_pipeline records each run as it commits. The run directories stay the
+    source of truth: rebuild() recreates the catalog from them at any time.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        version = int(self._db.execute("PRAGMA user_version").fetchone()[0])
+        if version not in (0, _SCHEMA_VERSION):
+            self._db.close()
+            raise ValueError(
+                f"{path}: catalog schema v{version} is not supported; delete it and rebuild"
+            )
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @classmethod
+    def for_output_dir(cls, out_dir: Path) -> RunCatalog:
+        return cls(out_dir / CATALOG_FILENAME)
+
+    def __enter__(self) -> RunCatalog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    def _insert(self, run: CatalogRun) -> None:
+        self._db.execute("DELETE FROM files WHERE run_id = ?", (run.run_id,))
+        self._db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run.run_id,
+                str(run.run_dir),
+                run.started_at,
+                run.finished_at,
+                _timestamp(run.started_at),
+                run.evidence,
+                run.review_status,
+                run.failures,
+            ),
+        )
+        self._db.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?)",
+            [(run.run_id, "input", p, h) for p, h in run.inputs.items()]
+            + [(run.run_id, "output", p, h) for p, h in run.outputs.items()],
+        )
+
+    def record(self, run: CatalogRun) -> None:
+        """Add or replace one run."""
+        with self._db:
+            self._insert(run)
+
+    def rebuild(self, out_dir: Path) -> int:
+        """
+        Replace the catalog with the runs found in out_dir (directories
+        holding a run_summary.json); returns the number of runs indexed.
+        """
+        runs = 0
+        with self._db:
+            self._db.execute("DELETE FROM files")
+            self._db.execute("DELETE FROM runs")
+            for run_dir in sorted(out_dir.iterdir()):
+                if not (run_dir / "run_summary.json").is_file():
+                    continue
+                self._insert(CatalogRun.load(run_dir))
+                runs += 1
+        return runs
+
+    def query(
+        self,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        sha256: str | None = None,
+        role: str | None = None,
+        review_status: str | None = None,
+        evidence: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Runs matching every given filter, oldest first.
+
+        since/until are ISO 8601 bounds on started_at (inclusive / exclusive;
+        naive times are UTC). sha256 matches any input or output file, or
+        only one side when role is "input" or "output".
+        """
+        if role not in (None, "input", "output"):
+            raise ValueError(f"role must be 'input' or 'output', got {role!r}")
+        distinct = "DISTINCT " if sha256 is not None else ""
+        sql = f"SELECT {distinct}" + ", ".join(f"r.{c}" for c in _RUN_COLUMNS) + " FROM runs r"
+        where: list[str] = []
+        args: list[object] = []
+        if sha256 is not None:
+            sql += " JOIN files f ON f.run_id = r.run_id"
+            where.append("f.sha256 = ?")
+            args.append(sha256.lower())
+            if role is not None:
+                where.append("f.role = ?")
+                args.append(role)
+        if since is not None:
+            where.append("r.started_ts >= ?")
+            args.append(_timestamp(since))
+        if until is not None:
+            where.append("r.started_ts < ?")
+            args.append(_timestamp(until))
+        if review_status is not None:
+            where.append("r.review_status = ?")
+            args.append(review_status.upper())
+        if evidence is not None:
+            where.append("r.evidence = ?")
+            args.append(evidence.upper())
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.started_ts, r.run_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [dict(zip(_RUN_COLUMNS, row, strict=True)) for row in self._db.execute(sql, args)]
+
+    def files(self, run_id: str) -> Iterator[dict[str, str]]:
+        """Recorded input and output files of one run."""
+        rows = self._db.execute(
+            "SELECT role, path, sha256 FROM files WHERE run_id = ? ORDER BY role, path",
+            (run_id,),
+        )
+        for role, path, sha in rows:
+            yield {"role": role, "path": path, "sha256": sha}
+
+    def lookup(self, sha256: str | Iterable[str], role: str | None = None) -> list[dict[str, str]]:
+        """
+        Every recorded file with the given digest(s) as {"run_id", "role",
+        "path", "sha256"}, oldest run first. Each digest is one index probe.
+        """
+        if role not in (None, "input", "output"):
+            raise ValueError(f"role must be 'input' or 'output', got {role!r}")
+        wanted = [sha256] if isinstance(sha256, str) else list(sha256)
+        digests = sorted({s.lower() for s in wanted})
+        rows: list[tuple[float, str, str, str, str]] = []
+        for i in range(0, len(digests), _LOOKUP_BATCH):
+            batch = digests[i : i + _LOOKUP_BATCH]
+            sql = (
+                "SELECT r.started_ts, f.run_id, f.role, f.path, f.sha256"
+                " FROM files f JOIN runs r ON r.run_id = f.run_id"
+                f" WHERE f.sha256 IN ({', '.join('?' * len(batch))})"
+            )
+            args: list[object] = list(batch)
+            if role is not None:
+                sql += " AND f.role = ?"
+                args.append(role)
+            rows.extend(self._db.execute(sql, args))
+        rows.sort()
+        return [{"run_id": r, "role": ro, "path": p, "sha256": s} for _, r, ro, p, s in rows]
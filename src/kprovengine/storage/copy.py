@@ -0,0 +1,130 @@
+# src/kprovengine/storage/copy.py
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO, Literal
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = ["COPY_CHUNK_SIZE", "CopyStrategy", "copy_file"]
+
+CopyStrategy = Literal["hardlink", "reflink", "copy_file_range", "sendfile", "userspace"]
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)); supported by btrfs, xfs (reflink=1), bcachefs.
+_FICLONE = 0x40049409
+
+# Per-call ceiling for kernel copies and the userspace fallback buffer.
+COPY_CHUNK_SIZE = 1 << 20
+
+# errno values meaning "this strategy is not available here", not "the copy failed".
+_UNSUPPORTED = frozenset(
+    {
+        errno.EXDEV,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        errno.EPERM,
+        errno.EBADF,
+    }
+)
+
+
+def copy_file(src: str | Path, dst: str | Path, *, allow_link: bool = False) -> CopyStrategy:
+    """
+    Copy src to dst using the cheapest strategy the filesystem supports.
+
+    Order of preference:
+      1) hardlink         (only when allow_link; dst shares src's inode)
+      2) reflink          (copy-on-write clone, no data copied)
+      3) copy_file_range  (kernel-side copy)
+      4) sendfile         (kernel-side copy, Linux)
+      5) userspace        (bounded-buffer read/write loop)
+
+    Hardlinks alias the source, so callers must only allow them when src is
+    owned by the run (e.g. an earlier stage output), never for user inputs.
+
+    An existing dst is replaced. Returns the strategy that was used.
+    """
+    s = Path(src)
+    d = Path(dst)
+    d.unlink(missing_ok=True)
+
+    if allow_link:
+        try:
+            os.link(s, d)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED and e.errno != errno.EMLINK:
+                raise
+
+    with s.open("rb") as fsrc, d.open("wb") as fdst:
+        if _try_reflink(fsrc, fdst):
+            return "reflink"
+        if _try_copy_file_range(fsrc, fdst):
+            return "copy_file_range"
+        if _try_sendfile(fsrc, fdst):
+            return "sendfile"
+        shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+        return "userspace"
+
+
+def _try_reflink(fsrc: BinaryIO, fdst: BinaryIO) -> bool:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError as e:
+        if e.errno in _UNSUPPORTED:
+            return False
+        raise
+    return True
+
+
+def _try_copy_file_range(fsrc: BinaryIO, fdst: BinaryIO) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    return _kernel_copy(os.copy_file_range, fsrc, fdst)
+
+
+def _sendfile(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def _try_sendfile(fsrc: BinaryIO, fdst: BinaryIO) -> bool:
+    # Only Linux allows a regular file as the sendfile destination.
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        return False
+    return _kernel_copy(_sendfile, fsrc, fdst)
+
+
+def _kernel_copy(
+    fn: Callable[[int, int, int], int],
+    fsrc: BinaryIO,
+    fdst: BinaryIO,
+) -> bool:
+    src_fd = fsrc.fileno()
+    dst_fd = fdst.fileno()
+    copied = 0
+    while True:
+        try:
+            n = fn(src_fd, dst_fd, COPY_CHUNK_SIZE)
+        except OSError as e:
+            # Nothing written yet: fall through to the next strategy.
+            if copied == 0 and e.errno in _UNSUPPORTED:
+                return False
+            raise
+        if n == 0:
+            # Some filesystems (procfs, FUSE) report 0 instead of an error, and
+            # their st_size cannot tell an empty source apart, so a first-call 0
+            # falls through; an empty file costs the fallbacks one read.
+            return copied > 0
+        copied += n
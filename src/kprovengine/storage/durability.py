@@ -0,0 +1,120 @@
+# src/kprovengine/storage/durability.py
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+from kprovengine.types import DurabilityMode
+
+__all__ = ["DURABILITY_MODES", "BundleWriter", "fsync_dir", "fsync_file"]
+
+DURABILITY_MODES: tuple[DurabilityMode, ...] = ("fast", "durable", "paranoid")
+
+
+def fsync_file(path: Path, *, data_only: bool = False) -> None:
+    """fsync path; data_only uses fdatasync where the platform has it (not macOS)."""
+    sync = os.fdatasync if data_only and hasattr(os, "fdatasync") else os.fsync
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        sync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist directory entries (creates, renames) under path."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # some filesystems / platforms cannot fsync a directory
+    finally:
+        os.close(fd)
+
+
+class BundleWriter:
+    """
+    Publishes a group of files into one directory under a durability mode.
+
+    Callers write each file to target(final) and then call commit(), which
+    publishes them in the order they were registered (leaving a `with`
+    block on an exception discards them instead):
+
+      fast      written in place; no fsync (page cache only)
+      durable   written to temporaries, then one grouped pass: fdatasync
+                every file, rename all but the last into place, fsync the
+                directory, then rename the last and fsync the directory again
+      paranoid  as durable, but full fsync of each file, a directory fsync
+                after every rename, and the parent directory and any extra
+                paths passed to commit() synced as well
+
+    In the durable modes a crash leaves each file either absent or complete,
+    never torn. The last registered file is renamed only after the other
+    renames have been synced, so registering the completion marker (e.g.
+    run_summary.json) last means its presence implies the rest of the
+    bundle is on disk.
+    """
+
+    def __init__(self, directory: Path, mode: DurabilityMode = "fast") -> None:
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"unknown durability mode: {mode!r}")
+        self.directory = directory
+        self.mode = mode
+        self._pending: list[tuple[Path, Path]] = []  # (temporary, final)
+
+    def __enter__(self) -> BundleWriter:
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    def target(self, final: Path) -> Path:
+        """The path to write final's content to (final itself in fast mode)."""
+        if self.mode == "fast":
+            return final
+        if final.parent != self.directory:
+            raise ValueError(f"{final} is not in {self.directory}")
+        tmp = final.with_name(f".{final.name}.tmp-{os.getpid()}")
+        self._pending.append((tmp, final))
+        return tmp
+
+    def commit(self, also_sync: Iterable[Path] = ()) -> None:
+        """
+        Make every registered file durable and visible under its final name.
+        also_sync (paranoid only) lists further files, e.g. the outputs the
+        manifest describes, to fsync along with their directories.
+        """
+        pending, self._pending = self._pending, []
+        if self.mode == "fast":
+            return
+        if not pending:
+            return
+        paranoid = self.mode == "paranoid"
+        for tmp, _ in pending:
+            fsync_file(tmp, data_only=not paranoid)
+        *rest, (last_tmp, last) = pending
+        for tmp, final in rest:
+            os.replace(tmp, final)
+            if paranoid:
+                fsync_dir(self.directory)
+        if rest and not paranoid:
+            # Rename order is not kept on disk without a barrier before the marker.
+            fsync_dir(self.directory)
+        os.replace(last_tmp, last)
+        fsync_dir(self.directory)
+        if not paranoid:
+            return
+        dirs = {self.directory.parent}
+        for p in also_sync:
+            fsync_file(p)
+            dirs.add(p.parent)
+        for d in sorted(dirs):
+            fsync_dir(d)
+
+    def abort(self) -> None:
+        """Remove temporaries that were not committed."""
+        pending, self._pending = self._pending, []
+        for tmp, _ in pending:
+            tmp.unlink(missing_ok=True)
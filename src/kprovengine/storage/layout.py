@@ -28,6 +28,14 @@ class RunLayout:
     def manifest_path(self) -> Path:
         return self.run_dir / "manifest.json"
 
+    @property
+    def manifest_index_path(self) -> Path:
+        return self.run_dir / "manifest.idx"
+
+    @property
+    def manifest_stat_path(self) -> Path:
+        return self.run_dir / "manifest.stat.json"
+
     @property
     def provenance_path(self) -> Path:
         return self.run_dir / "provenance.json"
@@ -52,6 +60,19 @@ class RunLayout:
     def sbom_path(self) -> Path:
         return self.run_dir / "sbom.json"
 
+    @property
+    def summary_path(self) -> Path:
+        return self.run_dir / "run_summary.json"
+
+    @property
+    def catalog_path(self) -> Path:
+        """Run catalog shared by every run under base_dir (storage.catalog)."""
+        return self.base_dir / "catalog.sqlite"
+
+    @property
+    def profile_dir(self) -> Path:
+        return self.run_dir / "profile"
+
     def ensure_run_dir(self) -> Path:
         self.run_dir.mkdir(parents=True, exist_ok=True)
         return self.run_dir
@@ -0,0 +1,81 @@
+# src/kprovengine/storage/lineage.py
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .catalog import RunCatalog
+
+__all__ = ["LineageStep", "walk_lineage"]
+
+Direction = Literal["upstream", "downstream"]
+
+
+@dataclass(frozen=True)
+class LineageStep:
+    """
+    One run reached by walk_lineage().
+
+    Downstream, `via` are the digests the run consumed and `next` the ones
+    it produced; upstream it is the other way round. depth 1 runs touch the
+    starting digest directly.
+    """
+
+    run_id: str
+    depth: int
+    via: tuple[str, ...]
+    next: tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "depth": self.depth,
+            "via": list(self.via),
+            "next": list(self.next),
+        }
+
+
+def walk_lineage(
+    catalog: RunCatalog,
+    sha256: str,
+    *,
+    direction: Direction = "downstream",
+    max_depth: int | None = None,
+) -> list[LineageStep]:
+    """
+    Breadth-first walk over the catalog's hash -> run index.
+
+    downstream: runs that consumed sha256, then runs that consumed their
+    outputs, and so on; upstream: runs that produced it, then the runs that
+    produced their inputs. Lineage is recorded per run, so every output of
+    a run is taken to derive from all of its inputs. Each run and digest is
+    visited once; steps come out by depth, then run start time.
+    """
+    if direction not in ("upstream", "downstream"):
+        raise ValueError(f"direction must be 'upstream' or 'downstream', got {direction!r}")
+    if max_depth is not None and max_depth < 0:
+        raise ValueError(f"max_depth must be >= 0, got {max_depth}")
+    enter, leave = ("input", "output") if direction == "downstream" else ("output", "input")
+
+    seen_digests = {sha256.lower()}
+    seen_runs: set[str] = set()
+    frontier = [sha256.lower()]
+    steps: list[LineageStep] = []
+    depth = 0
+    while frontier and (max_depth is None or depth < max_depth):
+        depth += 1
+        via: dict[str, list[str]] = defaultdict(list)
+        for row in catalog.lookup(frontier, role=enter):
+            if row["run_id"] not in seen_runs:
+                via[row["run_id"]].append(row["sha256"])
+        frontier = []
+        for run_id, digests in via.items():  # lookup() order: oldest run first
+            seen_runs.add(run_id)
+            produced = sorted({f["sha256"] for f in catalog.files(run_id) if f["role"] == leave})
+            steps.append(LineageStep(run_id, depth, tuple(sorted(set(digests))), tuple(produced)))
+            for d in produced:
+                if d not in seen_digests:
+                    seen_digests.add(d)
+                    frontier.append(d)
+    return steps
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 EvidenceMode = Literal["DISABLED", "ENABLED"]
 HumanReviewStatus = Literal["PENDING", "APPROVED", "REJECTED"]
+ManifestMode = Literal["flat", "merkle"]
+IntermediatesMode = Literal["persist", "scratch"]
+DurabilityMode = Literal["fast", "durable", "paranoid"]
 
 
 @dataclass(frozen=True)
@@ -15,6 +18,21 @@ class RunInputs:
     Contract for a pipeline run.
 
     V1: 'sources' are accepted and recorded; no extraction guarantees are claimed.
+    'jobs' is the number of sources processed concurrently (1 = serial).
+    'cache_dir' enables the content-addressed stage cache (pipeline.cache).
+    'object_store' deduplicates run files into a shared storage.cas store.
+    'hash_algorithms' are the manifest digests (sha256 always; see KProvConfig.hash_algo).
+    'manifest_mode' "merkle" sorts manifest entries into a Merkle tree whose root
+    is recorded in run_summary.json (manifest.merkle).
+    'manifest_index' also writes the binary lookup sidecar manifest.idx (manifest.index).
+    'hash_cache' is an opt-in manifest.hash_cache.HashCache database (CLI: --hash-cache).
+    'intermediates' "scratch" writes stage intermediates under 'scratch_dir' (default:
+    the system temp dir; point it at tmpfs to keep them in memory) and keeps only those
+    of failed sources, in stages/; "persist" keeps every intermediate in stages/.
+    'scratch_dir' lives here rather than on KProvConfig.work_dir because run_pipeline
+    is never handed a KProvConfig; a scratch default would have to sit outside --out.
+    'durability' is how the evidence bundle is committed (storage.durability.BundleWriter).
+    'profile' writes cProfile/tracemalloc reports per stage under profile/ (forces jobs=1).
     """
 
     sources: list[Path]
@@ -22,6 +40,17 @@ class RunInputs:
     run_id: str | None = None
     evidence: EvidenceMode = "ENABLED"
     review_status: HumanReviewStatus = "PENDING"
+    jobs: int = 1
+    cache_dir: Path | None = None
+    object_store: Path | None = None
+    profile: bool = False
+    hash_algorithms: tuple[str, ...] = ("sha256",)
+    manifest_mode: ManifestMode = "flat"
+    hash_cache: Path | None = None
+    manifest_index: bool = False
+    intermediates: IntermediatesMode = "persist"
+    scratch_dir: Path | None = None
+    durability: DurabilityMode = "fast"
 
 
 @dataclass(frozen=True)
@@ -31,6 +60,8 @@ class RunResult:
 
     V1 scaffold: outputs are produced by the pipeline; semantics are intentionally conservative.
     Timestamps are UTC-aware.
+    'summary' is the run_summary.json document (nested JSON values).
+    'failures' lists sources that did not complete ({"source", "stage", "error"}).
     """
 
     run_id: str
@@ -39,4 +70,5 @@ class RunResult:
     run_dir: Path
     outputs: list[Path]
     evidence_dir: Path | None
-    summary: dict[str, str]
+    summary: dict[str, Any]
+    failures: list[dict[str, str]] = field(default_factory=list)
@@ -0,0 +1,130 @@
+# tests/unit/test_bench.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kprovengine.bench import (
+    BENCH_SCHEMA,
+    HASH_IMPLS,
+    BenchConfig,
+    bench_hashing,
+    compare_results,
+    generate_corpus,
+    load_results,
+    run_bench,
+)
+from kprovengine.cli import EX_DATAERR, EX_OK, EX_USAGE, main
+
+
+def _results(**medians: float) -> dict:
+    return {
+        "schema": BENCH_SCHEMA,
+        "results": {k.replace("__", "/"): {"seconds_median": v} for k, v in medians.items()},
+    }
+
+
+def test_generate_corpus_is_deterministic_and_reused(tmp_path: Path) -> None:
+    a = generate_corpus("mixed", tmp_path / "a", scale=0.01, seed=7)
+    b = generate_corpus("mixed", tmp_path / "b", scale=0.01, seed=7)
+    assert [p.name for p in a] == [p.name for p in b]
+    assert all(x.read_bytes() == y.read_bytes() for x, y in zip(a, b, strict=True))
+    assert len(a) == 5 + 50 + 2  # tiny scales by count, medium/large by size
+
+    mtime = a[0].stat().st_mtime_ns
+    assert generate_corpus("mixed", tmp_path / "a", scale=0.01, seed=7) == a
+    assert a[0].stat().st_mtime_ns == mtime
+
+    with pytest.raises(ValueError, match="unknown corpus"):
+        generate_corpus("nope", tmp_path)
+
+
+def test_run_bench_times_every_operation(tmp_path: Path) -> None:
+    cfg = BenchConfig(
+        corpora=("tiny", "huge"), jobs=(1, 2), repeat=1, scale=0.001, hashing=False
+    )
+    res = run_bench(cfg, tmp_path)
+
+    assert res["schema"] == BENCH_SCHEMA
+    assert set(res["results"]) == {
+        f"{c}/{op}"
+        for c in ("tiny", "huge")
+        for op in (
+            "run_pipeline/jobs=1",
+            "run_pipeline/jobs=2",
+            "run_pipeline/durability=fast",
+            "run_pipeline/durability=durable",
+            "run_pipeline/durability=paranoid",
+            "build_manifest/jobs=1",
+            "build_manifest/jobs=2",
+            "write_report",
+        )
+    }
+    tiny = res["results"]["tiny/run_pipeline/jobs=1"]
+    assert tiny["files"] == 2
+    assert tiny["bytes"] == 2048
+    assert tiny["seconds_median"] > 0
+    assert not (tmp_path / "scratch").exists()
+
+
+def test_compare_results_thresholds() -> None:
+    base = _results(tiny__run_pipeline=1.0, tiny__write_report=1.0, huge__build_manifest=0.001)
+    cur = _results(tiny__run_pipeline=1.2, tiny__write_report=1.2, huge__build_manifest=0.003)
+
+    regs = compare_results(base, cur, threshold=0.1, thresholds={"write_report": 0.5})
+    # write_report is within its override; the 2 ms delta is below the noise floor.
+    assert [r.key for r in regs] == ["tiny/run_pipeline"]
+    assert regs[0].change == pytest.approx(0.2)
+
+    assert compare_results(base, cur, threshold=0.25) == []
+    assert compare_results(base, cur, thresholds={"tiny/run_pipeline": 0.3}) != []
+
+
+def test_cli_bench_save_and_compare(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    saved = tmp_path / "base.json"
+    rc = main(
+        [
+            "bench",
+            "--corpus", "tiny",
+            "--jobs", "1",
+            "--repeat", "1",
+            "--scale", "0.001",
+            "--no-hashing",
+            "--work-dir", str(tmp_path / "work"),
+            "--save", str(saved),
+        ]
+    )
+    assert rc == EX_OK
+    assert json.loads(capsys.readouterr().out)["config"]["corpora"] == ["tiny"]
+    assert load_results(saved)["results"]
+
+    slow = json.loads(saved.read_text(encoding="utf-8"))
+    fast = json.loads(saved.read_text(encoding="utf-8"))
+    for r in fast["results"].values():
+        r["seconds_median"] = r["seconds_median"] / 10
+    for r in slow["results"].values():
+        r["seconds_median"] = r["seconds_median"] * 10 + 1
+    (tmp_path / "fast.json").write_text(json.dumps(fast), encoding="utf-8")
+    (tmp_path / "slow.json").write_text(json.dumps(slow), encoding="utf-8")
+
+    args = ["bench", "--results", str(tmp_path / "slow.json"), "--baseline"]
+    assert main([*args, str(tmp_path / "fast.json")]) == EX_DATAERR
+    assert "regression: tiny/run_pipeline/jobs=1" in capsys.readouterr().err
+    assert main([*args, str(tmp_path / "slow.json")]) == EX_OK
+
+
+def test_cli_bench_rejects_unknown_corpus(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["bench", "--corpus", "nope"]) == EX_USAGE
+    assert capsys.readouterr().err.startswith("error:")
+
+
+def test_bench_hashing_reports_every_impl(tmp_path: Path) -> None:
+    res = bench_hashing(tmp_path, sizes=(4096, 1 << 20), repeat=1)
+    assert set(res) == {
+        f"hashing/{impl}/{size}" for impl in HASH_IMPLS for size in ("4096B", "1MiB")
+    }
+    assert all(r["mib_per_s"] > 0 for r in res.values())
@@ -0,0 +1,88 @@
+# tests/unit/test_cli_contract_unit.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from pytest import CaptureFixture
+
+from kprovengine.cli import EX_OK, EX_USAGE, main
+
+
+def test_cli_jobs_option(tmp_path: Path, capsys: CaptureFixture[str]) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+
+    code = main([str(src), "--out", str(tmp_path / "runs"), "--jobs", "4"])
+    assert code == EX_OK
+    payload = json.loads(capsys.readouterr().out)
+    assert len(payload["outputs"]) == 1
+
+
+def test_cli_rejects_non_positive_jobs(tmp_path: Path, capsys: CaptureFixture[str]) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+
+    assert main([str(src), "--out", str(tmp_path / "runs"), "--jobs", "0"]) == EX_USAGE
+    assert capsys.readouterr().err.startswith("error:")
+
+
+def test_cli_batch_mode_dirs_globs_and_filelist(
+    tmp_path: Path, capsys: CaptureFixture[str]
+) -> None:
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    (corpus / "skip").mkdir()
+    (corpus / "a.txt").write_text("a", encoding="utf-8")
+    (corpus / "b.log").write_text("b", encoding="utf-8")
+    (corpus / "sub" / "c.txt").write_text("c", encoding="utf-8")
+    (corpus / "skip" / "d.txt").write_text("d", encoding="utf-8")
+    extra = tmp_path / "extra.txt"
+    extra.write_text("e", encoding="utf-8")
+    filelist = tmp_path / "list.txt"
+    filelist.write_text(f"# comment\n\n{extra}\n{corpus / 'a.txt'}\n", encoding="utf-8")
+
+    code = main(
+        [
+            str(corpus),
+            f"@{filelist}",
+            "--include",
+            "*.txt",
+            "--exclude",
+            "skip",
+            "--out",
+            str(tmp_path / "runs"),
+        ]
+    )
+    assert code == EX_OK
+    payload = json.loads(capsys.readouterr().out)
+    summary = json.loads(
+        (Path(payload["run_dir"]) / "run_summary.json").read_text(encoding="utf-8")
+    )
+    assert summary["sources"] == [
+        str((corpus / "a.txt").resolve()),
+        str((corpus / "sub" / "c.txt").resolve()),
+        str(extra.resolve()),
+    ]
+
+
+def test_cli_empty_directory_is_usage_error(tmp_path: Path, capsys: CaptureFixture[str]) -> None:
+    empty = tmp_path / "empty"
+    empty.mkdir()
+
+    assert main([str(empty), "--out", str(tmp_path / "runs")]) == EX_USAGE
+    assert "no source files found" in capsys.readouterr().err
+
+
+def test_cli_hash_algo(tmp_path: Path, capsys: CaptureFixture[str]) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+
+    assert main([str(src), "--out", str(tmp_path / "runs"), "--hash-algo", "nope"]) == EX_USAGE
+    assert "unsupported hash algorithm" in capsys.readouterr().err
+
+    code = main([str(src), "--out", str(tmp_path / "runs"), "--hash-algo", "sha256,blake2b"])
+    assert code == EX_OK
+    run_dir = Path(json.loads(capsys.readouterr().out)["run_dir"])
+    manifest = json.loads((run_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert set(manifest["manifest"][0]["digests"]) == {"sha256", "blake2b"}
@@ -66,3 +66,11 @@ def test_provenance_record_from_paths(tmp_path: Path) -> None:
     assert str(outputs[0]) in pr.outputs
     assert isinstance(pr.timestamp, str)
     assert pr.timestamp.endswith("Z")
+
+
+def test_provenance_record_input_hashes(tmp_path: Path) -> None:
+    inputs = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    pr = ProvenanceRecord.from_paths("run0", inputs, [], ["a" * 64, None])
+
+    assert pr.input_sha256 == {str(inputs[0]): "a" * 64}
+    assert pr.to_dict()["input_sha256"] == {str(inputs[0]): "a" * 64}
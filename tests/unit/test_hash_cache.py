@@ -0,0 +1,113 @@
+# tests/unit/test_hash_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from kprovengine.manifest import hash_cache as hash_cache_mod
+from kprovengine.manifest.hash_cache import HashCache
+from kprovengine.manifest.manifest import build_manifest
+from kprovengine.reporting import build_report_archive
+
+_OLD_NS = 1_000_000_000 * 1_000_000_000  # 2001-09-09: well outside the racy window
+
+
+def _file(tmp_path: Path, name: str, data: bytes) -> Path:
+    p = tmp_path / name
+    p.write_bytes(data)
+    os.utime(p, ns=(_OLD_NS, _OLD_NS))
+    return p
+
+
+def _count_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    reads: list[Path] = []
+    real = hash_cache_mod.hash_file
+
+    def _spy(p, algorithms, **kw):  # type: ignore[no-untyped-def]
+        reads.append(Path(p))
+        return real(p, algorithms, **kw)
+
+    monkeypatch.setattr(hash_cache_mod, "hash_file", _spy)
+    return reads
+
+
+def test_hit_miss_and_invalidation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    p = _file(tmp_path, "a.bin", b"alpha")
+    reads = _count_reads(monkeypatch)
+    db = tmp_path / "work" / "hash_cache.sqlite"
+
+    with HashCache(db) as cache:
+        assert cache.hash_file(p)["sha256"] == hashlib.sha256(b"alpha").hexdigest()
+        assert cache.hash_file(p)["sha256"] == hashlib.sha256(b"alpha").hexdigest()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    # Persistent across instances.
+    with HashCache(db) as cache:
+        cache.hash_file(p)
+        assert cache.hits == 1
+        # A new algorithm is a miss: one read computes both digests.
+        both = cache.hash_file(p, ["blake2b"])
+        assert both["blake2b"] == hashlib.blake2b(b"alpha").hexdigest()
+    assert len(reads) == 2
+
+    # Same size, new mtime: the stat key changes, so the file is rehashed.
+    p.write_bytes(b"omega")
+    os.utime(p, ns=(_OLD_NS + 1, _OLD_NS + 1))
+    with HashCache(db) as cache:
+        assert cache.hash_file(p)["sha256"] == hashlib.sha256(b"omega").hexdigest()
+    assert len(reads) == 3
+
+
+def test_recently_modified_files_are_not_cached(tmp_path: Path) -> None:
+    p = tmp_path / "fresh.bin"
+    p.write_bytes(b"fresh")
+    with HashCache(tmp_path / "c.sqlite") as cache:
+        cache.hash_file(p)
+        assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    files = [_file(tmp_path, f"f{i}.bin", bytes([i]) * 10) for i in range(5)]
+    with HashCache(tmp_path / "c.sqlite", max_entries=3) as cache:
+        for f in files[:3]:
+            cache.hash_file(f)
+        cache.hash_file(files[0])  # refresh f0
+        cache.hash_file(files[3])
+        cache.hash_file(files[4])
+        cache.evict()
+        assert len(cache) == 3
+        before = cache.misses
+        cache.hash_file(files[0])
+        assert cache.misses == before  # most recently used survived
+        cache.hash_file(files[1])
+        assert cache.misses == before + 1  # least recently used was evicted
+
+
+def test_manifest_and_report_share_the_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    files = [_file(tmp_path, f"doc{i}.txt", f"doc {i}".encode()) for i in range(3)]
+    reads = _count_reads(monkeypatch)
+    cache_path = tmp_path / "work" / "hash_cache.sqlite"
+
+    with HashCache(cache_path) as cache:
+        m = build_manifest(files, hash_cache=cache, jobs=2)
+    assert len(reads) == 3
+
+    report_manifest = tmp_path / "report.json"
+    report_manifest.write_text(
+        '{"artifacts": ['
+        + ",".join(f'{{"id": "a{i}", "path": "{f}"}}' for i, f in enumerate(files))
+        + "]}",
+        encoding="utf-8",
+    )
+    with HashCache(cache_path) as cache:
+        archive = build_report_archive(report_manifest, hash_cache=cache)
+        assert cache.hits == 3
+    assert len(reads) == 3
+    assert [a["sha256"] for a in archive["artifacts"]] == [
+        e["sha256"] for e in m.to_dict()["manifest"]
+    ]
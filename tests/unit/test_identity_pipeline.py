@@ -1,8 +1,13 @@
 # tests/unit/test_identity_pipeline.py
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
 
+import pytest
+
+from kprovengine.manifest.hashing import sha256_bytes
 from kprovengine.pipeline.run import run_pipeline
 from kprovengine.types import RunInputs
 
@@ -41,3 +46,37 @@ def test_identity_pipeline_end_to_end(tmp_path: Path) -> None:
     # Evidence dir is a mode flag; contents are incremental in V1.
     assert res.evidence_dir is not None
     assert res.evidence_dir.exists()
+
+
+def test_identity_pipeline_records_teed_hashes(tmp_path: Path) -> None:
+    src = tmp_path / "input.txt"
+    src.write_bytes(b"payload")
+
+    res = run_pipeline(RunInputs(sources=[src], output_dir=tmp_path / "runs"))
+
+    expected = sha256_bytes(b"payload")
+    prov = json.loads((res.run_dir / "provenance.json").read_text(encoding="utf-8"))
+    assert prov["input_sha256"] == {str(src): expected}
+    manifest = json.loads((res.run_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert [e["sha256"] for e in manifest["manifest"]] == [expected]
+
+
+def test_identity_pipeline_extra_digests_from_single_pass(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src = tmp_path / "input.txt"
+    src.write_bytes(b"payload")
+
+    def _no_reread(*args: object, **kwargs: object) -> None:
+        raise AssertionError("manifest re-read an output the tee already hashed")
+
+    monkeypatch.setattr("kprovengine.manifest.manifest.hash_file", _no_reread)
+    res = run_pipeline(
+        RunInputs(sources=[src], output_dir=tmp_path / "runs", hash_algorithms=("blake2b",))
+    )
+
+    manifest = json.loads((res.run_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["manifest"][0]["digests"] == {
+        "sha256": sha256_bytes(b"payload"),
+        "blake2b": hashlib.blake2b(b"payload").hexdigest(),
+    }
@@ -1,9 +1,20 @@
 # tests/unit/test_manifest.py
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from kprovengine.manifest.hashing import sha256_bytes
+import pytest
+
+from kprovengine.config import KProvConfig
+from kprovengine.evidence.provenance import ProvenanceRecord
+from kprovengine.manifest.hashing import (
+    hash_file,
+    normalize_algorithms,
+    sha256_bytes,
+    sha256_file,
+)
 from kprovengine.manifest.manifest import build_manifest
 
 
@@ -32,3 +43,134 @@ def test_build_manifest_multiple(tmp_path: Path) -> None:
     actual = {e["path"]: e["sha256"] for e in m.to_dict()["manifest"]}
 
     assert actual == expected_hashes
+
+
+def test_build_manifest_uses_known_digests_without_reading(tmp_path: Path) -> None:
+    missing = tmp_path / "not-on-disk.txt"
+    m = build_manifest([missing], {str(missing): "a" * 64})
+    assert m.to_dict()["manifest"] == [{"path": str(missing), "sha256": "a" * 64}]
+
+
+def test_sha256_file_mmap_and_file_digest_paths_agree(tmp_path: Path) -> None:
+    p = tmp_path / "blob.bin"
+    data = bytes(range(256)) * 4099
+    p.write_bytes(data)
+    expected = sha256_bytes(data)
+
+    assert sha256_file(p, mmap_threshold=0) == expected
+    assert sha256_file(p, mmap_threshold=len(data) + 1) == expected
+    assert sha256_file(p) == expected
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    # mmap cannot map an empty file; the fallback still hashes it.
+    assert sha256_file(empty, mmap_threshold=0) == sha256_bytes(b"")
+
+
+def test_sha256_bytes_accepts_buffers() -> None:
+    data = b"abc" * 1000
+    assert sha256_bytes(memoryview(data)[3:]) == sha256_bytes(data[3:])
+    assert sha256_bytes(bytearray(data)) == sha256_bytes(data)
+
+
+def test_hash_file_multi_digest_single_pass(tmp_path: Path) -> None:
+    p = tmp_path / "blob.bin"
+    data = bytes(range(256)) * 9000
+    p.write_bytes(data)
+    expected = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "blake2b": hashlib.blake2b(data).hexdigest(),
+    }
+
+    assert hash_file(p, ["BLAKE2B"]) == expected
+    assert hash_file(p, ["blake2b", "sha256"], mmap_threshold=0) == expected
+    assert list(hash_file(p, ["blake2b"])) == ["sha256", "blake2b"]
+
+
+def test_normalize_algorithms_rejects_unknown_and_variable_length() -> None:
+    assert normalize_algorithms([" sha256", "blake2b", "blake2b", ""]) == ("sha256", "blake2b")
+    with pytest.raises(ValueError, match="unsupported"):
+        normalize_algorithms(["nope"])
+    with pytest.raises(ValueError, match="variable-length"):
+        normalize_algorithms(["shake_128"])
+    assert KProvConfig(work_dir=Path("."), hash_algo="sha256,blake2b").hash_algorithms() == (
+        "sha256",
+        "blake2b",
+    )
+
+
+def test_build_manifest_digest_map(tmp_path: Path) -> None:
+    p = tmp_path / "f.txt"
+    p.write_bytes(b"payload")
+    entry = build_manifest([p], algorithms=["blake2b"]).to_dict()["manifest"][0]
+    assert entry["sha256"] == sha256_bytes(b"payload")
+    assert entry["digests"] == {
+        "sha256": entry["sha256"],
+        "blake2b": hashlib.blake2b(b"payload").hexdigest(),
+    }
+
+    # Fully known digests are used as-is; a missing algorithm triggers one read.
+    missing = tmp_path / "not-on-disk.txt"
+    known = {str(missing): {"sha256": "a" * 64, "blake2b": "b" * 128}}
+    entry = build_manifest([missing], known, algorithms=["blake2b"]).to_dict()["manifest"][0]
+    assert entry["digests"]["blake2b"] == "b" * 128
+    with pytest.raises(FileNotFoundError):
+        build_manifest([missing], {str(missing): "a" * 64}, algorithms=["blake2b"])
+
+
+def test_build_manifest_parallel_is_deterministic(tmp_path: Path) -> None:
+    files: list[Path] = []
+    for i, size in enumerate([10, 300_000, 5, 1_000_000, 0, 70_000]):
+        f = tmp_path / f"f{i}.bin"
+        f.write_bytes(bytes([i]) * size)
+        files.append(f)
+
+    serial = build_manifest(files).to_dict()
+    assert build_manifest(files, jobs=4).to_dict() == serial
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert build_manifest(files, executor=pool).to_dict() == serial
+    assert [e["path"] for e in serial["manifest"]] == [str(f) for f in files]
+
+
+def test_build_manifest_parallel_schedules_largest_first(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    files: list[Path] = []
+    for i, size in enumerate([1, 500, 20, 9000]):
+        f = tmp_path / f"f{i}.bin"
+        f.write_bytes(b"x" * size)
+        files.append(f)
+
+    submitted: list[str] = []
+
+    class _Recorder(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):  # type: ignore[no-untyped-def]
+            submitted.append(Path(args[0]).name)
+            return super().submit(fn, *args, **kwargs)
+
+    with _Recorder(max_workers=1) as pool:
+        build_manifest(files, executor=pool)
+    assert submitted == ["f3.bin", "f1.bin", "f2.bin", "f0.bin"]
+
+    with pytest.raises(ValueError, match="jobs"):
+        build_manifest(files, jobs=0)
+    with pytest.raises(FileNotFoundError):
+        build_manifest([*files, tmp_path / "gone.bin"], jobs=2)
+
+
+def test_manifest_and_provenance_write_json_match_to_json(tmp_path: Path) -> None:
+    files = []
+    for i in range(300):
+        f = tmp_path / f"f{i}.txt"
+        f.write_text(f"naïve ☃ {i}\n", encoding="utf-8")
+        files.append(f)
+    for mode in ("flat", "merkle"):
+        m = build_manifest(files, mode=mode, relative_to=tmp_path if mode == "merkle" else None)
+        out = tmp_path / f"manifest.{mode}.json"
+        m.write_json(out)
+        assert out.read_text(encoding="utf-8") == m.to_json()
+
+    prov = ProvenanceRecord.from_paths("run-1", files, files, ["ab" * 32] * len(files))
+    out = tmp_path / "provenance.json"
+    prov.write_json(out)
+    assert out.read_text(encoding="utf-8") == prov.to_json()
@@ -0,0 +1,147 @@
+# tests/unit/test_manifest_index.py
+from __future__ import annotations
+
+import json
+import mmap
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_OK, main
+from kprovengine.manifest import index as index_mod
+from kprovengine.manifest.index import INDEX_MAGIC, ManifestIndex, write_manifest_index
+from kprovengine.manifest.manifest import build_manifest
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.types import RunInputs
+
+
+def _files(tmp_path: Path, n: int) -> list[Path]:
+    out = []
+    for i in range(n):
+        p = tmp_path / f"f{i:03d}-ü.txt"
+        p.write_text(f"content {i}\n", encoding="utf-8")
+        out.append(p)
+    return out
+
+
+@pytest.mark.parametrize("algorithms", [("sha256",), ("sha256", "blake2b", "sha1")])
+def test_lookup_and_iteration_match_json(tmp_path: Path, algorithms: tuple[str, ...]) -> None:
+    files = _files(tmp_path, 37)
+    manifest = build_manifest(reversed(files), algorithms=algorithms).to_dict()
+    idx_path = tmp_path / "manifest.idx"
+    write_manifest_index(idx_path, manifest)
+    assert idx_path.read_bytes()[:8] == INDEX_MAGIC
+
+    expected = sorted(manifest["manifest"], key=lambda e: e["path"].encode("utf-8"))
+    with ManifestIndex(idx_path) as idx:
+        assert len(idx) == 37
+        assert idx.algorithms[0] == "sha256"
+        assert set(idx.algorithms) == set(algorithms)
+        assert list(idx) == expected
+        for e in manifest["manifest"]:
+            assert idx.get(e["path"]) == e
+            assert e["path"] in idx
+        assert idx.get(str(tmp_path / "absent")) is None
+        assert str(tmp_path / "f000") not in idx
+        with pytest.raises(KeyError):
+            idx.index_of("")
+
+
+def test_empty_manifest_and_bad_input(tmp_path: Path) -> None:
+    p = tmp_path / "empty.idx"
+    write_manifest_index(p, {"manifest": []})
+    with ManifestIndex(p) as idx:
+        assert len(idx) == 0
+        assert list(idx) == []
+        assert idx.get("x") is None
+
+    entry = {"path": "a", "sha256": "00" * 32}
+    with pytest.raises(ValueError, match="duplicate"):
+        write_manifest_index(p, {"manifest": [entry, entry]})
+    mixed = {"path": "b", "sha256": "00" * 32, "digests": {"sha256": "00" * 32, "sha1": "11" * 20}}
+    with pytest.raises(ValueError, match="digests differ"):
+        write_manifest_index(p, {"manifest": [entry, mixed]})
+
+    (tmp_path / "junk.idx").write_bytes(b"not an index at all, clearly not")
+    with pytest.raises(ValueError):
+        ManifestIndex(tmp_path / "junk.idx")
+
+
+def _open_maps(monkeypatch: pytest.MonkeyPatch) -> list[mmap.mmap]:
+    maps: list[mmap.mmap] = []
+    real = mmap.mmap
+
+    def track(*args: object, **kw: object) -> mmap.mmap:
+        m = real(*args, **kw)  # type: ignore[arg-type]
+        maps.append(m)
+        return m
+
+    monkeypatch.setattr(index_mod.mmap, "mmap", track)
+    return maps
+
+
+def test_truncated_or_corrupt_index_raises_value_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    good = tmp_path / "good.idx"
+    m = build_manifest(_files(tmp_path, 5), algorithms=("sha256", "blake2b"))
+    write_manifest_index(good, m.to_dict())
+    data = good.read_bytes()
+    maps = _open_maps(monkeypatch)
+    bad = tmp_path / "bad.idx"
+
+    for n in range(index_mod._HEADER.size, len(data)):
+        bad.write_bytes(data[:n])
+        with pytest.raises(ValueError):
+            ManifestIndex(bad)
+
+    # Each header offset (and the algorithm table) pointed past the end.
+    fields = list(index_mod._HEADER.unpack_from(data))
+    for k in range(4, 8):
+        bad_fields = fields.copy()
+        bad_fields[k] = 1 << 40
+        bad.write_bytes(index_mod._HEADER.pack(*bad_fields) + data[index_mod._HEADER.size :])
+        with pytest.raises(ValueError, match="corrupt"):
+            ManifestIndex(bad)
+    algos_off = fields[4]
+    bad.write_bytes(data[:algos_off] + b"\xff" + data[algos_off + 1 :])
+    with pytest.raises(ValueError, match="corrupt"):
+        ManifestIndex(bad)
+    assert maps and all(mm.closed for mm in maps)
+
+    # A path that is not UTF-8 fails when it is decoded.
+    one = tmp_path / "one.idx"
+    write_manifest_index(one, {"manifest": [{"path": "a", "sha256": "00" * 32}]})
+    raw = one.read_bytes()
+    one.write_bytes(raw[:-1] + b"\xff")
+    with ManifestIndex(one) as idx, pytest.raises(ValueError, match="corrupt"):
+        list(idx)
+
+
+def test_pipeline_writes_index_on_request(tmp_path: Path) -> None:
+    srcs = _files(tmp_path, 3)
+    res = run_pipeline(
+        RunInputs(
+            sources=srcs,
+            output_dir=tmp_path / "runs",
+            manifest_mode="merkle",
+            manifest_index=True,
+        )
+    )
+    assert res.summary["manifest"]["index"] == "manifest.idx"
+    manifest = json.loads((res.run_dir / "manifest.json").read_text(encoding="utf-8"))
+    with ManifestIndex(res.run_dir / "manifest.idx") as idx:
+        assert list(idx) == manifest["manifest"]
+
+    plain = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs"))
+    assert plain.summary["manifest"]["index"] is None
+    assert not (plain.run_dir / "manifest.idx").exists()
+
+
+def test_cli_manifest_index_flag(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = _files(tmp_path, 1)[0]
+    rc = main([str(src), "--out", str(tmp_path / "runs"), "--manifest-index"])
+    assert rc == EX_OK
+    run_dir = Path(json.loads(capsys.readouterr().out)["run_dir"])
+    with ManifestIndex(run_dir / "manifest.idx") as idx:
+        assert len(idx) == 1
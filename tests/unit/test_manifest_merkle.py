@@ -0,0 +1,115 @@
+# tests/unit/test_manifest_merkle.py
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_DATAERR, EX_OK, main
+from kprovengine.manifest.manifest import build_manifest
+from kprovengine.manifest.merkle import MerkleTree, leaf_hash, verify_inclusion
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.types import RunInputs
+
+
+def _node(a: bytes, b: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + a + b).digest()
+
+
+def _mth(leaves: list[bytes]) -> bytes:
+    """RFC 6962 recursive Merkle Tree Hash, as a reference."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return _node(_mth(leaves[:k]), _mth(leaves[k:]))
+
+
+def _entries(n: int) -> list[tuple[str, str]]:
+    return [(f"/out/f{i:03d}", hashlib.sha256(str(i).encode()).hexdigest()) for i in range(n)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 5, 8, 13, 33])
+def test_root_matches_rfc6962_and_proofs_verify(n: int) -> None:
+    entries = _entries(n)
+    tree = MerkleTree(reversed(entries))  # input order does not matter
+    assert tree.root == _mth([leaf_hash(p, s) for p, s in entries]).hex()
+
+    for i, (path, _) in enumerate(entries):
+        proof = tree.proof(path)
+        assert proof.index == i
+        assert len(proof.siblings) <= max(1, n).bit_length()
+        assert verify_inclusion(proof, tree.root)
+
+
+def test_tampered_proofs_fail() -> None:
+    tree = MerkleTree(_entries(7))
+    proof = tree.proof("/out/f003")
+    other_root = MerkleTree(_entries(8)).root
+
+    assert not verify_inclusion(proof, other_root)
+    assert not verify_inclusion(replace(proof, sha256="0" * 64), tree.root)
+    assert not verify_inclusion(replace(proof, index=4), tree.root)
+    assert not verify_inclusion(replace(proof, siblings=proof.siblings[:-1]), tree.root)
+    assert not verify_inclusion(replace(proof, siblings=("zz",)), tree.root)
+    with pytest.raises(KeyError):
+        tree.proof("/out/missing")
+    with pytest.raises(ValueError, match="duplicate"):
+        MerkleTree([("/a", "0" * 64), ("/a", "1" * 64)])
+
+
+def test_build_manifest_merkle_mode(tmp_path: Path) -> None:
+    files = []
+    for name in ("b.txt", "a.txt", "c.txt"):
+        f = tmp_path / name
+        f.write_text(name, encoding="utf-8")
+        files.append(f)
+
+    flat = build_manifest(files).to_dict()
+    assert "merkle" not in flat
+
+    m = build_manifest(files, mode="merkle").to_dict()
+    assert [Path(e["path"]).name for e in m["manifest"]] == ["a.txt", "b.txt", "c.txt"]
+    assert m["merkle"]["root"] == MerkleTree.from_manifest(flat).root
+    assert m["merkle"]["size"] == 3
+
+
+def test_pipeline_records_root_and_cli_proof_roundtrip(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    srcs = []
+    for i in range(5):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(f"doc {i}", encoding="utf-8")
+        srcs.append(p)
+    res = run_pipeline(
+        RunInputs(sources=srcs, output_dir=tmp_path / "runs", manifest_mode="merkle")
+    )
+    summary = json.loads((res.run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    root = summary["manifest"]["merkle_root"]
+    assert summary["manifest"] == {"mode": "merkle", "entries": 5, "merkle_root": root, "index": None}
+    manifest = json.loads((res.run_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["manifest"][0]["path"] == "outputs/in0.txt"
+
+    # Same content, another run: same root.
+    again = run_pipeline(
+        RunInputs(sources=srcs, output_dir=tmp_path / "runs", manifest_mode="merkle")
+    )
+    assert again.summary["manifest"]["merkle_root"] == root
+
+    target = str(res.outputs[2])
+    assert main(["proof", "prove", str(res.run_dir), target]) == EX_OK
+    proof_file = tmp_path / "proof.json"
+    proof_file.write_text(capsys.readouterr().out, encoding="utf-8")
+
+    assert main(["proof", "check", str(proof_file), "--run-dir", str(res.run_dir)]) == EX_OK
+    assert json.loads(capsys.readouterr().out)["valid"] is True
+
+    assert main(["proof", "check", str(proof_file), "--root", "00" * 32]) == EX_DATAERR
+    assert json.loads(capsys.readouterr().out)["valid"] is False
@@ -0,0 +1,125 @@
+# tests/unit/test_manifest_verify.py
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_DATAERR, EX_OK, main
+from kprovengine.manifest import verify as verify_mod
+from kprovengine.manifest.verify import verify_run
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.types import RunInputs
+
+
+def _run(tmp_path: Path, n: int = 4, **kw: object):  # type: ignore[no-untyped-def]
+    srcs = []
+    for i in range(n):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(f"document {i}\n", encoding="utf-8")
+        srcs.append(p)
+    return run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs", **kw))  # type: ignore[arg-type]
+
+
+def _count_rehashes(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    seen: list[Path] = []
+    real = verify_mod.hash_file
+
+    def _spy(p, algorithms):  # type: ignore[no-untyped-def]
+        seen.append(Path(p))
+        return real(p, algorithms)
+
+    monkeypatch.setattr(verify_mod, "hash_file", _spy)
+    return seen
+
+
+def test_fast_path_skips_unchanged_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    res = _run(tmp_path)
+    assert (res.run_dir / "manifest.stat.json").is_file()
+    seen = _count_rehashes(monkeypatch)
+
+    report = verify_run(res.run_dir)
+    assert report.ok
+    assert (report.entries, report.stat_matched, report.rehashed) == (4, 4, 0)
+    assert seen == []
+
+    strict = verify_run(res.run_dir, strict=True, jobs=3)
+    assert strict.ok
+    assert strict.rehashed == 4
+    assert len(seen) == 4
+
+    sampled = verify_run(res.run_dir, sample=1.0)
+    assert sampled.rehashed == 4
+
+
+def test_detects_changed_and_missing_files(tmp_path: Path) -> None:
+    res = _run(tmp_path)
+    out = sorted(res.outputs)
+    # Same size, new content, original mtime: only a rehash can catch it.
+    st = out[0].stat()
+    out[0].unlink()
+    out[0].write_text("document X\n", encoding="utf-8")
+    os.utime(out[0], ns=(st.st_atime_ns, st.st_mtime_ns))
+    out[1].write_text("longer content than before\n", encoding="utf-8")
+    out[2].unlink()
+
+    report = verify_run(res.run_dir, jobs=2)
+    assert not report.ok
+    reasons = {Path(m["path"]).name: m["reason"] for m in report.mismatches}
+    assert reasons == {out[0].name: "digest", out[1].name: "size", out[2].name: "missing"}
+    digest = next(m for m in report.mismatches if m["reason"] == "digest")
+    assert digest["algorithm"] == "sha256"
+    assert digest["expected"] != digest["actual"]
+
+
+def test_merkle_manifest_paths_and_root(tmp_path: Path) -> None:
+    res = _run(tmp_path, manifest_mode="merkle")
+    assert verify_run(res.run_dir, strict=True).ok
+
+    manifest_path = res.run_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    committed = manifest["merkle"]["root"]
+    manifest["manifest"].pop()
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    report = verify_run(res.run_dir)
+    assert [(Path(m["path"]).name, m["reason"]) for m in report.mismatches] == [
+        ("manifest.json", "merkle_root"),
+        ("run_summary.json", "merkle_root"),
+    ]
+
+    # Rewriting the manifest's own root to match does not hide the edit.
+    manifest["merkle"]["root"] = report.mismatches[0]["actual"]
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    report = verify_run(res.run_dir)
+    assert report.mismatches == [
+        {
+            "path": str(res.run_dir / "run_summary.json"),
+            "reason": "merkle_root",
+            "expected": committed,
+            "actual": manifest["merkle"]["root"],
+        }
+    ]
+
+
+def test_cli_verify(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    res = _run(tmp_path, n=2)
+    assert main(["verify", str(res.run_dir), "--strict", "--jobs", "2"]) == EX_OK
+    assert json.loads(capsys.readouterr().out)["ok"] is True
+
+    res.outputs[0].write_text("tampered", encoding="utf-8")
+    assert main(["verify", str(res.run_dir)]) == EX_DATAERR
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["ok"] is False
+    assert payload["mismatches"][0]["path"] == str(res.outputs[0])
+
+
+def test_cli_verify_malformed_manifest(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    res = _run(tmp_path, n=1)
+    manifest_path = res.run_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    del manifest["manifest"][0]["path"]
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    assert main(["verify", str(res.run_dir)]) == EX_DATAERR
+    assert "malformed manifest" in capsys.readouterr().err
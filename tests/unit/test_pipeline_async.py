@@ -0,0 +1,88 @@
+# tests/unit/test_pipeline_async.py
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from kprovengine.adapters.ocr_base import AsyncOCRAdapter, OCRResult
+from kprovengine.pipeline import AsyncPathStage, run_pipeline, run_pipeline_async
+from kprovengine.pipeline.normalize import NORMALIZE
+from kprovengine.types import RunInputs
+
+
+class _UpperOCR(AsyncOCRAdapter):
+    def name(self) -> str:
+        return "upper"
+
+    async def extract(self, image_path: Path) -> OCRResult:
+        await asyncio.sleep(0)
+        return OCRResult(text=image_path.read_text(encoding="utf-8").upper())
+
+
+def _bundle(run_dir: Path) -> dict[str, object]:
+    def load(name: str) -> str:
+        return (run_dir / name).read_text(encoding="utf-8").replace(str(run_dir), "<run>")
+
+    summary = json.loads(load("run_summary.json"))
+    for key in ("started_at", "finished_at", "metrics"):
+        summary.pop(key)
+    return {
+        "summary": summary,
+        "manifest": json.loads(load("manifest.json")),
+        "inputs": json.loads(load("provenance.json"))["input_sha256"],
+    }
+
+
+def _sources(tmp_path: Path) -> list[Path]:
+    srcs = []
+    for i in range(5):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(f"doc {i}", encoding="utf-8")
+        srcs.append(p)
+    return srcs
+
+
+def test_async_run_matches_sync_bundle(tmp_path: Path) -> None:
+    srcs = _sources(tmp_path)
+
+    sync = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "a", run_id="r"))
+    aio = asyncio.run(
+        run_pipeline_async(RunInputs(sources=srcs, output_dir=tmp_path / "b", run_id="r", jobs=3))
+    )
+
+    assert [p.name for p in aio.outputs] == [p.name for p in sync.outputs]
+    assert _bundle(aio.run_dir) == _bundle(sync.run_dir)
+
+
+def test_async_run_awaits_async_adapter_stage(tmp_path: Path) -> None:
+    srcs = _sources(tmp_path)
+    ocr = _UpperOCR()
+
+    async def ocr_stage(src: Path, dst: Path) -> None:
+        dst.write_text((await ocr.extract(src)).text, encoding="utf-8")
+
+    res = asyncio.run(
+        run_pipeline_async(
+            RunInputs(sources=srcs, output_dir=tmp_path / "runs", jobs=2),
+            stages=[NORMALIZE, AsyncPathStage("ocr", ocr_stage)],
+        )
+    )
+
+    assert [p.read_text(encoding="utf-8") for p in res.outputs] == [
+        f"DOC {i}" for i in range(5)
+    ]
+    assert res.summary["copy_strategies"]["ocr"] == {"async": 5}
+
+
+def test_sync_run_rejects_async_stage(tmp_path: Path) -> None:
+    async def noop(src: Path, dst: Path) -> None:
+        return None
+
+    with pytest.raises(ValueError):
+        run_pipeline(
+            RunInputs(sources=_sources(tmp_path), output_dir=tmp_path / "runs"),
+            stages=[AsyncPathStage("noop", noop)],
+        )
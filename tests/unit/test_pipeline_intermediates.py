@@ -0,0 +1,139 @@
+# tests/unit/test_pipeline_intermediates.py
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_OK, main
+from kprovengine.pipeline import run as run_mod
+from kprovengine.pipeline.run import run_pipeline, run_pipeline_async
+from kprovengine.pipeline.stage import PathStageAdapter
+from kprovengine.types import RunInputs
+
+
+def _sources(tmp_path: Path, n: int = 3) -> list[Path]:
+    srcs = []
+    for i in range(n):
+        p = tmp_path / "in" / f"f{i}.txt"
+        p.parent.mkdir(exist_ok=True)
+        p.write_text(f"data-{i}", encoding="utf-8")
+        srcs.append(p)
+    return srcs
+
+
+def _upper(src: Path, dst: Path) -> None:
+    dst.write_bytes(src.read_bytes().upper())
+
+
+def _files(root: Path) -> list[str]:
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+def test_scratch_mode_writes_no_intermediates(tmp_path: Path) -> None:
+    scratch = tmp_path / "scratch"
+    stages = (run_mod.STAGES[0], PathStageAdapter("parse", _upper), *run_mod.STAGES[2:])
+    res = run_pipeline(
+        RunInputs(
+            sources=_sources(tmp_path),
+            output_dir=tmp_path / "runs",
+            intermediates="scratch",
+            scratch_dir=scratch,
+        ),
+        stages=stages,
+    )
+    assert not (res.run_dir / "stages").exists()
+    assert [p.read_text(encoding="utf-8") for p in res.outputs] == ["DATA-0", "DATA-1", "DATA-2"]
+    assert res.summary["intermediates"] == {"mode": "scratch", "kept": []}
+    # The private scratch dir is gone; the configured parent stays.
+    assert list(scratch.iterdir()) == []
+
+
+def test_scratch_mode_keeps_intermediates_of_failed_sources(tmp_path: Path) -> None:
+    def flaky(src: Path, dst: Path) -> None:
+        if src.name == "f1.txt":
+            raise RuntimeError("boom")
+        _upper(src, dst)
+
+    stages = (*run_mod.STAGES[:2], PathStageAdapter("extract", flaky), run_mod.STAGES[3])
+    res = run_pipeline(
+        RunInputs(
+            sources=_sources(tmp_path),
+            output_dir=tmp_path / "runs",
+            intermediates="scratch",
+            scratch_dir=tmp_path / "scratch",
+            jobs=2,
+        ),
+        stages=stages,
+    )
+    assert [p.name for p in res.outputs] == ["f0.txt", "f2.txt"]
+    kept = ["stages/normalized/f1.txt", "stages/parsed/f1.txt"]
+    assert res.summary["intermediates"] == {"mode": "scratch", "kept": kept}
+    assert _files(res.run_dir / "stages") == ["normalized/f1.txt", "parsed/f1.txt"]
+    assert (res.run_dir / kept[1]).read_text(encoding="utf-8") == "data-1"
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+
+def test_persist_mode_is_unchanged(tmp_path: Path) -> None:
+    res = run_pipeline(RunInputs(sources=_sources(tmp_path, 1), output_dir=tmp_path / "runs"))
+    assert _files(res.run_dir / "stages") == [
+        "extracted/f0.txt",
+        "normalized/f0.txt",
+        "parsed/f0.txt",
+    ]
+    assert res.summary["intermediates"] == {"mode": "persist", "kept": []}
+
+
+def test_scratch_is_kept_when_the_run_raises(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broken_commit(plan, outcomes):  # type: ignore[no-untyped-def]
+        raise OSError("disk full")
+
+    monkeypatch.setattr(run_mod, "_commit_run", broken_commit)
+    with pytest.raises(OSError):
+        run_pipeline(
+            RunInputs(
+                sources=_sources(tmp_path, 1),
+                output_dir=tmp_path / "runs",
+                intermediates="scratch",
+                scratch_dir=tmp_path / "scratch",
+            )
+        )
+    (left,) = (tmp_path / "scratch").iterdir()
+    assert "normalized/f0.txt" in _files(left)
+
+
+def test_async_scratch_mode_and_validation(tmp_path: Path) -> None:
+    res = asyncio.run(
+        run_pipeline_async(
+            RunInputs(
+                sources=_sources(tmp_path, 2),
+                output_dir=tmp_path / "runs",
+                intermediates="scratch",
+                scratch_dir=tmp_path / "scratch",
+            )
+        )
+    )
+    assert not (res.run_dir / "stages").exists()
+    assert len(res.outputs) == 2
+    with pytest.raises(ValueError):
+        run_pipeline(
+            RunInputs(
+                sources=_sources(tmp_path, 1),
+                output_dir=tmp_path / "runs",
+                intermediates="memory",  # type: ignore[arg-type]
+            )
+        )
+
+
+def test_cli_intermediates_scratch(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = _sources(tmp_path, 1)[0]
+    out = tmp_path / "runs"
+    argv = [str(src), "--out", str(out), "--intermediates", "scratch"]
+    assert main([*argv, "--scratch-dir", str(tmp_path / "scratch")]) == EX_OK
+    run_dir = Path(json.loads(capsys.readouterr().out)["run_dir"])
+    assert not (run_dir / "stages").exists()
+    assert (run_dir / "outputs" / "f0.txt").is_file()
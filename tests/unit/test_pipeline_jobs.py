@@ -0,0 +1,85 @@
+# tests/unit/test_pipeline_jobs.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kprovengine.pipeline import run as run_mod
+from kprovengine.pipeline.run import plan_output_names, run_pipeline
+from kprovengine.pipeline.stage import PathStageAdapter
+from kprovengine.types import RunInputs
+
+
+def _make_sources(tmp_path: Path, n: int) -> list[Path]:
+    srcs: list[Path] = []
+    for i in range(n):
+        p = tmp_path / "in" / f"f{i:03d}.txt"
+        p.parent.mkdir(exist_ok=True)
+        p.write_text(f"data-{i}", encoding="utf-8")
+        srcs.append(p)
+    return srcs
+
+
+def _stable_summary(run_dir: Path) -> dict[str, object]:
+    summary = json.loads((run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    for key in ("started_at", "finished_at", "metrics", "run_id"):
+        summary.pop(key)
+    summary["outputs"] = [Path(p).name for p in summary["outputs"]]  # type: ignore[union-attr]
+    return summary
+
+
+def test_parallel_run_matches_serial_run(tmp_path: Path) -> None:
+    srcs = _make_sources(tmp_path, 24)
+
+    serial = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "a", run_id="r"))
+    parallel = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "b", run_id="r", jobs=8))
+
+    assert [p.name for p in parallel.outputs] == [p.name for p in serial.outputs]
+    assert _stable_summary(parallel.run_dir) == _stable_summary(serial.run_dir)
+    assert (parallel.run_dir / "manifest.json").read_text(encoding="utf-8").replace(
+        str(tmp_path / "b"), ""
+    ) == (serial.run_dir / "manifest.json").read_text(encoding="utf-8").replace(
+        str(tmp_path / "a"), ""
+    )
+
+
+def test_failing_source_is_isolated(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    srcs = _make_sources(tmp_path, 3)
+
+    def flaky(src: Path, dst: Path) -> None:
+        if src.name == "f001.txt":
+            raise RuntimeError("boom")
+        dst.write_bytes(src.read_bytes())
+
+    stages = (run_mod.STAGES[0], PathStageAdapter("parse", flaky), *run_mod.STAGES[2:])
+    monkeypatch.setattr(run_mod, "STAGES", stages)
+
+    res = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs", jobs=2))
+
+    assert [p.name for p in res.outputs] == ["f000.txt", "f002.txt"]
+    assert res.failures == [
+        {"source": str(srcs[1]), "stage": "parse", "error": "RuntimeError: boom"}
+    ]
+    summary = json.loads((res.run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    assert summary["failures"] == res.failures
+
+
+def test_duplicate_basenames_get_distinct_outputs(tmp_path: Path) -> None:
+    a = tmp_path / "a" / "doc.txt"
+    b = tmp_path / "b" / "doc.txt"
+    for p, text in ((a, "A"), (b, "B")):
+        p.parent.mkdir()
+        p.write_text(text, encoding="utf-8")
+
+    assert plan_output_names([a, b]) == ["doc.txt", "doc~1.txt"]
+
+    res = run_pipeline(RunInputs(sources=[a, b], output_dir=tmp_path / "runs", jobs=2))
+    assert [p.read_text(encoding="utf-8") for p in res.outputs] == ["A", "B"]
+
+
+def test_jobs_must_be_positive(tmp_path: Path) -> None:
+    srcs = _make_sources(tmp_path, 1)
+    with pytest.raises(ValueError):
+        run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs", jobs=0))
@@ -0,0 +1,46 @@
+# tests/unit/test_pipeline_metrics.py
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from kprovengine.pipeline.metrics import METRICS_SCHEMA
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.types import RunInputs
+
+
+def test_run_summary_metrics_block(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    srcs = []
+    for i in range(3):
+        p = tmp_path / f"in{i}.bin"
+        p.write_bytes(b"x" * (1000 * (i + 1)))
+        srcs.append(p)
+
+    with caplog.at_level(logging.INFO, logger="kprovengine.pipeline.run"):
+        res = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs", jobs=2))
+
+    summary = json.loads((res.run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    metrics = summary["metrics"]
+    assert metrics["schema"] == METRICS_SCHEMA
+    assert metrics["files"] == metrics["files_ok"] == 3
+    assert set(metrics["phases"]) == {"stages", "manifest", "evidence"}
+
+    normalize = metrics["stages"]["normalize"]
+    assert normalize["files"] == 3
+    assert normalize["bytes_read"] == normalize["bytes_written"] == 6000
+    # Later identity stages hardlink: no bytes move.
+    assert metrics["stages"]["render"]["bytes_written"] == 0
+
+    assert [f["source"] for f in metrics["per_file"]] == [str(p) for p in srcs]
+    first = metrics["per_file"][0]["stages"]
+    assert set(first) == {"normalize", "parse", "extract", "render"}
+    assert first["normalize"]["bytes_read"] == 1000
+    assert first["normalize"]["wall_s"] >= 0
+
+    logged = caplog.text
+    assert f"run {res.run_id}: files=3 ok=3" in logged
+    assert "stage=normalize files=3" in logged
+    assert "read=6000 written=6000" in logged
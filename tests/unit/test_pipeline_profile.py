@@ -0,0 +1,93 @@
+# tests/unit/test_pipeline_profile.py
+from __future__ import annotations
+
+import asyncio
+import json
+import pstats
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_OK, main
+from kprovengine.pipeline.profiling import PROFILE_SCHEMA, RunProfiler
+from kprovengine.pipeline.run import run_pipeline, run_pipeline_async
+from kprovengine.types import RunInputs
+
+
+def _sources(tmp_path: Path, n: int = 2) -> list[Path]:
+    srcs = []
+    for i in range(n):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(f"doc {i}\n" * 100, encoding="utf-8")
+        srcs.append(p)
+    return srcs
+
+
+def test_profile_writes_per_stage_reports(tmp_path: Path) -> None:
+    res = run_pipeline(
+        RunInputs(sources=_sources(tmp_path), output_dir=tmp_path / "runs", jobs=4, profile=True)
+    )
+
+    profile_dir = res.run_dir / "profile"
+    for name in ("normalize", "parse", "extract", "render", "manifest", "evidence"):
+        stats = pstats.Stats(str(profile_dir / f"{name}.pstats"))
+        assert stats.total_calls > 0  # type: ignore[attr-defined]
+
+    mem = json.loads((profile_dir / "tracemalloc.json").read_text(encoding="utf-8"))
+    assert mem["schema"] == PROFILE_SCHEMA
+    normalize = mem["sections"]["normalize"]
+    assert normalize["calls"] == 2
+    assert normalize["peak_bytes"] >= 0
+    assert all({"file", "line", "size_bytes", "count"} <= set(t) for t in normalize["top"])
+
+    summary = res.summary["profile"]
+    assert summary["enabled"] is True
+    assert "profile/normalize.pstats" in summary["files"]
+    assert "profile/tracemalloc.json" in summary["files"]
+    assert len(res.outputs) == 2
+    # tracemalloc is only left running if the caller started it.
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_disabled_by_default(tmp_path: Path) -> None:
+    res = run_pipeline(RunInputs(sources=_sources(tmp_path, 1), output_dir=tmp_path / "runs"))
+    assert res.summary["profile"] == {"enabled": False, "files": []}
+    assert not (res.run_dir / "profile").exists()
+
+
+def test_profile_rejected_by_async_pipeline(tmp_path: Path) -> None:
+    inputs = RunInputs(sources=_sources(tmp_path, 1), output_dir=tmp_path / "runs", profile=True)
+    with pytest.raises(ValueError, match="profile"):
+        asyncio.run(run_pipeline_async(inputs))
+
+
+def test_cli_profile_flag(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = _sources(tmp_path, 1)[0]
+    rc = main([str(src), "--out", str(tmp_path / "runs"), "--profile"])
+    assert rc == EX_OK
+    run_dir = Path(json.loads(capsys.readouterr().out)["run_dir"])
+    assert (run_dir / "profile" / "render.pstats").is_file()
+
+
+def test_memory_snapshot_is_taken_only_on_a_new_peak(monkeypatch: pytest.MonkeyPatch) -> None:
+    snapshots = 0
+    real = tracemalloc.take_snapshot
+
+    def counting() -> tracemalloc.Snapshot:
+        nonlocal snapshots
+        snapshots += 1
+        return real()
+
+    monkeypatch.setattr(tracemalloc, "take_snapshot", counting)
+    profiler = RunProfiler()
+    profiler.start()
+    try:
+        for size in (1 << 16, 1 << 10, 1 << 16, 1 << 20):
+            with profiler.section("s"):
+                buf = bytearray(size)
+                del buf
+    finally:
+        profiler.stop()
+    assert profiler._memory["s"]["calls"] == 4
+    assert snapshots == 2  # the first call, then the 1 MiB one
@@ -0,0 +1,81 @@
+# tests/unit/test_pipeline_scheduler.py
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from kprovengine.pipeline.scheduler import run_staged
+
+
+def test_items_advance_independently_across_stages() -> None:
+    events: list[tuple[int, int]] = []
+    lock = threading.Lock()
+
+    def step(i: int, k: int) -> bool:
+        if k == 0 and i == 3:
+            time.sleep(0.2)  # straggler in the first stage
+        with lock:
+            events.append((i, k))
+        return True
+
+    run_staged(4, 3, step, workers=2)
+
+    assert sorted(events) == [(i, k) for i in range(4) for k in range(3)]
+    # Item 0 finished the last stage while item 3 was still in the first one.
+    assert events.index((0, 2)) < events.index((3, 0))
+
+
+def test_bounded_queues_apply_backpressure() -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def step(i: int, k: int) -> bool:
+        nonlocal in_flight, peak
+        if k == 0:
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+        else:
+            release.wait(5)
+            with lock:
+                in_flight -= 1
+        return True
+
+    t = threading.Thread(
+        target=run_staged, args=(50, 2, step), kwargs={"workers": 2, "queue_depth": 3}
+    )
+    t.start()
+    time.sleep(0.2)
+    stalled_peak = peak
+    release.set()
+    t.join(5)
+
+    assert not t.is_alive()
+    # Two blocked consumers + three queued + two producers waiting to enqueue.
+    assert stalled_peak <= 2 + 3 + 2
+    assert in_flight == 0
+
+
+def test_dropped_items_skip_later_stages() -> None:
+    seen: list[tuple[int, int]] = []
+
+    def step(i: int, k: int) -> bool:
+        seen.append((i, k))
+        return i != 1
+
+    run_staged(3, 3, step, workers=1)
+    assert seen == [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0), (2, 1), (2, 2)]
+
+
+def test_step_exceptions_are_reraised() -> None:
+    def step(i: int, k: int) -> bool:
+        if i == 2 and k == 1:
+            raise RuntimeError("boom")
+        return True
+
+    with pytest.raises(RuntimeError):
+        run_staged(10, 3, step, workers=3)
@@ -0,0 +1,127 @@
+# tests/unit/test_pipeline_stage.py
+from __future__ import annotations
+
+import io
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from kprovengine.manifest.hashing import sha256_bytes
+from kprovengine.pipeline.normalize import NORMALIZE
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.pipeline.stage import (
+    IdentityStage,
+    PathStageAdapter,
+    Stage,
+    copy_stream,
+    run_stage,
+)
+from kprovengine.types import RunInputs
+
+
+class _BoundedReader(io.BytesIO):
+    """Reader that records the largest read request it served."""
+
+    max_request = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            raise AssertionError("stage must not read the whole input at once")
+        self.max_request = max(self.max_request, size)
+        return super().read(size)
+
+
+@dataclass(frozen=True)
+class _UpperStage:
+    name: str = "upper"
+    version: str = "1"
+
+    def transform(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        while chunk := reader.read(4):
+            writer.write(chunk.upper())
+
+
+def test_identity_stage_streams_fixed_chunks() -> None:
+    data = b"x" * 10_000
+    reader = _BoundedReader(data)
+    writer = io.BytesIO()
+
+    IdentityStage("identity", chunk_size=1024).transform(reader, writer)
+
+    assert writer.getvalue() == data
+    assert reader.max_request == 1024
+
+
+def test_copy_stream_returns_byte_count() -> None:
+    assert copy_stream(io.BytesIO(b"abcdef"), io.BytesIO(), chunk_size=4) == 6
+
+
+def test_run_stage_drives_streaming_transform(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_bytes(b"hello world")
+    dst = tmp_path / "out.txt"
+
+    stage = _UpperStage()
+    assert isinstance(stage, Stage)
+    res = run_stage(stage, src, dst, hash_input=True)
+    assert res.strategy == "stream"
+    assert dst.read_bytes() == b"HELLO WORLD"
+    assert res.input_sha256 == sha256_bytes(b"hello world")
+    assert res.sha256 == sha256_bytes(b"HELLO WORLD")
+
+
+def test_run_stage_identity_uses_copy_strategy(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_bytes(b"abc")
+    dst = tmp_path / "out.txt"
+
+    res = run_stage(NORMALIZE, src, dst, allow_link=True, src_sha256="f" * 64)
+    assert res.strategy == "hardlink"
+    assert res.sha256 == "f" * 64
+    assert dst.read_bytes() == b"abc"
+
+
+def test_run_stage_identity_tees_input_hash(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_bytes(b"abc")
+    dst = tmp_path / "out.txt"
+
+    res = run_stage(NORMALIZE, src, dst, hash_input=True)
+    assert res.strategy == "tee"
+    assert res.input_sha256 == res.sha256 == sha256_bytes(b"abc")
+    assert dst.read_bytes() == b"abc"
+
+
+def test_path_stage_adapter_runs_legacy_stage(tmp_path: Path) -> None:
+    def legacy(src: Path, dst: Path) -> None:
+        dst.write_bytes(src.read_bytes()[::-1])
+
+    stage = PathStageAdapter("reverse", legacy)
+
+    src = tmp_path / "in.txt"
+    src.write_bytes(b"abc")
+    dst = tmp_path / "out.txt"
+    assert run_stage(stage, src, dst).strategy == "path"
+    assert dst.read_bytes() == b"cba"
+
+    writer = io.BytesIO()
+    stage.transform(io.BytesIO(b"xyz"), writer)
+    assert writer.getvalue() == b"zyx"
+
+
+def test_path_stage_adapter_first_stage_records_input_hash(tmp_path: Path) -> None:
+    def legacy(src: Path, dst: Path) -> None:
+        dst.write_bytes(src.read_bytes()[::-1])
+
+    src = tmp_path / "in.txt"
+    src.write_bytes(b"abc")
+    res = run_stage(PathStageAdapter("reverse", legacy), src, tmp_path / "o", hash_input=True)
+    assert res.input_sha256 == sha256_bytes(b"abc")
+
+    run = run_pipeline(
+        RunInputs(sources=[src], output_dir=tmp_path / "runs"),
+        stages=[PathStageAdapter("reverse", legacy)],
+    )
+    prov = json.loads((run.run_dir / "provenance.json").read_text(encoding="utf-8"))
+    assert prov["input_sha256"] == {str(src.resolve()): sha256_bytes(b"abc")}
@@ -0,0 +1,309 @@
+# tests/unit/test_server.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kprovengine import cli, client
+from kprovengine import server as server_mod
+from kprovengine.cli import EX_IOERR, EX_OK, EX_USAGE
+from kprovengine.server import JobServer, _claim_socket, _private_dir
+
+
+@pytest.fixture()
+def sock_path() -> Iterator[Path]:
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    d = Path(tempfile.mkdtemp(prefix="kp-", dir="/tmp"))
+    yield d / "s.sock"
+    for p in d.iterdir():
+        p.unlink()
+    d.rmdir()
+
+
+@pytest.fixture()
+def server(sock_path: Path) -> Iterator[JobServer]:
+    srv = JobServer()
+    srv.serve_unix(sock_path)
+    yield srv
+    srv.shutdown()
+
+
+def test_ping_reports_a_warm_process(server: JobServer, sock_path: Path) -> None:
+    reply = client.request({"op": "ping"}, socket_path=sock_path)
+    assert reply["ok"] is True
+    assert reply["pid"] == os.getpid()
+    assert reply["toolchain"]["python_implementation"]
+    assert sock_path.stat().st_mode & 0o077 == 0
+
+
+def test_forward_matches_in_process_cli(
+    server: JobServer,
+    sock_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert client.forward(["--version", "x"], socket_path=sock_path) == EX_OK
+    assert capsys.readouterr().out == "kprovengine (V1)\n"
+
+    assert client.forward(["--no-such-flag"], socket_path=sock_path) == EX_USAGE
+    assert "usage:" in capsys.readouterr().err
+
+    # Relative paths resolve against the client's cwd, not the server's.
+    (tmp_path / "doc.txt").write_text("hello\n", encoding="utf-8")
+    before = os.getcwd()
+    monkeypatch.chdir(tmp_path)
+    assert client.forward(["doc.txt", "--out", "runs"], socket_path=sock_path) == EX_OK
+    payload = json.loads(capsys.readouterr().out)
+    assert Path(payload["run_dir"]).parent == tmp_path / "runs"
+    assert payload["outputs"] == [str(Path(payload["run_dir"]) / "outputs" / "doc.txt")]
+    monkeypatch.chdir(before)
+    assert server.jobs_served == 3
+
+
+def test_jobs_run_concurrently_without_touching_the_process_cwd(
+    sock_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Both jobs must be inside cli.main at once to pass the barrier.
+    barrier = threading.Barrier(2, timeout=10)
+    real_main = cli.main
+
+    def main(argv: list[str], **kw: Any) -> int:
+        barrier.wait()
+        return real_main(argv, **kw)
+
+    monkeypatch.setattr(cli, "main", main)
+    srv = JobServer(workers=2)
+    srv.serve_unix(sock_path)
+    before = os.getcwd()
+    replies: dict[str, dict[str, Any]] = {}
+
+    def run(name: str) -> None:
+        d = tmp_path / name
+        d.mkdir()
+        (d / f"{name}.txt").write_text(name, encoding="utf-8")
+        replies[name] = client.request(
+            {"argv": [f"{name}.txt", "--out", "runs"], "cwd": str(d)}, socket_path=sock_path
+        )
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    srv.shutdown()
+
+    assert os.getcwd() == before
+    for name, reply in replies.items():
+        assert reply["exit_code"] == EX_OK, reply
+        assert Path(json.loads(reply["stdout"])["run_dir"]).parent == tmp_path / name / "runs"
+    assert srv.jobs_served == 2
+
+
+def test_bad_requests_are_rejected(server: JobServer, sock_path: Path) -> None:
+    cwd = os.getcwd()
+    for request in (
+        {"op": "run", "argv": "x", "cwd": cwd},
+        {"op": "run", "argv": ["serve"], "cwd": cwd},
+        {"op": "run", "argv": ["bench"], "cwd": cwd},
+        {"op": "run", "argv": ["verify", "-"], "cwd": cwd},
+        {"op": "run", "argv": ["--version", "x"], "cwd": "relative"},
+        {"op": "nope"},
+        ["not", "an", "object"],
+    ):
+        assert "error" in client.request(request, socket_path=sock_path)  # type: ignore[arg-type]
+    assert server.jobs_served == 0
+
+    gone = client.request({"argv": ["--version", "x"], "cwd": "/no/such/dir"}, socket_path=sock_path)
+    assert gone["exit_code"] == EX_IOERR
+    assert "no such dir" in gone["stderr"]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(sock_path))
+        s.sendall(b"x" * (server_mod.MAX_REQUEST_BYTES + 2))
+        s.shutdown(socket.SHUT_WR)
+        reply = json.loads(s.makefile("rb").readline())
+    assert reply == {"error": "bad request: request too large"}
+
+
+def test_no_server_falls_back_to_in_process(
+    sock_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv(client.SOCKET_ENV, str(sock_path))
+    assert client.forward(["--version", "x"]) is None
+
+    # A stale socket file (no listener) is ignored by the client and reclaimed by serve.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.bind(str(sock_path))
+    assert client.forward(["--version", "x"]) is None
+    assert client.main(["--version", "x"]) == EX_OK
+    assert capsys.readouterr().out == "kprovengine (V1)\n"
+    _claim_socket(sock_path)
+    assert not sock_path.exists()
+
+
+def test_client_ignores_a_path_that_is_not_its_own_socket(
+    sock_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    sock_path.write_text("", encoding="utf-8")
+    assert client.forward(["--version", "x"], socket_path=sock_path) is None
+    assert "not a socket owned by" in capsys.readouterr().err
+
+
+def test_connect_errors_fall_back_and_later_errors_do_not_retry(
+    server: JobServer,
+    sock_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    def refuse(path: Path, timeout: float | None) -> socket.socket:
+        raise PermissionError(13, "Permission denied", str(path))
+
+    with monkeypatch.context() as m:
+        m.setattr(client, "_connect", refuse)
+        assert client.forward(["--version", "x"], socket_path=sock_path) is None
+
+    def reset(s: socket.socket, payload: dict[str, Any], path: Path) -> dict[str, Any]:
+        s.close()
+        raise ConnectionResetError("reset by peer")
+
+    monkeypatch.setattr(client, "_exchange", reset)
+    assert client.forward(["--version", "x"], socket_path=sock_path) == EX_IOERR
+    assert "reset by peer" in capsys.readouterr().err
+
+
+def test_fallback_socket_dir_must_be_private(tmp_path: Path) -> None:
+    d = tmp_path / "private"
+    _private_dir(d)
+    assert d.stat().st_mode & 0o777 == 0o700
+    d.chmod(0o755)
+    with pytest.raises(RuntimeError):
+        _private_dir(d)
+
+
+def test_client_main_forwards_while_server_runs(
+    server: JobServer, sock_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(client.SOCKET_ENV, str(sock_path))
+    assert client.main(["--version", "x"]) == EX_OK
+    assert server.jobs_served == 1
+
+    monkeypatch.setenv(client.NO_DAEMON_ENV, "1")
+    assert client.main(["--version", "x"]) == EX_OK
+    assert server.jobs_served == 1
+
+
+@pytest.mark.parametrize("missing", [(os, "getuid"), (socket, "AF_UNIX")])
+def test_platforms_without_unix_sockets_run_in_process(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], missing: tuple[Any, str]
+) -> None:
+    monkeypatch.delenv(client.SOCKET_ENV, raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.delattr(*missing)
+    assert client.main(["--version", "x"]) == EX_OK
+    assert capsys.readouterr().out == "kprovengine (V1)\n"
+
+
+def test_requests_after_shutdown_get_an_error_reply(sock_path: Path) -> None:
+    srv = JobServer()
+    srv.serve_unix(sock_path)
+    srv.shutdown()
+    reply = srv.handle({"argv": ["--version", "x"], "cwd": os.getcwd()})
+    assert reply == {"error": "server shutting down"}
+    assert srv.jobs_served == 0
+
+
+def test_second_server_refuses_a_live_socket(server: JobServer, sock_path: Path) -> None:
+    with pytest.raises(RuntimeError):
+        JobServer().serve_unix(sock_path)
+
+
+def _post(port: int, headers: dict[str, str]) -> tuple[int, dict[str, Any]]:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}/",
+        data=json.dumps({"argv": ["--version", "x"], "cwd": os.getcwd()}).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_endpoint_and_shutdown(sock_path: Path) -> None:
+    srv = JobServer()
+    srv.serve_unix(sock_path)
+    token_file = sock_path.with_name("s.sock.token")
+    http = srv.serve_http(0, token_file)
+    port = http.server_address[1]
+    assert token_file.stat().st_mode & 0o777 == 0o600
+    ok = {
+        "Authorization": f"Bearer {token_file.read_text(encoding='utf-8').strip()}",
+        "Content-Type": "application/json",
+    }
+
+    assert _post(port, ok) == (
+        200,
+        {"exit_code": EX_OK, "stdout": "kprovengine (V1)\n", "stderr": ""},
+    )
+    assert _post(port, {**ok, "Origin": f"http://localhost:{port}"})[0] == 200
+    assert _post(port, {**ok, "Authorization": "Bearer wrong"})[0] == 401
+    assert _post(port, {"Content-Type": "application/json"})[0] == 401
+    assert _post(port, {**ok, "Content-Type": "text/plain"})[0] == 415
+    assert _post(port, {**ok, "Origin": "http://evil.example"})[0] == 403
+    assert _post(port, {**ok, "Host": f"evil.example:{port}"})[0] == 403
+    assert srv.jobs_served == 2
+
+    assert client.request({"op": "shutdown"}, socket_path=sock_path) == {"ok": True}
+    srv.wait()
+    assert not sock_path.exists()
+    assert not token_file.exists()
+
+
+def test_serve_main_routes_warnings_to_the_job(
+    sock_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def warn(argv: list[str]) -> int:
+        logging.getLogger("kprovengine.test").warning("careful: %s", argv[0])
+        return EX_OK
+
+    monkeypatch.setattr(cli, "_main", warn)
+    codes: list[int] = []
+    argv = ["--socket", str(sock_path), "--http", "0", "--workers", "2"]
+    t = threading.Thread(target=lambda: codes.append(server_mod.main(argv)))
+    t.start()
+    deadline = time.monotonic() + 10
+    while not sock_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    reply = client.request({"argv": ["x"], "cwd": os.getcwd()}, socket_path=sock_path)
+    assert reply == {"exit_code": EX_OK, "stdout": "", "stderr": "careful: x\n"}
+    assert server_mod.main(["--socket", str(sock_path)]) == EX_USAGE  # already served
+
+    client.request({"op": "shutdown"}, socket_path=sock_path)
+    t.join(10)
+    assert codes == [EX_OK]
+    ready = json.loads(capsys.readouterr().out.splitlines()[0])
+    assert ready["socket"] == str(sock_path)
+    assert ready["token_file"] == str(sock_path) + ".token"
+    assert not sock_path.exists()
+
+
+def test_serve_main_rejects_bad_options(capsys: pytest.CaptureFixture[str]) -> None:
+    assert server_mod.main(["--workers", "0"]) == EX_USAGE
+    assert server_mod.main(["--help"]) == EX_OK
+    assert server_mod.main(["--bogus"]) == EX_USAGE
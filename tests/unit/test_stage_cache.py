@@ -0,0 +1,132 @@
+# tests/unit/test_stage_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from kprovengine.manifest.hashing import sha256_bytes
+from kprovengine.pipeline.cache import StageCache
+from kprovengine.pipeline.normalize import NORMALIZE
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.pipeline.stage import IdentityStage, PathStageAdapter
+from kprovengine.types import RunInputs
+
+
+def _summary(run_dir: Path) -> dict[str, object]:
+    return json.loads((run_dir / "run_summary.json").read_text(encoding="utf-8"))
+
+
+def test_rerun_is_served_from_cache(tmp_path: Path) -> None:
+    srcs = []
+    for i in range(3):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(f"v{i}", encoding="utf-8")
+        srcs.append(p)
+    cache_dir = tmp_path / "cache"
+
+    first = run_pipeline(RunInputs(sources=srcs, output_dir=tmp_path / "runs", cache_dir=cache_dir))
+    assert _summary(first.run_dir)["stage_cache"] == {"enabled": True, "hits": 0, "misses": 12}
+
+    srcs[2].write_text("changed", encoding="utf-8")
+    second = run_pipeline(
+        RunInputs(sources=srcs, output_dir=tmp_path / "runs", cache_dir=cache_dir)
+    )
+    assert _summary(second.run_dir)["stage_cache"] == {"enabled": True, "hits": 8, "misses": 4}
+    assert [p.read_text(encoding="utf-8") for p in second.outputs] == ["v0", "v1", "changed"]
+
+    manifest = json.loads((second.run_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert [e["sha256"] for e in manifest["manifest"]] == [
+        sha256_bytes(b"v0"),
+        sha256_bytes(b"v1"),
+        sha256_bytes(b"changed"),
+    ]
+
+
+def test_cache_disabled_by_default(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+
+    res = run_pipeline(RunInputs(sources=[src], output_dir=tmp_path / "runs"))
+    assert _summary(res.run_dir)["stage_cache"] == {"enabled": False, "hits": 0, "misses": 0}
+
+
+def test_stage_version_is_part_of_the_key(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+    cache = StageCache(tmp_path / "cache")
+
+    res = cache.run(NORMALIZE, src, tmp_path / "out1.txt")
+    assert res.strategy != "cache"
+    assert cache.run(NORMALIZE, src, tmp_path / "out2.txt").strategy == "cache"
+
+    bumped = IdentityStage("normalize", version="2")
+    assert cache.get(bumped, sha256_bytes(b"x")) is None
+    assert cache.run(bumped, src, tmp_path / "out3.txt").strategy != "cache"
+
+
+def test_output_edited_in_place_does_not_poison_the_cache(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("payload", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    inputs = RunInputs(sources=[src], output_dir=tmp_path / "runs", cache_dir=cache_dir)
+
+    first = run_pipeline(inputs)
+    (out,) = first.outputs
+    assert out.stat().st_mode & 0o200
+    # A write to the run's output lands in the blob the cache shares.
+    with out.open("a", encoding="utf-8") as f:
+        f.write("TAMPERED\n")
+
+    second = run_pipeline(inputs)
+    assert second.outputs[0].read_text(encoding="utf-8") == "payload"
+    # Every identity stage maps to the one blob: the first lookup misses and replaces it.
+    assert _summary(second.run_dir)["stage_cache"] == {"enabled": True, "hits": 3, "misses": 1}
+    third = run_pipeline(inputs)
+    assert _summary(third.run_dir)["stage_cache"] == {"enabled": True, "hits": 4, "misses": 0}
+    assert third.outputs[0].read_text(encoding="utf-8") == "payload"
+
+
+def test_opaque_path_stages_bypass_the_cache_unless_opted_in(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+    cache = StageCache(tmp_path / "cache")
+    calls: list[Path] = []
+
+    def legacy(s: Path, d: Path) -> None:
+        calls.append(s)
+        d.write_bytes(s.read_bytes() * 2)
+
+    opaque = PathStageAdapter("legacy", legacy)
+    for i in range(2):
+        res = cache.run(opaque, src, tmp_path / f"o{i}.txt")
+        assert res.strategy == "path"
+        assert res.input_sha256 == sha256_bytes(b"x")
+    assert len(calls) == 2
+    assert cache.get(opaque, sha256_bytes(b"x")) is None
+
+    pure = PathStageAdapter("legacy", legacy, cacheable=True)
+    assert cache.run(pure, src, tmp_path / "p0.txt").strategy == "path"
+    assert cache.run(pure, src, tmp_path / "p1.txt").strategy == "cache"
+    assert len(calls) == 3
+    assert (tmp_path / "p1.txt").read_bytes() == b"xx"
+
+
+def test_hits_keep_every_requested_digest(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("x", encoding="utf-8")
+    cache = StageCache(tmp_path / "cache")
+    both = ("sha256", "blake2b")
+    want = {"sha256": sha256_bytes(b"x"), "blake2b": hashlib.blake2b(b"x").hexdigest()}
+
+    cache.run(NORMALIZE, src, tmp_path / "o0.txt", algorithms=both)
+    hit = cache.run(NORMALIZE, src, tmp_path / "o1.txt", algorithms=both)
+    assert hit.strategy == "cache"
+    assert dict(hit.digests) == want
+
+    # An entry written without blake2b gets it computed on the hit.
+    stage = IdentityStage("other")
+    cache.run(stage, src, tmp_path / "o2.txt")
+    hit = cache.run(stage, src, tmp_path / "o3.txt", algorithms=both)
+    assert hit.strategy == "cache"
+    assert dict(hit.digests) == want
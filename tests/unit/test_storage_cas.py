@@ -0,0 +1,94 @@
+# tests/unit/test_storage_cas.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from kprovengine.manifest.hashing import sha256_bytes
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.storage.cas import ObjectStore
+from kprovengine.storage.layout import RunLayout
+from kprovengine.types import RunInputs
+
+
+def _objects(store: ObjectStore) -> list[Path]:
+    return sorted(p for p in store.objects_dir.rglob("*") if p.is_file())
+
+
+def test_runs_share_blobs_in_object_store(tmp_path: Path) -> None:
+    srcs = []
+    for i, text in enumerate(("same", "same", "other")):
+        p = tmp_path / f"in{i}.txt"
+        p.write_text(text, encoding="utf-8")
+        srcs.append(p)
+    store = ObjectStore(tmp_path / "cas")
+
+    runs = [
+        run_pipeline(
+            RunInputs(sources=srcs, output_dir=tmp_path / "runs", object_store=store.root)
+        )
+        for _ in range(2)
+    ]
+
+    assert len(_objects(store)) == 2
+    for res in runs:
+        for out in res.outputs:
+            sha = sha256_bytes(out.read_bytes())
+            assert out.stat().st_ino == store.object_path(sha).stat().st_ino
+
+    summary = json.loads((runs[1].run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    assert summary["object_store"] == {"enabled": True, "stored": 0, "deduplicated": 12}
+    assert store.refcounts()[sha256_bytes(b"same")] == 2
+
+
+def test_gc_only_removes_unreferenced_unlinked_blobs(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("payload", encoding="utf-8")
+    store = ObjectStore(tmp_path / "cas")
+    sha = sha256_bytes(b"payload")
+
+    res = run_pipeline(
+        RunInputs(sources=[src], output_dir=tmp_path / "runs", object_store=store.root)
+    )
+
+    assert store.gc() == []
+    store.remove_ref(res.run_id)
+    # Still hardlinked from the run directory: not garbage yet.
+    assert store.gc() == []
+
+    RunLayout(tmp_path / "runs", res.run_id).cleanup()
+    assert store.gc(dry_run=True) == [sha]
+    assert store.has(sha)
+    assert store.gc() == [sha]
+    assert not store.has(sha)
+
+
+def test_output_edited_in_place_is_not_reused(tmp_path: Path) -> None:
+    src = tmp_path / "in.txt"
+    src.write_text("payload", encoding="utf-8")
+    store = ObjectStore(tmp_path / "cas")
+    sha = sha256_bytes(b"payload")
+    inputs = RunInputs(sources=[src], output_dir=tmp_path / "runs", object_store=store.root)
+
+    first = run_pipeline(inputs)
+    (out,) = first.outputs
+    # The store leaves the run's (shared) inode as the pipeline wrote it.
+    st = out.stat()
+    assert st.st_ino == store.object_path(sha).stat().st_ino
+    assert st.st_mode & 0o200
+    assert st.st_mtime_ns > 10**18
+    assert store.verify(sha)
+    with out.open("a", encoding="utf-8") as f:
+        f.write("TAMPERED\n")
+    assert not store.verify(sha)
+
+    second = run_pipeline(inputs)
+    assert second.outputs[0].read_text(encoding="utf-8") == "payload"
+    assert store.verify(sha)
+    assert second.outputs[0].stat().st_ino == store.object_path(sha).stat().st_ino
+    assert out.stat().st_ino != store.object_path(sha).stat().st_ino
+
+    # A blob that went bad is garbage even while referenced.
+    store.object_path(sha).write_bytes(b"bitrot")
+    assert store.gc() == [sha]
+    assert second.outputs[0].read_bytes() == b"bitrot"  # the run keeps its link
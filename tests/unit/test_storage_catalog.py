@@ -0,0 +1,134 @@
+# tests/unit/test_storage_catalog.py
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_DATAERR, EX_OK, EX_USAGE, main
+from kprovengine.manifest.hashing import sha256_file
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.storage.catalog import CatalogRun, RunCatalog
+from kprovengine.types import RunInputs
+
+
+def _src(tmp_path: Path, name: str, text: str) -> Path:
+    p = tmp_path / name
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def _run(out: Path, srcs: list[Path], **kw: object):  # type: ignore[no-untyped-def]
+    return run_pipeline(RunInputs(sources=srcs, output_dir=out, **kw))  # type: ignore[arg-type]
+
+
+def test_run_pipeline_records_runs_and_hashes(tmp_path: Path) -> None:
+    out = tmp_path / "runs"
+    a = _src(tmp_path, "a.txt", "alpha\n")
+    b = _src(tmp_path, "b.txt", "beta\n")
+    r1 = _run(out, [a])
+    r2 = _run(out, [a, b], manifest_mode="merkle", evidence="DISABLED")
+
+    with RunCatalog.for_output_dir(out) as cat:
+        assert len(cat) == 2
+        assert [r["run_id"] for r in cat.query()] == [r1.run_id, r2.run_id]
+        row = cat.query(sha256=sha256_file(b))[0]
+        assert row["run_id"] == r2.run_id
+        assert row["evidence"] == "DISABLED"
+        assert row["review_status"] == "PENDING"
+        assert row["failures"] == 0
+        assert [r["run_id"] for r in cat.query(sha256=sha256_file(a), role="input")] == [
+            r1.run_id,
+            r2.run_id,
+        ]
+        assert [r["run_id"] for r in cat.query(evidence="disabled")] == [r2.run_id]
+        assert cat.query(review_status="APPROVED") == []
+        assert len(cat.query(limit=1)) == 1
+
+        files = list(cat.files(r2.run_id))
+        outputs = {f["path"]: f["sha256"] for f in files if f["role"] == "output"}
+        # Merkle manifests store run-relative paths; the catalog keeps absolute ones.
+        assert set(outputs) == {str(p) for p in r2.outputs}
+        assert {f["path"] for f in files if f["role"] == "input"} == {str(a), str(b)}
+
+
+def test_time_range_filters(tmp_path: Path) -> None:
+    with RunCatalog(tmp_path / "c.sqlite") as cat:
+        for i, day in enumerate(("2026-01-01", "2026-02-01", "2026-03-01")):
+            cat.record(
+                CatalogRun(
+                    run_id=f"r{i}",
+                    run_dir=tmp_path / f"r{i}",
+                    started_at=f"{day}T00:00:00Z",
+                    finished_at=f"{day}T00:00:01Z",
+                    evidence="ENABLED",
+                    review_status="PENDING",
+                    failures=0,
+                )
+            )
+        assert [r["run_id"] for r in cat.query(since="2026-02-01")] == ["r1", "r2"]
+        assert [r["run_id"] for r in cat.query(until="2026-02-01T00:00:00+00:00")] == ["r0"]
+        assert [r["run_id"] for r in cat.query(since="2026-01-15", until="2026-02-15")] == ["r1"]
+        with pytest.raises(ValueError):
+            cat.query(since="not a date")
+        with pytest.raises(ValueError):
+            cat.query(sha256="ab", role="both")
+
+
+def test_rebuild_matches_incremental_catalog(tmp_path: Path) -> None:
+    out = tmp_path / "runs"
+    srcs = [_src(tmp_path, f"s{i}.txt", f"doc {i}\n") for i in range(3)]
+    runs = [_run(out, srcs[: i + 1], manifest_mode=m) for i, m in enumerate(("flat", "merkle"))]
+
+    with RunCatalog.for_output_dir(out) as cat:
+        before = (cat.query(), [sorted(cat.files(r.run_id), key=str) for r in runs])
+    (out / "catalog.sqlite").unlink()
+    (out / "not-a-run").mkdir()
+
+    with RunCatalog.for_output_dir(out) as cat:
+        assert cat.rebuild(out) == 2
+        after = (cat.query(), [sorted(cat.files(r.run_id), key=str) for r in runs])
+    assert after == before
+
+
+def test_catalog_failure_does_not_fail_run(tmp_path: Path) -> None:
+    out = tmp_path / "runs"
+    out.mkdir()
+    (out / "catalog.sqlite").write_bytes(b"this is not a sqlite database" * 10)
+    res = _run(out, [_src(tmp_path, "a.txt", "x\n")])
+    assert (res.run_dir / "run_summary.json").is_file()
+    with pytest.raises(sqlite3.DatabaseError):
+        RunCatalog.for_output_dir(out)
+
+
+def test_cli_runs_query_and_rebuild(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    out = tmp_path / "runs"
+    src = _src(tmp_path, "a.txt", "alpha\n")
+    res = _run(out, [src])
+
+    assert main(["runs", "query", "--out", str(out), "--sha256", sha256_file(src)]) == EX_OK
+    assert [r["run_id"] for r in json.loads(capsys.readouterr().out)["runs"]] == [res.run_id]
+
+    (out / "catalog.sqlite").unlink()
+    assert main(["runs", "query", "--out", str(out)]) == EX_DATAERR
+    capsys.readouterr()
+    assert main(["runs", "rebuild", "--out", str(out)]) == EX_OK
+    assert json.loads(capsys.readouterr().out)["runs"] == 1
+    assert main(["runs", "query", "--out", str(out), "--status", "approved"]) == EX_OK
+    assert json.loads(capsys.readouterr().out) == {"runs": []}
+    assert main(["runs", "query", "--out", str(out), "--since", "yesterday"]) == EX_USAGE
+
+
+def test_cli_runs_rebuild_malformed_summary(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = tmp_path / "runs"
+    res = _run(out, [_src(tmp_path, "a.txt", "alpha\n")])
+    summary_path = res.run_dir / "run_summary.json"
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    del summary["started_at"]
+    summary_path.write_text(json.dumps(summary), encoding="utf-8")
+    assert main(["runs", "rebuild", "--out", str(out)]) == EX_DATAERR
+    assert "malformed run record" in capsys.readouterr().err
@@ -0,0 +1,174 @@
+# tests/unit/test_storage_copy.py
+from __future__ import annotations
+
+import errno
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.storage import copy as copy_mod
+from kprovengine.storage.copy import COPY_CHUNK_SIZE, copy_file
+from kprovengine.types import RunInputs
+
+
+def test_copy_file_without_link_creates_independent_copy(tmp_path: Path) -> None:
+    src = tmp_path / "src.bin"
+    data = bytes(range(256)) * (COPY_CHUNK_SIZE // 256 + 3)
+    src.write_bytes(data)
+    dst = tmp_path / "dst.bin"
+
+    strategy = copy_file(src, dst)
+
+    assert strategy in {"reflink", "copy_file_range", "sendfile", "userspace"}
+    assert dst.read_bytes() == data
+    assert dst.stat().st_ino != src.stat().st_ino
+
+
+def test_copy_file_allow_link_hardlinks(tmp_path: Path) -> None:
+    src = tmp_path / "src.txt"
+    src.write_text("abc", encoding="utf-8")
+    dst = tmp_path / "dst.txt"
+
+    assert copy_file(src, dst, allow_link=True) == "hardlink"
+    assert dst.stat().st_ino == src.stat().st_ino
+
+
+def test_copy_file_replaces_existing_destination(tmp_path: Path) -> None:
+    src = tmp_path / "src.txt"
+    src.write_text("new", encoding="utf-8")
+    dst = tmp_path / "dst.txt"
+    dst.write_text("old contents that are longer", encoding="utf-8")
+
+    copy_file(src, dst)
+    assert dst.read_text(encoding="utf-8") == "new"
+
+    copy_file(src, dst, allow_link=True)
+    assert dst.read_text(encoding="utf-8") == "new"
+
+
+def test_run_summary_records_copy_strategies(tmp_path: Path) -> None:
+    src = tmp_path / "input.txt"
+    src.write_text("abc", encoding="utf-8")
+
+    res = run_pipeline(RunInputs(sources=[src], output_dir=tmp_path / "runs"))
+
+    summary = json.loads((res.run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    strategies = summary["copy_strategies"]
+    assert set(strategies) == {"normalize", "parse", "extract", "render"}
+    assert strategies["normalize"] == {"tee": 1}
+    for stage in ("parse", "extract", "render"):
+        assert strategies[stage] == {"hardlink": 1}
+    # The caller's source must never be aliased by run outputs.
+    assert res.outputs[0].stat().st_ino != src.stat().st_ino
+
+
+def _data_file(tmp_path: Path) -> tuple[Path, bytes]:
+    src = tmp_path / "src.bin"
+    data = bytes(range(256)) * (COPY_CHUNK_SIZE // 256 + 3)
+    src.write_bytes(data)
+    return src, data
+
+
+def _raise(err: int) -> Callable[..., int]:
+    def fn(*args: object) -> int:
+        raise OSError(err, os.strerror(err))
+
+    return fn
+
+
+def _fake_reflink(dst_fd: int, request: int, src_fd: int) -> None:
+    os.write(dst_fd, os.pread(src_fd, os.fstat(src_fd).st_size, 0))
+
+
+def _fake_kernel_copy(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.write(dst_fd, os.read(src_fd, count))
+
+
+@pytest.fixture()
+def no_reflink(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(copy_mod, "fcntl", SimpleNamespace(ioctl=_raise(errno.EOPNOTSUPP)))
+
+
+def test_reflink_is_preferred_when_the_clone_succeeds(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(copy_mod, "fcntl", SimpleNamespace(ioctl=_fake_reflink))
+    src, data = _data_file(tmp_path)
+    assert copy_file(src, tmp_path / "dst.bin") == "reflink"
+    assert (tmp_path / "dst.bin").read_bytes() == data
+
+
+@pytest.mark.parametrize("err", [errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP, errno.EPERM])
+def test_each_unsupported_step_falls_through_to_the_next(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, err: int
+) -> None:
+    src, data = _data_file(tmp_path)
+    dst = tmp_path / "dst.bin"
+    monkeypatch.setattr(copy_mod, "fcntl", SimpleNamespace(ioctl=_raise(err)))
+    monkeypatch.setattr(os, "copy_file_range", _fake_kernel_copy, raising=False)
+    assert copy_file(src, dst) == "copy_file_range"
+    assert dst.read_bytes() == data
+
+    monkeypatch.setattr(os, "copy_file_range", _raise(err), raising=False)
+    monkeypatch.setattr(copy_mod, "_sendfile", _fake_kernel_copy)
+    assert copy_file(src, dst) == "sendfile"
+    assert dst.read_bytes() == data
+
+    monkeypatch.setattr(copy_mod, "_sendfile", _raise(err))
+    assert copy_file(src, dst) == "userspace"
+    assert dst.read_bytes() == data
+
+
+def test_first_call_zero_is_treated_as_unsupported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_reflink: None
+) -> None:
+    monkeypatch.setattr(os, "copy_file_range", lambda *a: 0, raising=False)
+    monkeypatch.setattr(copy_mod, "_sendfile", _fake_kernel_copy)
+    src, data = _data_file(tmp_path)
+    assert copy_file(src, tmp_path / "dst.bin") == "sendfile"
+    assert (tmp_path / "dst.bin").read_bytes() == data
+
+    monkeypatch.setattr(copy_mod, "_sendfile", lambda *a: 0)
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert copy_file(empty, tmp_path / "empty.out") == "userspace"
+    assert (tmp_path / "empty.out").read_bytes() == b""
+
+
+def test_kernel_copy_error_after_progress_is_raised(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_reflink: None
+) -> None:
+    calls = iter([_fake_kernel_copy, _raise(errno.EXDEV)])
+    monkeypatch.setattr(os, "copy_file_range", lambda *a: next(calls)(*a), raising=False)
+    src, _ = _data_file(tmp_path)
+    with pytest.raises(OSError):
+        copy_file(src, tmp_path / "dst.bin")
+
+
+@pytest.mark.parametrize("err", [errno.EMLINK, errno.EXDEV, errno.EPERM])
+def test_hardlink_failure_falls_back_to_a_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_reflink: None, err: int
+) -> None:
+    monkeypatch.setattr(os, "link", _raise(err))
+    src, data = _data_file(tmp_path)
+    dst = tmp_path / "dst.bin"
+    assert copy_file(src, dst, allow_link=True) != "hardlink"
+    assert dst.read_bytes() == data
+    assert dst.stat().st_ino != src.stat().st_ino
+
+
+def test_unexpected_errors_are_not_swallowed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(copy_mod, "fcntl", SimpleNamespace(ioctl=_raise(errno.EIO)))
+    src, _ = _data_file(tmp_path)
+    with pytest.raises(OSError):
+        copy_file(src, tmp_path / "dst.bin")
+    monkeypatch.setattr(os, "link", _raise(errno.EIO))
+    with pytest.raises(OSError):
+        copy_file(src, tmp_path / "dst2.bin", allow_link=True)
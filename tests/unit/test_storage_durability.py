@@ -0,0 +1,139 @@
+# tests/unit/test_storage_durability.py
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_OK, main
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.storage import durability as dur
+from kprovengine.storage.durability import DURABILITY_MODES, BundleWriter
+from kprovengine.types import RunInputs
+
+EVIDENCE = [
+    "manifest.json",
+    "manifest.stat.json",
+    "provenance.json",
+    "human_review.json",
+    "run_summary.json",
+]
+
+
+def _spy(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str]]:
+    calls: list[tuple[str, str]] = []
+    real_file, real_dir, real_replace = dur.fsync_file, dur.fsync_dir, os.replace
+
+    def _file(p: Path, *, data_only: bool = False) -> None:
+        calls.append(("fdatasync" if data_only else "fsync", Path(p).name))
+        real_file(p, data_only=data_only)
+
+    def _dir(p: Path) -> None:
+        calls.append(("fsync_dir", Path(p).name))
+        real_dir(p)
+
+    def _replace(a: Path, b: Path) -> None:
+        calls.append(("rename", Path(b).name))
+        real_replace(a, b)
+
+    monkeypatch.setattr(dur, "fsync_file", _file)
+    monkeypatch.setattr(dur, "fsync_dir", _dir)
+    monkeypatch.setattr(dur.os, "replace", _replace)
+    return calls
+
+
+def test_fast_mode_writes_in_place(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy(monkeypatch)
+    w = BundleWriter(tmp_path)
+    assert w.target(tmp_path / "a.json") == tmp_path / "a.json"
+    w.commit()
+    assert calls == []
+
+
+def test_durable_mode_groups_fsyncs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy(monkeypatch)
+    with BundleWriter(tmp_path, "durable") as w:
+        for name in ("a", "b", "c"):
+            tmp = w.target(tmp_path / name)
+            tmp.write_text(name, encoding="utf-8")
+            assert not (tmp_path / name).exists()
+        w.commit()
+    assert calls == [
+        ("fdatasync", ".a.tmp-" + str(os.getpid())),
+        ("fdatasync", ".b.tmp-" + str(os.getpid())),
+        ("fdatasync", ".c.tmp-" + str(os.getpid())),
+        ("rename", "a"),
+        ("rename", "b"),
+        ("fsync_dir", tmp_path.name),
+        ("rename", "c"),
+        ("fsync_dir", tmp_path.name),
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "b", "c"]
+
+
+def test_fsync_file_falls_back_without_fdatasync(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "a"
+    p.write_text("a", encoding="utf-8")
+    synced: list[int] = []
+    monkeypatch.delattr(os, "fdatasync", raising=False)
+    monkeypatch.setattr(os, "fsync", synced.append)
+    dur.fsync_file(p, data_only=True)
+    assert len(synced) == 1
+
+
+def test_paranoid_mode_syncs_everything(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bundle_dir = tmp_path / "run"
+    out_dir = bundle_dir / "outputs"
+    out_dir.mkdir(parents=True)
+    extra = out_dir / "doc.txt"
+    extra.write_text("x", encoding="utf-8")
+    calls = _spy(monkeypatch)
+    w = BundleWriter(bundle_dir, "paranoid")
+    w.target(bundle_dir / "a").write_text("a", encoding="utf-8")
+    w.commit(also_sync=[extra])
+    assert calls[:4] == [
+        ("fsync", ".a.tmp-" + str(os.getpid())),
+        ("rename", "a"),
+        ("fsync_dir", "run"),
+        ("fsync", "doc.txt"),
+    ]
+    assert sorted(calls[4:]) == [("fsync_dir", "outputs"), ("fsync_dir", tmp_path.name)]
+
+
+def test_failed_bundle_leaves_no_partial_files(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError), BundleWriter(tmp_path, "durable") as w:
+        w.target(tmp_path / "a").write_text("half", encoding="utf-8")
+        raise RuntimeError("crash before commit")
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(ValueError):
+        BundleWriter(tmp_path, "sloppy")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        BundleWriter(tmp_path, "durable").target(tmp_path / "sub" / "a")
+
+
+@pytest.mark.parametrize("mode", DURABILITY_MODES)
+def test_bundles_are_identical_across_modes(tmp_path: Path, mode: str) -> None:
+    src = tmp_path / "doc.txt"
+    src.write_text("evidence\n", encoding="utf-8")
+    res = run_pipeline(
+        RunInputs(sources=[src], output_dir=tmp_path / "runs", durability=mode)  # type: ignore[arg-type]
+    )
+    names = sorted(p.name for p in res.run_dir.iterdir() if p.is_file())
+    assert names == sorted(EVIDENCE)
+    summary = json.loads((res.run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    assert summary["durability"] == mode
+    assert json.loads((res.run_dir / "manifest.json").read_text(encoding="utf-8"))["manifest"]
+
+
+def test_cli_durability_flag(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = tmp_path / "doc.txt"
+    src.write_text("evidence\n", encoding="utf-8")
+    assert main([str(src), "--out", str(tmp_path / "runs"), "--durability", "durable"]) == EX_OK
+    run_dir = Path(json.loads(capsys.readouterr().out)["run_dir"])
+    summary = json.loads((run_dir / "run_summary.json").read_text(encoding="utf-8"))
+    assert summary["durability"] == "durable"
@@ -0,0 +1,107 @@
+# tests/unit/test_storage_lineage.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kprovengine.cli import EX_DATAERR, EX_OK, EX_USAGE, main
+from kprovengine.manifest.hashing import sha256_file
+from kprovengine.pipeline.run import run_pipeline
+from kprovengine.storage.catalog import CatalogRun, RunCatalog
+from kprovengine.storage.lineage import walk_lineage
+from kprovengine.types import RunInputs
+
+A, B, C, D, X = ("a" * 64, "b" * 64, "c" * 64, "d" * 64, "e" * 64)
+
+
+def _record(cat: RunCatalog, run_id: str, minute: int, ins: list[str], outs: list[str]) -> None:
+    cat.record(
+        CatalogRun(
+            run_id=run_id,
+            run_dir=Path("/runs") / run_id,
+            started_at=f"2026-01-01T00:{minute:02d}:00Z",
+            finished_at=f"2026-01-01T00:{minute:02d}:30Z",
+            evidence="ENABLED",
+            review_status="PENDING",
+            failures=0,
+            inputs={f"/in/{run_id}/{i}": h for i, h in enumerate(ins)},
+            outputs={f"/runs/{run_id}/{i}": h for i, h in enumerate(outs)},
+        )
+    )
+
+
+@pytest.fixture()
+def chain(tmp_path: Path):  # type: ignore[no-untyped-def]
+    # r1: A -> B;  r2: B -> C;  r3: B, X -> D;  r4: C -> A (a cycle back to A)
+    with RunCatalog(tmp_path / "catalog.sqlite") as cat:
+        _record(cat, "r1", 1, [A], [B])
+        _record(cat, "r2", 2, [B], [C])
+        _record(cat, "r3", 3, [B, X], [D])
+        _record(cat, "r4", 4, [C], [A])
+        yield cat
+
+
+def test_lookup_lists_every_file_with_the_digest(chain: RunCatalog) -> None:
+    rows = chain.lookup(B.upper())
+    assert [(r["run_id"], r["role"]) for r in rows] == [
+        ("r1", "output"),
+        ("r2", "input"),
+        ("r3", "input"),
+    ]
+    assert [r["run_id"] for r in chain.lookup([A, D], role="output")] == ["r3", "r4"]
+    assert chain.lookup("f" * 64) == []
+
+
+def test_downstream_and_upstream_walks(chain: RunCatalog) -> None:
+    down = walk_lineage(chain, A)
+    assert [(s.run_id, s.depth) for s in down] == [("r1", 1), ("r2", 2), ("r3", 2), ("r4", 3)]
+    assert down[2].via == (B,)
+    assert down[2].next == (D,)
+
+    up = walk_lineage(chain, D, direction="upstream")
+    assert [(s.run_id, s.depth) for s in up] == [("r3", 1), ("r1", 2), ("r4", 3), ("r2", 4)]
+    assert up[0].next == (B, X)
+
+    assert [s.run_id for s in walk_lineage(chain, A, max_depth=1)] == ["r1"]
+    assert walk_lineage(chain, A, max_depth=0) == []
+    with pytest.raises(ValueError):
+        walk_lineage(chain, A, direction="sideways")  # type: ignore[arg-type]
+
+
+def test_pipeline_runs_feed_the_index(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    out = tmp_path / "runs"
+    src = tmp_path / "doc.txt"
+    src.write_text("audited document\n", encoding="utf-8")
+    first = run_pipeline(RunInputs(sources=[src], output_dir=out))
+    # A second run consumes the first run's output.
+    second = run_pipeline(RunInputs(sources=[first.outputs[0]], output_dir=out))
+    sha = sha256_file(src)
+
+    assert main(["lineage", sha, "--out", str(out)]) == EX_OK
+    payload = json.loads(capsys.readouterr().out)
+    touched = {(r["run_id"], r["role"]) for r in payload["runs"]}
+    assert touched == {
+        (first.run_id, "input"),
+        (first.run_id, "output"),
+        (second.run_id, "input"),
+        (second.run_id, "output"),
+    }
+    assert [s["run_id"] for s in payload["downstream"]] == [first.run_id, second.run_id]
+
+    assert main(["lineage", "0" * 64, "--out", str(out), "--direction", "upstream"]) == EX_DATAERR
+    assert json.loads(capsys.readouterr().out)["upstream"] == []
+    assert main(["lineage", sha, "--out", str(tmp_path / "nowhere")]) == EX_DATAERR
+    assert main(["lineage", sha, "--out", str(out), "--depth", "-1"]) == EX_USAGE
+
+
+def test_cli_lineage_malformed_record(
+    chain: RunCatalog, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def broken(*args: object, **kwargs: object) -> list[object]:
+        raise KeyError("sha256")
+
+    monkeypatch.setattr("kprovengine.cli.walk_lineage", broken)
+    assert main(["lineage", "a" * 64, "--out", str(chain.path.parent)]) == EX_DATAERR
+    assert "malformed catalog record" in capsys.readouterr().err